@@ -0,0 +1,635 @@
+"""
+Benchmarks of the hot paths of the object oriented and the procedural API.
+
+The benchmarks draw onto a mock canvas, which does nothing, so that they
+measure only the cost of the diagram code and run without a display. The
+exception are the ``tk.*`` benchmarks, which compare drawing onto a
+``tkinter`` canvas with and without batching and are skipped if no display
+is available. The ``import.*`` benchmarks measure the time required to
+import the APIs in a new interpreter.
+
+Usage::
+
+    python benchmarks/run.py [--sizes N [N ...]] [--filter TEXT]
+                             [--repeat R] [--output FILE]
+                             [--baseline FILE] [--threshold FRACTION]
+
+Results are printed and, if requested, written to a JSON file. Batch
+operations are compared to the scalar operations they replace, and the
+script exits with status 1 if any of them isn't faster. If a baseline file
+written by an earlier run is given, each result is also compared to the
+baseline and the script exits with status 1 if any benchmark became slower
+by more than the given fraction.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tkinter
+import tracemalloc
+
+import numpy as np
+
+import diagrams
+from diagrams.backends import BatchedTkCanvas
+from diagrams.object_oriented import (
+    Arrow,
+    Color,
+    ColorArray,
+    Colormap,
+    Coordinates,
+    Diagram,
+    RectangularNode,
+    RoutedArrow,
+    auto_size_nodes,
+    force_layout,
+    layered_layout,
+    set_colors,
+)
+from diagrams.object_oriented import anchors as object_anchors
+from diagrams.procedural import (
+    add_coordinates,
+    anchors as procedural_anchors,
+    create_arrow,
+    create_arrows,
+    create_canvas,
+    create_component_table,
+    create_rectangular_node,
+    create_rectangular_nodes,
+    draw,
+    draw_all,
+    right,
+)
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+BENCHMARKS = {}
+
+SPEEDUPS = {}
+
+
+class MockCanvas:
+    """
+    Canvas that ignores all drawing commands.
+    """
+
+    def create_rectangle(*args, **kwargs):
+        pass
+
+    def create_text(*args, **kwargs):
+        pass
+
+    def create_line(*args, **kwargs):
+        pass
+
+    def create_polygon(*args, **kwargs):
+        pass
+
+
+def benchmark(name, unit="s", sized=True, faster_than=None):
+    """
+    Register a benchmark.
+
+    The decorated function receives the number of components and returns
+    a function without arguments that runs the benchmark once. For
+    benchmarks with a unit other than seconds, the returned function
+    returns the measured value itself. If the benchmark can't be run, the
+    decorated function returns ``None``.
+
+    Args:
+        name(``str``): The name of the benchmark.
+        unit(``str``): The unit of the measured value.
+        sized(``bool``): Whether the benchmark depends on the number of
+            components. If not, it is run only once and receives ``None``
+            instead of the number of components.
+        faster_than(``str``): The name of a benchmark of the scalar
+            operation that this benchmark batches. If given, this benchmark
+            must be faster than the named one.
+    """
+
+    def register(setup):
+        BENCHMARKS[name] = (setup, unit, sized)
+        if faster_than is not None:
+            SPEEDUPS[name] = faster_than
+        return setup
+
+    return register
+
+
+def _positions(n):
+    """Positions of n components on a square grid."""
+    side = int(np.ceil(np.sqrt(n)))
+    indices = np.arange(n)
+    return np.stack([indices % side, indices // side], 1) * 150.0
+
+
+###############################################################################
+# Import time
+###############################################################################
+
+
+def _import_time(module):
+    """
+    Measure the time required to import a module in a new interpreter.
+
+    Args:
+        module(``str``): The name of the module to import.
+
+    Return:
+        The cumulative import time of the module in milliseconds as
+        reported by ``python -X importtime``.
+    """
+    path = os.path.dirname(os.path.dirname(os.path.abspath(diagrams.__file__)))
+    environment = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(
+        [path] + environment.get("PYTHONPATH", "").split(os.pathsep)
+    )
+    # Without cached bytecode, the time to compile the modules would be
+    # measured as well.
+    environment.pop("PYTHONDONTWRITEBYTECODE", None)
+    # With -c, the working directory is searched first, so the interpreter
+    # is started in the directory holding the measured package.
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=environment,
+        cwd=path,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stderr
+    for line in output.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1e3
+    raise ValueError(f"No import time reported for module '{module}'.")
+
+
+@benchmark("import.object_oriented", unit="ms", sized=False)
+def import_object_oriented(n):
+    return lambda: _import_time("diagrams.object_oriented")
+
+
+@benchmark("import.procedural", unit="ms", sized=False)
+def import_procedural(n):
+    return lambda: _import_time("diagrams.procedural")
+
+
+###############################################################################
+# Object oriented API
+###############################################################################
+
+
+def _nodes(n):
+    """Create n nodes."""
+    return [
+        RectangularNode((x, y), (100, 50), "Node") for x, y in _positions(n).tolist()
+    ]
+
+
+@benchmark("oo.coordinates_add")
+def oo_coordinates_add(n):
+    coordinates = [Coordinates(i, i) for i in range(n)]
+    offset = Coordinates(3, 4)
+    return lambda: [c + offset for c in coordinates]
+
+
+@benchmark("oo.color_add")
+def oo_color_add(n):
+    colors = [Color.from_rgb(i % 256, 0, 0) for i in range(n)]
+    other = Color("#0080FF")
+    return lambda: [c + other for c in colors]
+
+
+@benchmark("oo.color_array_add", faster_than="oo.color_add")
+def oo_color_array_add(n):
+    colors = ColorArray(np.stack([np.arange(n) % 256, np.zeros(n), np.zeros(n)], 1))
+    other = Color("#0080FF")
+    return lambda: colors + other
+
+
+@benchmark("oo.colormap_set_colors")
+def oo_colormap_set_colors(n):
+    nodes = _nodes(n)
+    values = np.random.default_rng(0).exponential(size=n)
+    colormap = Colormap.traffic_light()
+    return lambda: set_colors(nodes, colormap(values))
+
+
+@benchmark("oo.anchor")
+def oo_anchor(n):
+    nodes = _nodes(n)
+    return lambda: [node.right for node in nodes]
+
+
+@benchmark("oo.anchors_batch", faster_than="oo.anchor")
+def oo_anchors_batch(n):
+    nodes = _nodes(n)
+    return lambda: object_anchors(nodes, "right")
+
+
+@benchmark("oo.draw")
+def oo_draw(n):
+    diagram = Diagram(1000, 1000)
+    nodes = _nodes(n // 2)
+    for node in nodes:
+        diagram.add(node)
+    for node_1, node_2 in zip(nodes, nodes[1:] + nodes[:1]):
+        diagram.add(Arrow(node_1.right, node_2.left))
+    canvas = MockCanvas()
+    return lambda: diagram.draw(canvas)
+
+
+@benchmark("oo.layered_layout")
+def oo_layered_layout(n):
+    # Laying out a million nodes takes minutes.
+    if n > 100_000:
+        return None
+    rng = np.random.default_rng(0)
+    nodes = _nodes(n)
+    sources = rng.integers(0, n, 3 * n)
+    targets = np.minimum(sources + rng.integers(1, 100, 3 * n), n - 1)
+    arrows = [
+        Arrow.connect(nodes[source], nodes[target])
+        for source, target in zip(sources.tolist(), targets.tolist())
+    ]
+    return lambda: layered_layout(nodes, arrows)
+
+
+@benchmark("oo.force_layout")
+def oo_force_layout(n):
+    # Ten iterations of a million nodes take minutes.
+    if n > 100_000:
+        return None
+    rng = np.random.default_rng(0)
+    nodes = _nodes(n)
+    edges = [
+        (nodes[source], nodes[target])
+        for source, target in rng.integers(0, n, (2 * n, 2)).tolist()
+    ]
+    return lambda: force_layout(nodes, edges, iterations=10, tolerance=0.0)
+
+
+def _routed_diagram(n):
+    """
+    Diagram of n nodes on a grid connected by n routed arrows between nearby
+    nodes.
+    """
+    rng = np.random.default_rng(0)
+    side = int(np.ceil(np.sqrt(n)))
+    nodes = _nodes(n)
+    diagram = Diagram(side * 150, side * 150)
+    for node in nodes:
+        diagram.add(node)
+    sources = rng.integers(0, n, n)
+    offsets = rng.integers(2, 5, n) + side * rng.integers(0, 3, n)
+    targets = np.minimum(sources + offsets, n - 1)
+    arrows = [
+        RoutedArrow.connect(nodes[source], nodes[target])
+        for source, target in zip(sources.tolist(), targets.tolist())
+    ]
+    for arrow in arrows:
+        diagram.add(arrow)
+    return diagram, nodes, arrows
+
+
+@benchmark("oo.route_arrows")
+def oo_route_arrows(n):
+    # Routing a hundred thousand arrows takes minutes.
+    if n > 10_000:
+        return None
+    _, _, arrows = _routed_diagram(n)
+
+    def route():
+        for arrow in arrows:
+            arrow.reroute()
+
+    return route
+
+
+@benchmark("oo.move_routed_node")
+def oo_move_routed_node(n):
+    if n > 10_000:
+        return None
+    diagram, nodes, _ = _routed_diagram(n)
+    moved = [nodes[index] for index in np.random.default_rng(1).integers(0, n, 100)]
+
+    def move():
+        for node in moved:
+            node.translate(Coordinates(0, 20))
+            diagram.component_at(0, 0)
+            node.translate(Coordinates(0, -20))
+            diagram.component_at(0, 0)
+
+    return move
+
+
+@benchmark("oo.auto_size_nodes")
+def oo_auto_size_nodes(n):
+    # Distinct labels, so that each run measures the texts that were
+    # evicted from the cache.
+    nodes = [
+        RectangularNode((x, y), (1, 1), "Node {}".format(index))
+        for index, (x, y) in enumerate(_positions(n).tolist())
+    ]
+    return lambda: auto_size_nodes(nodes)
+
+
+@benchmark("oo.memory_per_node", unit="B")
+def oo_memory_per_node(n):
+    def measure():
+        tracemalloc.start()
+        start, _ = tracemalloc.get_traced_memory()
+        nodes = [RectangularNode((i, i), (100, 50), "Node") for i in range(n)]
+        end, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del nodes
+        return (end - start) / n
+
+    return measure
+
+
+###############################################################################
+# Procedural API
+###############################################################################
+
+
+def _node_dicts(n):
+    """Create n node dictionaries."""
+    return [
+        create_rectangular_node((x, y), (100, 50), "Node")
+        for x, y in _positions(n).tolist()
+    ]
+
+
+@benchmark("procedural.coordinates_add")
+def procedural_coordinates_add(n):
+    coordinates = [(i, i) for i in range(n)]
+    offset = (3, 4)
+    return lambda: [add_coordinates(c, offset) for c in coordinates]
+
+
+@benchmark("procedural.anchor")
+def procedural_anchor(n):
+    nodes = _node_dicts(n)
+    return lambda: [right(node) for node in nodes]
+
+
+@benchmark("procedural.anchors_batch", faster_than="procedural.anchor")
+def procedural_anchors_batch(n):
+    nodes = _node_dicts(n)
+    return lambda: procedural_anchors(nodes, "right")
+
+
+@benchmark("procedural.draw")
+def procedural_draw(n):
+    nodes = _node_dicts(n // 2)
+    arrows = [
+        create_arrow(right(node_1), node_2["position"])
+        for node_1, node_2 in zip(nodes, nodes[1:] + nodes[:1])
+    ]
+    components = nodes + arrows
+    create_canvas(1000, 1000, canvas=MockCanvas())
+
+    def run():
+        for component in components:
+            draw(component)
+
+    return run
+
+
+def _component_table(n):
+    """Create component table holding n/2 nodes and n/2 arrows."""
+    table = create_component_table(n)
+    positions = _positions(n // 2)
+    create_rectangular_nodes(table, positions, (100, 50), ["Node"] * len(positions))
+    create_arrows(table, positions + (100, 25), np.roll(positions, -1, axis=0))
+    return table
+
+
+@benchmark("procedural.draw_all", faster_than="procedural.draw")
+def procedural_draw_all(n):
+    table = _component_table(n)
+    create_canvas(1000, 1000, canvas=MockCanvas())
+    return lambda: draw_all(table)
+
+
+@benchmark("procedural.colormap_nodes")
+def procedural_colormap_nodes(n):
+    positions = _positions(n)
+    texts = ["Node"] * n
+    values = np.random.default_rng(0).exponential(size=n)
+    colormap = Colormap.traffic_light()
+
+    def run():
+        table = create_component_table(n)
+        create_rectangular_nodes(table, positions, (100, 50), texts, colormap(values))
+
+    return run
+
+
+###############################################################################
+# Tk backend
+###############################################################################
+
+
+def _tk_canvas():
+    """Create tkinter canvas or return None if there is no display."""
+    try:
+        root = tkinter.Tk()
+    except tkinter.TclError:
+        return None
+    return tkinter.Canvas(root, width=1000, height=1000)
+
+
+@benchmark("tk.draw_all")
+def tk_draw_all(n):
+    canvas = _tk_canvas()
+    if canvas is None:
+        return None
+    table = _component_table(n)
+    create_canvas(1000, 1000, canvas=canvas)
+
+    def run():
+        canvas.delete("all")
+        draw_all(table)
+
+    return run
+
+
+@benchmark("tk.draw_all_batched", faster_than="tk.draw_all")
+def tk_draw_all_batched(n):
+    canvas = _tk_canvas()
+    if canvas is None:
+        return None
+    canvas = BatchedTkCanvas(canvas)
+    table = _component_table(n)
+    create_canvas(1000, 1000, canvas=canvas)
+
+    def run():
+        canvas.delete("all")
+        draw_all(table)
+        canvas.flush()
+
+    return run
+
+
+###############################################################################
+# Running and comparing benchmarks
+###############################################################################
+
+
+def run_benchmarks(sizes, repeat=3, name_filter=None):
+    """
+    Run the registered benchmarks.
+
+    Args:
+        sizes: The numbers of components to run each benchmark with.
+        repeat(``int``): How often each benchmark is repeated. The best
+            result is reported.
+        name_filter(``str``): If given, only benchmarks whose names contain
+            this string are run.
+
+    Return:
+        ``dict`` mapping keys of the form ``name[size]``, or ``name`` for
+        benchmarks that don't depend on the size, to ``dict``s holding the
+        measured ``value`` and its ``unit``.
+    """
+    results = {}
+    for name, (setup, unit, sized) in BENCHMARKS.items():
+        if name_filter is not None and name_filter not in name:
+            continue
+        for size in sizes if sized else [None]:
+            function = setup(size)
+            key = name if size is None else f"{name}[{size}]"
+            if function is None:
+                print(f"{key:40} {'skipped':>15}", flush=True)
+                continue
+            values = []
+            for _ in range(repeat):
+                # As in timeit, garbage collection is disabled during the
+                # measurement, so that it doesn't depend on earlier runs.
+                gc.collect()
+                gc.disable()
+                try:
+                    start = time.perf_counter()
+                    value = function()
+                    elapsed = time.perf_counter() - start
+                finally:
+                    gc.enable()
+                values.append(elapsed if unit == "s" else value)
+                del value
+            del function
+            results[key] = {"value": min(values), "unit": unit}
+            print(f"{key:40} {_format(min(values), unit)}", flush=True)
+    return results
+
+
+def _format(value, unit):
+    """Format measured value."""
+    if unit == "s":
+        return f"{1e3 * value:12.3f} ms"
+    return f"{value:12.1f} {unit}"
+
+
+def check_speedups(results):
+    """
+    Check that batch operations are faster than the scalar operations they
+    replace.
+
+    Args:
+        results: The results returned by ``run_benchmarks``.
+
+    Return:
+        ``list`` of the keys of the batch benchmarks that weren't faster
+        than their scalar counterparts.
+    """
+    slower = []
+    for key, result in results.items():
+        name = key.partition("[")[0]
+        scalar_name = SPEEDUPS.get(name)
+        if scalar_name is None:
+            continue
+        reference = results.get(scalar_name + key[len(name) :])
+        if reference is None or result["value"] <= 0:
+            continue
+        speedup = reference["value"] / result["value"]
+        too_slow = speedup <= 1.0
+        if too_slow:
+            slower.append(key)
+        print(f"{key:40} {speedup:6.2f}x" + ("  NOT FASTER" if too_slow else ""))
+    return slower
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: The results returned by ``run_benchmarks``.
+        baseline: Results of an earlier run.
+        threshold(``float``): The fraction by which a result may exceed the
+            baseline before it is considered a regression.
+
+    Return:
+        ``list`` of the keys of the benchmarks that regressed.
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None or reference["value"] <= 0:
+            continue
+        ratio = result["value"] / reference["value"]
+        regressed = ratio > 1.0 + threshold
+        if regressed:
+            regressions.append(key)
+        print(f"{key:40} {ratio:6.2f}x" + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--filter", default=None, help="Run matching benchmarks.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None, help="Write results to file.")
+    parser.add_argument("--baseline", default=None, help="Compare to results.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Slowdown relative to the baseline that counts as regression.",
+    )
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(args.sizes, args.repeat, args.filter)
+    status = 0
+    print()
+    if check_speedups(results):
+        status = 1
+    if args.output is not None:
+        with open(args.output, "w") as output:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                output,
+                indent=2,
+            )
+    if args.baseline is not None:
+        with open(args.baseline) as baseline:
+            baseline = json.load(baseline)["results"]
+        print()
+        if compare(results, baseline, args.threshold):
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+diagrams._lazy
+==============
+
+Provides lazily imported modules, so that importing the package doesn't
+import dependencies that are expensive to initialize, such as ``numpy``,
+before they are used.
+"""
+import importlib
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    """
+    Placeholder for a module that imports the module on first access to
+    one of its attributes.
+
+    Once imported, the attributes of the module are copied to the
+    placeholder, so that accessing them is as fast as accessing the
+    attributes of the module itself. Attributes that are set on the module
+    after it was imported are looked up on the module.
+    """
+
+    def __init__(self, name):
+        """
+        Create placeholder for module.
+
+        Args:
+            name(``str``): The fully qualified name of the module.
+        """
+        super().__init__(name)
+
+    def __getattr__(self, name):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+    def __repr__(self):
+        return f"<lazily imported module '{self.__name__}'>"
+
+
+def lazy_import(name):
+    """
+    Import module lazily.
+
+    Args:
+        name(``str``): The fully qualified name of the module.
+
+    Return:
+        A ``LazyModule`` that imports the module on first use.
+    """
+    return LazyModule(name)
@@ -0,0 +1,12 @@
+"""
+diagrams.backends
+=================
+
+This module provides the rendering backends onto which the components of
+both the object oriented and the procedural API can be drawn.
+"""
+from diagrams.backends.base import *
+from diagrams.backends.recording import *
+from diagrams.backends.raster import *
+from diagrams.backends.svg import *
+from diagrams.backends.tk import *
@@ -0,0 +1,142 @@
+"""
+diagrams.backends.base
+======================
+
+Defines the interface that rendering backends must implement.
+"""
+from abc import ABC, abstractmethod
+from numbers import Real
+
+PRIMITIVES = ("rectangle", "text", "line", "polygon")
+
+# Options used by ``tkinter.Canvas`` for the primitives when they are not
+# given. An empty string denotes a transparent color.
+DEFAULT_OPTIONS = {
+    "rectangle": {"fill": "", "outline": "black"},
+    "text": {"fill": "black", "text": ""},
+    "line": {"fill": "black"},
+    "polygon": {"fill": "black", "outline": ""},
+}
+
+
+def resolve_options(primitive, options):
+    """
+    Resolve the options of a drawing command in the same way as
+    ``tkinter.Canvas``, i.e. options that are not given or ``None`` take
+    their default values.
+
+    Args:
+        primitive(``str``): The type of primitive, i.e. one of ``PRIMITIVES``.
+        options(``dict``): The options passed to the drawing method.
+
+    Return:
+        ``dict`` holding the resolved options.
+    """
+    resolved = dict(DEFAULT_OPTIONS[primitive])
+    for name, value in options.items():
+        if value is not None:
+            resolved[name] = value
+    return resolved
+
+
+def flatten_coordinates(coordinates):
+    """
+    Flatten coordinates given in any of the forms accepted by
+    ``tkinter.Canvas``.
+
+    Args:
+        coordinates: Sequence of numbers, or nested sequences of numbers,
+            such as ``(x_0, y_0, x_1, y_1)``, ``([x_0, y_0, x_1, y_1],)`` or
+            ``((x_0, y_0), (x_1, y_1))``.
+
+    Return:
+        ``list`` containing the coordinates as flat sequence of ``float``.
+    """
+    if len(coordinates) == 1 and isinstance(coordinates[0], (list, tuple)):
+        coordinates = coordinates[0]
+    try:
+        return [float(coordinate) for coordinate in coordinates]
+    except TypeError:
+        pass
+    flat = []
+    for coordinate in coordinates:
+        if isinstance(coordinate, Real):
+            flat.append(float(coordinate))
+        else:
+            flat += flatten_coordinates(coordinate)
+    return flat
+
+
+class Backend(ABC):
+    """
+    The interface that a canvas must implement for diagram components to be
+    drawn onto it.
+
+    The interface is the subset of the ``tkinter.Canvas`` API used by the
+    diagram components. Any object that provides the methods listed below
+    is considered a backend, even if it doesn't inherit from this class.
+    This means that a ``tkinter.Canvas`` is a valid backend.
+    """
+
+    @classmethod
+    def __subclasshook__(cls, subclass):
+        if cls is Backend:
+            methods = [f"create_{primitive}" for primitive in PRIMITIVES]
+            if all(callable(getattr(subclass, name, None)) for name in methods):
+                return True
+        return NotImplemented
+
+    @abstractmethod
+    def create_rectangle(self, *coordinates, **options):
+        """
+        Draw a rectangle.
+
+        Args:
+            coordinates: The coordinates ``x_0, y_0, x_1, y_1`` of the upper
+                left and lower right corner of the rectangle.
+            options: The ``fill`` and ``outline`` colors of the rectangle.
+
+        Return:
+            Integer ID of the created item.
+        """
+
+    @abstractmethod
+    def create_text(self, *coordinates, **options):
+        """
+        Draw text centered around a given position.
+
+        Args:
+            coordinates: The coordinates ``x, y`` of the text center.
+            options: The ``text`` to draw and its ``fill`` color.
+
+        Return:
+            Integer ID of the created item.
+        """
+
+    @abstractmethod
+    def create_line(self, *coordinates, **options):
+        """
+        Draw a line.
+
+        Args:
+            coordinates: The coordinates ``x_0, y_0, x_1, y_1, ...`` of the
+                points of the line.
+            options: The ``fill`` color of the line.
+
+        Return:
+            Integer ID of the created item.
+        """
+
+    @abstractmethod
+    def create_polygon(self, *coordinates, **options):
+        """
+        Draw a polygon.
+
+        Args:
+            coordinates: The coordinates ``x_0, y_0, x_1, y_1, ...`` of the
+                vertices of the polygon.
+            options: The ``fill`` and ``outline`` colors of the polygon.
+
+        Return:
+            Integer ID of the created item.
+        """
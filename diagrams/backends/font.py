@@ -0,0 +1,90 @@
+"""
+diagrams.backends.font
+======================
+
+A minimal 3x5 pixel bitmap font used to render text without a display
+server. Lower-case letters are rendered using the upper-case glyphs.
+"""
+
+GLYPH_WIDTH = 3
+GLYPH_HEIGHT = 5
+
+# Each glyph is given by its five rows from top to bottom. Each row is
+# encoded as a three-character string in which "1" marks a set pixel.
+GLYPHS = {
+    "A": ("010", "101", "111", "101", "101"),
+    "B": ("110", "101", "110", "101", "110"),
+    "C": ("011", "100", "100", "100", "011"),
+    "D": ("110", "101", "101", "101", "110"),
+    "E": ("111", "100", "110", "100", "111"),
+    "F": ("111", "100", "110", "100", "100"),
+    "G": ("011", "100", "101", "101", "011"),
+    "H": ("101", "101", "111", "101", "101"),
+    "I": ("111", "010", "010", "010", "111"),
+    "J": ("001", "001", "001", "101", "010"),
+    "K": ("101", "101", "110", "101", "101"),
+    "L": ("100", "100", "100", "100", "111"),
+    "M": ("101", "111", "111", "101", "101"),
+    "N": ("110", "101", "101", "101", "101"),
+    "O": ("010", "101", "101", "101", "010"),
+    "P": ("110", "101", "110", "100", "100"),
+    "Q": ("010", "101", "101", "110", "011"),
+    "R": ("110", "101", "110", "101", "101"),
+    "S": ("011", "100", "010", "001", "110"),
+    "T": ("111", "010", "010", "010", "010"),
+    "U": ("101", "101", "101", "101", "111"),
+    "V": ("101", "101", "101", "101", "010"),
+    "W": ("101", "101", "111", "111", "101"),
+    "X": ("101", "101", "010", "101", "101"),
+    "Y": ("101", "101", "010", "010", "010"),
+    "Z": ("111", "001", "010", "100", "111"),
+    "0": ("111", "101", "101", "101", "111"),
+    "1": ("010", "110", "010", "010", "111"),
+    "2": ("110", "001", "010", "100", "111"),
+    "3": ("110", "001", "010", "001", "110"),
+    "4": ("101", "101", "111", "001", "001"),
+    "5": ("111", "100", "110", "001", "110"),
+    "6": ("011", "100", "111", "101", "111"),
+    "7": ("111", "001", "010", "010", "010"),
+    "8": ("111", "101", "111", "101", "111"),
+    "9": ("111", "101", "111", "001", "110"),
+    " ": ("000", "000", "000", "000", "000"),
+    ".": ("000", "000", "000", "000", "010"),
+    ",": ("000", "000", "000", "010", "100"),
+    ":": ("000", "010", "000", "010", "000"),
+    ";": ("000", "010", "000", "010", "100"),
+    "-": ("000", "000", "111", "000", "000"),
+    "_": ("000", "000", "000", "000", "111"),
+    "+": ("000", "010", "111", "010", "000"),
+    "=": ("000", "111", "000", "111", "000"),
+    "*": ("000", "101", "010", "101", "000"),
+    "/": ("001", "001", "010", "100", "100"),
+    "\\": ("100", "100", "010", "001", "001"),
+    "(": ("010", "100", "100", "100", "010"),
+    ")": ("010", "001", "001", "001", "010"),
+    "[": ("110", "100", "100", "100", "110"),
+    "]": ("011", "001", "001", "001", "011"),
+    "<": ("001", "010", "100", "010", "001"),
+    ">": ("100", "010", "001", "010", "100"),
+    "!": ("010", "010", "010", "000", "010"),
+    "?": ("110", "001", "010", "000", "010"),
+    "#": ("101", "111", "101", "111", "101"),
+    "%": ("101", "001", "010", "100", "101"),
+    "'": ("010", "010", "000", "000", "000"),
+    '"': ("101", "101", "000", "000", "000"),
+}
+
+UNKNOWN_GLYPH = ("111", "101", "101", "101", "111")
+
+
+def glyph(character):
+    """
+    Get the glyph for a character.
+
+    Args:
+        character(``str``): The character.
+
+    Return:
+        Tuple of five strings holding the rows of the glyph.
+    """
+    return GLYPHS.get(character.upper(), UNKNOWN_GLYPH)
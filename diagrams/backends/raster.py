@@ -0,0 +1,465 @@
+"""
+diagrams.backends.raster
+========================
+
+Provides a software rasterizer that draws diagrams into an RGB image and
+writes them as PNG files without requiring a display server.
+"""
+import os
+import struct
+import zlib
+from functools import lru_cache
+
+from diagrams._lazy import lazy_import
+from diagrams.backends.base import Backend, flatten_coordinates, resolve_options
+from diagrams.backends.font import GLYPH_HEIGHT, GLYPH_WIDTH, glyph
+
+np = lazy_import("numpy")
+
+# RGB values of the color names understood by the rasterizer in addition to
+# HEX color codes.
+NAMED_COLORS = {
+    "black": (0, 0, 0),
+    "white": (255, 255, 255),
+    "red": (255, 0, 0),
+    "green": (0, 255, 0),
+    "blue": (0, 0, 255),
+    "yellow": (255, 255, 0),
+    "cyan": (0, 255, 255),
+    "magenta": (255, 0, 255),
+    "orange": (255, 165, 0),
+    "gray": (190, 190, 190),
+    "grey": (190, 190, 190),
+}
+
+
+@lru_cache(maxsize=1024)
+def _rgb(color):
+    """
+    Convert ``tkinter`` color to RGB tuple or ``None`` for transparent
+    colors.
+    """
+    # Imported here since the object oriented API itself depends on the
+    # backends.
+    from diagrams.object_oriented.color import Color
+
+    if isinstance(color, Color):
+        return color.rgb
+    if color == "":
+        return None
+    color = str(color)
+    if color.startswith("#"):
+        if len(color) == 4:
+            color = "#" + "".join(2 * c for c in color[1:])
+        return Color.from_code(color).rgb
+    try:
+        return NAMED_COLORS[color.lower()]
+    except KeyError:
+        raise ValueError(f"'{color}' is not a known color.")
+
+
+@lru_cache(maxsize=4096)
+def _text_mask(text, scale):
+    """Boolean mask of the pixels covered by a text string."""
+    advance = GLYPH_WIDTH + 1
+    mask = np.zeros((GLYPH_HEIGHT, max(advance * len(text) - 1, 0)), dtype=bool)
+    for i, character in enumerate(text):
+        rows = glyph(character)
+        for j, row in enumerate(rows):
+            for k, pixel in enumerate(row):
+                if pixel == "1":
+                    mask[j, i * advance + k] = True
+    if scale != 1:
+        mask = mask.repeat(scale, axis=0).repeat(scale, axis=1)
+    return mask
+
+
+def _expand(starts, counts):
+    """
+    Expand ranges given by starts and counts into a single array holding
+    all indices of all ranges.
+
+    Return:
+        Tuple ``(indices, ranges)`` holding the indices and the index of the
+        range that each of them belongs to.
+    """
+    ranges = np.repeat(np.arange(counts.size), counts)
+    offsets = np.cumsum(counts) - counts
+    indices = np.arange(ranges.size) - offsets[ranges] + starts[ranges]
+    return indices, ranges
+
+
+def _clip_segments(x_0, y_0, d_x, d_y, width, height):
+    """
+    Clip line segments to the rectangle ``[0, width] x [0, height]`` using
+    the Liang-Barsky algorithm.
+
+    Args:
+        x_0, y_0: Arrays holding the start points of the segments.
+        d_x, d_y: Arrays holding the vectors from start to end points.
+        width, height: The extent of the rectangle.
+
+    Return:
+        Tuple ``(t_0, t_1)`` of arrays holding the range of the parameter
+        ``t`` in [0, 1] of the part of each segment inside the rectangle.
+        Segments outside of it have ``t_0 > t_1``.
+    """
+    t_0 = np.zeros_like(x_0)
+    t_1 = np.ones_like(x_0)
+    for p, q in (
+        (-d_x, x_0),
+        (d_x, width - x_0),
+        (-d_y, y_0),
+        (d_y, height - y_0),
+    ):
+        parallel = p == 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = q / p
+        t_0 = np.where(p < 0, np.maximum(t_0, r), t_0)
+        t_1 = np.where(p > 0, np.minimum(t_1, r), t_1)
+        t_1 = np.where(parallel & (q < 0), -1.0, t_1)
+    return t_0, t_1
+
+
+def encode_png(pixels, compression=6):
+    """
+    Encode RGB image as PNG.
+
+    Args:
+        pixels: Array of shape ``(height, width, 3)`` and type ``uint8``
+            holding the image.
+        compression(``int``): The zlib compression level.
+
+    Return:
+        ``bytes`` holding the PNG file.
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    height, width, _ = pixels.shape
+    # Every scanline is preceded by a zero byte selecting the 'None' filter.
+    raw = np.zeros((height, 3 * width + 1), dtype=np.uint8)
+    raw[:, 1:] = pixels.reshape(height, -1)
+
+    def chunk(tag, data):
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+        )
+
+    return b"".join(
+        [
+            b"\x89PNG\r\n\x1a\n",
+            chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            chunk(b"IDAT", zlib.compress(raw.tobytes(), compression)),
+            chunk(b"IEND", b""),
+        ]
+    )
+
+
+class RasterBackend(Backend):
+    """
+    A backend that draws primitives into an RGB image held in a NumPy
+    array.
+
+    Rectangles and text are drawn immediately using array slicing and
+    boolean masks. Lines and polygons are queued and scan-converted
+    together, so that drawing many arrows costs only a few array
+    operations. The queue is processed whenever a rectangle or text is
+    drawn, when it is full and before the image is accessed, so that the
+    drawing order is preserved.
+
+    Text is drawn using a small bitmap font, which is scaled by an integer
+    factor. Polygons are filled using the even-odd rule.
+
+    Attributes:
+        width(int): The width of the image in pixels.
+        height(int): The height of the image in pixels.
+        text_scale(int): The factor by which the bitmap font is scaled.
+        batch_size(int): The maximum number of queued lines and polygons.
+    """
+
+    def __init__(
+        self, width, height, background="white", text_scale=2, batch_size=4096
+    ):
+        """
+        Create raster backend.
+
+        Args:
+            width(int): The width of the image in pixels.
+            height(int): The height of the image in pixels.
+            background: The color of the background.
+            text_scale(int): The factor by which the bitmap font is scaled.
+            batch_size(int): The maximum number of queued lines and polygons.
+        """
+        self.width = int(width)
+        self.height = int(height)
+        self.text_scale = text_scale
+        self.batch_size = batch_size
+        self._pixels = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        self._items = 0
+        self.clear(background)
+
+    def clear(self, background="white"):
+        """
+        Reset the image to a uniform background so that the backend can be
+        reused for another diagram.
+
+        Args:
+            background: The color of the background.
+        """
+        self._pixels[...] = _rgb(background) or (255, 255, 255)
+        self._segments = []
+        self._polygons = []
+        self._sequence = 0
+
+    @property
+    def pixels(self):
+        """Array of shape ``(height, width, 3)`` holding the image."""
+        self.flush()
+        return self._pixels
+
+    def png(self, compression=6):
+        """
+        Encode image as PNG.
+
+        Args:
+            compression(``int``): The zlib compression level.
+
+        Return:
+            ``bytes`` holding the PNG file.
+        """
+        return encode_png(self.pixels, compression)
+
+    def write_png(self, path_or_file, compression=6):
+        """
+        Write image to a PNG file.
+
+        Args:
+            path_or_file: Path of the file to write to or file object opened
+                in binary mode.
+            compression(``int``): The zlib compression level.
+        """
+        data = self.png(compression)
+        if isinstance(path_or_file, (str, os.PathLike)):
+            with open(path_or_file, "wb") as output:
+                output.write(data)
+        else:
+            path_or_file.write(data)
+
+    def _next_item(self):
+        """Return ID for the next item."""
+        self._items += 1
+        return self._items
+
+    def _queue(self):
+        """Sequence number for queued primitive."""
+        self._sequence += 1
+        if len(self._segments) + len(self._polygons) >= self.batch_size:
+            self.flush()
+        return self._sequence
+
+    def flush(self):
+        """Scan-convert all queued lines and polygons."""
+        if not self._segments and not self._polygons:
+            return
+        ys = []
+        xs = []
+        sequence = []
+        colors = []
+        for pixels in (self._rasterize_segments(), self._rasterize_polygons()):
+            if pixels is not None:
+                for target, values in zip((ys, xs, sequence, colors), pixels):
+                    target.append(values)
+        self._segments = []
+        self._polygons = []
+        if not ys:
+            return
+        ys = np.concatenate(ys)
+        xs = np.concatenate(xs)
+        sequence = np.concatenate(sequence)
+        colors = np.concatenate(colors)
+
+        # Of all writes to the same pixel only the last one in drawing order
+        # must remain.
+        order = np.lexsort((-sequence, ys * self.width + xs))
+        flat = ys[order] * self.width + xs[order]
+        first = np.ones(flat.size, dtype=bool)
+        first[1:] = flat[1:] != flat[:-1]
+        order = order[first]
+        self._pixels[ys[order], xs[order]] = colors[order]
+
+    def _rasterize_segments(self):
+        """Pixels covered by the queued line segments."""
+        if not self._segments:
+            return None
+        segments = np.array(self._segments, dtype=np.float64)
+        sequence = segments[:, 0].astype(np.int64)
+        x_0, y_0, x_1, y_1 = segments[:, 1:5].T
+        d_x = x_1 - x_0
+        d_y = y_1 - y_0
+        # Each segment is sampled at steps + 1 equally spaced points, of
+        # which only those in the part of the segment inside of the image
+        # are generated, so that off-canvas lines don't allocate pixels.
+        steps = np.ceil(np.maximum(np.abs(d_x), np.abs(d_y))).astype(np.int64)
+        t_0, t_1 = _clip_segments(x_0, y_0, d_x, d_y, self.width, self.height)
+        scale = np.maximum(steps, 1)
+        first = np.maximum(np.ceil(t_0 * scale - 1e-9), 0).astype(np.int64)
+        last = np.minimum(np.floor(t_1 * scale + 1e-9), steps).astype(np.int64)
+        counts = np.where(t_0 <= t_1, np.maximum(last - first + 1, 0), 0)
+        samples, indices = _expand(first, counts)
+        t = samples / scale[indices]
+        xs = np.floor(x_0[indices] + t * d_x[indices]).astype(np.int64)
+        ys = np.floor(y_0[indices] + t * d_y[indices]).astype(np.int64)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        indices = indices[inside]
+        colors = segments[indices, 5:8].astype(np.uint8)
+        return ys[inside], xs[inside], sequence[indices], colors
+
+    def _rasterize_polygons(self):
+        """Pixels covered by the interiors of the queued polygons."""
+        if not self._polygons:
+            return None
+        edges = []
+        polygon_colors = []
+        polygon_sequence = []
+        for i, (sequence, coordinates, color) in enumerate(self._polygons):
+            vertices = np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+            closed = np.roll(vertices, -1, axis=0)
+            edge = np.empty((len(vertices), 5))
+            edge[:, 0] = i
+            edge[:, 1:3] = vertices
+            edge[:, 3:5] = closed
+            edges.append(edge)
+            polygon_colors.append(color)
+            polygon_sequence.append(sequence)
+        edges = np.concatenate(edges)
+        polygon_colors = np.array(polygon_colors, dtype=np.uint8)
+        polygon_sequence = np.array(polygon_sequence, dtype=np.int64)
+
+        # Find the scanlines crossed by each non-horizontal edge. A scanline
+        # passes through the pixel centers and is crossed if it lies in the
+        # half-open vertical extent of the edge.
+        polygon = edges[:, 0].astype(np.int64)
+        x_0, y_0, x_1, y_1 = edges[:, 1:].T
+        y_min = np.minimum(y_0, y_1)
+        y_max = np.maximum(y_0, y_1)
+        first = np.ceil(y_min - 0.5).astype(np.int64)
+        last = np.ceil(y_max - 0.5).astype(np.int64)
+        first = np.clip(first, 0, self.height)
+        last = np.clip(last, 0, self.height)
+        counts = np.maximum(last - first, 0)
+        rows, indices = _expand(first, counts)
+        if rows.size == 0:
+            return None
+        y = rows + 0.5
+        crossings = x_0[indices] + (y - y_0[indices]) * (
+            (x_1[indices] - x_0[indices]) / (y_1[indices] - y_0[indices])
+        )
+        polygon = polygon[indices]
+
+        # Sorting the crossings by polygon, scanline and position yields an
+        # even number of crossings for every polygon and scanline, so that
+        # consecutive pairs delimit the spans inside the polygon.
+        order = np.lexsort((crossings, rows, polygon))
+        crossings = crossings[order]
+        rows = rows[order]
+        polygon = polygon[order]
+        starts = np.ceil(crossings[0::2] - 0.5).astype(np.int64)
+        ends = np.ceil(crossings[1::2] - 0.5).astype(np.int64)
+        starts = np.clip(starts, 0, self.width)
+        ends = np.clip(ends, 0, self.width)
+        counts = np.maximum(ends - starts, 0)
+        xs, spans = _expand(starts, counts)
+        polygon = polygon[0::2][spans]
+        return (
+            rows[0::2][spans],
+            xs,
+            polygon_sequence[polygon],
+            polygon_colors[polygon],
+        )
+
+    def _queue_outline(self, coordinates, color, closed):
+        """Queue the segments of a line or polygon outline."""
+        sequence = self._queue()
+        segments = self._segments
+        points = list(zip(coordinates[0::2], coordinates[1::2]))
+        if closed and points:
+            points.append(points[0])
+        if len(points) == 1:
+            points.append(points[0])
+        for (x_0, y_0), (x_1, y_1) in zip(points[:-1], points[1:]):
+            segments.append((sequence, x_0, y_0, x_1, y_1) + color)
+
+    def create_rectangle(self, *coordinates, **options):
+        """Draw rectangle."""
+        self.flush()
+        x_0, y_0, x_1, y_1 = flatten_coordinates(coordinates)
+        options = resolve_options("rectangle", options)
+        x_0, x_1 = sorted((int(round(x_0)), int(round(x_1))))
+        y_0, y_1 = sorted((int(round(y_0)), int(round(y_1))))
+        width = self.width
+        height = self.height
+        left = min(max(x_0, 0), width)
+        right = min(max(x_1, 0), width)
+        top = min(max(y_0, 0), height)
+        bottom = min(max(y_1, 0), height)
+        pixels = self._pixels
+
+        fill = _rgb(options["fill"])
+        if fill is not None:
+            pixels[top:bottom, left:right] = fill
+        outline = _rgb(options["outline"])
+        if outline is not None:
+            if 0 <= y_0 < height:
+                pixels[y_0, left:right] = outline
+            if 0 <= y_1 - 1 < height:
+                pixels[y_1 - 1, left:right] = outline
+            if 0 <= x_0 < width:
+                pixels[top:bottom, x_0] = outline
+            if 0 <= x_1 - 1 < width:
+                pixels[top:bottom, x_1 - 1] = outline
+        return self._next_item()
+
+    def create_text(self, *coordinates, **options):
+        """Draw text."""
+        self.flush()
+        x, y = flatten_coordinates(coordinates)
+        options = resolve_options("text", options)
+        color = _rgb(options["fill"])
+        mask = _text_mask(str(options["text"]), self.text_scale)
+        if color is None or mask.size == 0:
+            return self._next_item()
+        mask_height, mask_width = mask.shape
+        x_0 = int(round(x - mask_width / 2))
+        y_0 = int(round(y - mask_height / 2))
+        left = max(x_0, 0)
+        top = max(y_0, 0)
+        right = min(x_0 + mask_width, self.width)
+        bottom = min(y_0 + mask_height, self.height)
+        if left < right and top < bottom:
+            mask = mask[top - y_0 : bottom - y_0, left - x_0 : right - x_0]
+            self._pixels[top:bottom, left:right][mask] = color
+        return self._next_item()
+
+    def create_line(self, *coordinates, **options):
+        """Draw line."""
+        coordinates = flatten_coordinates(coordinates)
+        options = resolve_options("line", options)
+        color = _rgb(options["fill"])
+        if color is not None:
+            self._queue_outline(coordinates, color, False)
+        return self._next_item()
+
+    def create_polygon(self, *coordinates, **options):
+        """Draw polygon."""
+        coordinates = flatten_coordinates(coordinates)
+        options = resolve_options("polygon", options)
+        fill = _rgb(options["fill"])
+        if fill is not None and len(coordinates) >= 6:
+            sequence = self._queue()
+            self._polygons.append((sequence, coordinates, fill))
+        outline = _rgb(options["outline"])
+        if outline is not None:
+            self._queue_outline(coordinates, outline, True)
+        return self._next_item()
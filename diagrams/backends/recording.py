@@ -0,0 +1,329 @@
+"""
+diagrams.backends.recording
+===========================
+
+Provides a headless backend that records drawing commands into a compact
+display list instead of displaying them and a proxy that records the IDs of
+the items created on another backend.
+"""
+from array import array
+from collections import OrderedDict
+
+from diagrams.backends.base import Backend, PRIMITIVES, flatten_coordinates
+
+_PRIMITIVE_INDICES = {primitive: index for index, primitive in enumerate(PRIMITIVES)}
+
+###############################################################################
+# DisplayList
+###############################################################################
+
+
+class DisplayList:
+    """
+    A compact, array-backed list of drawing commands.
+
+    Each command consists of the type of the primitive, its coordinates and
+    its options. The coordinates of all commands are stored in a single
+    flat array of floats. Identical option sets are stored only once.
+
+    Attributes:
+        primitives(``array``): The type of each command as index into
+            ``PRIMITIVES``.
+        offsets(``array``): The start of the coordinates of each command in
+            ``coordinates``. Has one element more than there are commands.
+        coordinates(``array``): The coordinates of all commands.
+        styles(``array``): The options of each command as index into the
+            table of unique option sets.
+    """
+
+    def __init__(self):
+        """Create empty display list."""
+        self.primitives = array("B")
+        self.offsets = array("L", [0])
+        self.coordinates = array("d")
+        self.styles = array("L")
+        self._style_table = []
+        self._style_indices = {}
+
+    def _style_index(self, options):
+        """Look up or insert options in table of unique option sets."""
+        # Options are usually passed in the same order, so they are first
+        # looked up without sorting them.
+        key = tuple(options.items())
+        indices = self._style_indices
+        try:
+            index = indices.get(key)
+        except TypeError:
+            self._style_table.append(dict(options))
+            return len(self._style_table) - 1
+        if index is None:
+            sorted_key = tuple(sorted(key))
+            index = indices.get(sorted_key)
+            if index is None:
+                index = len(self._style_table)
+                self._style_table.append(dict(options))
+                indices[sorted_key] = index
+            indices[key] = index
+        return index
+
+    def append(self, primitive, coordinates, options):
+        """
+        Append drawing command.
+
+        Args:
+            primitive(``str``): The type of primitive to draw, i.e. one of
+                ``PRIMITIVES``.
+            coordinates: Flat sequence of the coordinates of the primitive.
+            options(``dict``): The options passed to the drawing method.
+        """
+        self.primitives.append(_PRIMITIVE_INDICES[primitive])
+        all_coordinates = self.coordinates
+        all_coordinates.extend(coordinates)
+        self.offsets.append(len(all_coordinates))
+        self.styles.append(self._style_index(options))
+
+    def __len__(self):
+        """The number of commands in the list."""
+        return len(self.primitives)
+
+    @property
+    def nbytes(self):
+        """Approximate memory used by the display list in bytes."""
+        arrays = [self.primitives, self.offsets, self.coordinates, self.styles]
+        size = sum(len(a) * a.itemsize for a in arrays)
+        for style in self._style_table:
+            size += 64 * (len(style) + 1)
+        return size
+
+    def __getitem__(self, index):
+        """
+        Get drawing command.
+
+        Return:
+            Tuple ``(primitive, coordinates, options)`` containing the type of
+            the primitive, its coordinates as ``list`` and its options as
+            ``dict``.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Display list index out of range.")
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+        return (
+            PRIMITIVES[self.primitives[index]],
+            self.coordinates[start:end].tolist(),
+            dict(self._style_table[self.styles[index]]),
+        )
+
+    def __iter__(self):
+        """Iterate over commands in the list."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def replay(self, canvas):
+        """
+        Replay recorded commands onto a backend.
+
+        Args:
+            canvas: The backend onto which to draw the commands.
+        """
+        methods = [getattr(canvas, f"create_{primitive}") for primitive in PRIMITIVES]
+        offsets = self.offsets.tolist()
+        coordinates = self.coordinates.tolist()
+        style_table = self._style_table
+        for primitive, start, end, style in zip(
+            self.primitives, offsets, offsets[1:], self.styles
+        ):
+            methods[primitive](*coordinates[start:end], **style_table[style])
+
+
+###############################################################################
+# DisplayListCache
+###############################################################################
+
+
+class DisplayListCache:
+    """
+    A cache of display lists, which discards the least recently used
+    display lists when their total size exceeds a given bound.
+
+    Attributes:
+        max_bytes(``int``): The maximum total size of the cached display
+            lists in bytes.
+        nbytes(``int``): The total size of the cached display lists.
+        hits(``int``): The number of successful look-ups.
+        misses(``int``): The number of failed look-ups.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        """
+        Create empty cache.
+
+        Args:
+            max_bytes(``int``): The maximum total size of the cached display
+                lists in bytes.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """The number of cached display lists."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Whether a display list is cached for the given key."""
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Look up display list.
+
+        Args:
+            key: The key under which the display list was stored.
+
+        Return:
+            The ``DisplayList`` or ``None`` if it isn't in the cache.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, display_list):
+        """
+        Store display list in cache.
+
+        Display lists larger than the size bound of the cache are not
+        stored.
+
+        Args:
+            key: The key under which to store the display list.
+            display_list(DisplayList): The display list to store.
+        """
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        nbytes = display_list.nbytes
+        if nbytes > self.max_bytes:
+            return
+        self._entries[key] = (display_list, nbytes)
+        self.nbytes += nbytes
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def clear(self):
+        """Remove all display lists from the cache."""
+        self._entries.clear()
+        self.nbytes = 0
+
+
+###############################################################################
+# RecordingBackend
+###############################################################################
+
+
+class RecordingBackend(Backend):
+    """
+    A headless backend, which records all drawing commands into a display
+    list.
+
+    Item IDs are assigned in the same way as ``tkinter.Canvas`` does, i.e.
+    starting from 1 and in the order in which the items are created.
+
+    Attributes:
+        width(int): The width of the canvas in pixels.
+        height(int): The height of the canvas in pixels.
+        display_list(DisplayList): The recorded drawing commands.
+    """
+
+    def __init__(self, width=None, height=None):
+        """
+        Create recording backend.
+
+        Args:
+            width(int): The width of the canvas in pixels.
+            height(int): The height of the canvas in pixels.
+        """
+        self.width = width
+        self.height = height
+        self.display_list = DisplayList()
+        self._items = 0
+
+    def _record(self, primitive, coordinates, options):
+        self.display_list.append(primitive, flatten_coordinates(coordinates), options)
+        self._items += 1
+        return self._items
+
+    def create_rectangle(self, *coordinates, **options):
+        """Record rectangle."""
+        return self._record("rectangle", coordinates, options)
+
+    def create_text(self, *coordinates, **options):
+        """Record text."""
+        return self._record("text", coordinates, options)
+
+    def create_line(self, *coordinates, **options):
+        """Record line."""
+        return self._record("line", coordinates, options)
+
+    def create_polygon(self, *coordinates, **options):
+        """Record polygon."""
+        return self._record("polygon", coordinates, options)
+
+
+###############################################################################
+# ItemRecorder
+###############################################################################
+
+
+class ItemRecorder(Backend):
+    """
+    Proxy for a backend that keeps track of the IDs of the items that are
+    created through it.
+
+    Attributes:
+        canvas: The backend to which drawing commands are forwarded.
+        items(``list``): The IDs of the created items in the order in which
+            they were created.
+    """
+
+    def __init__(self, canvas):
+        """
+        Create item recorder.
+
+        Args:
+            canvas: The backend to which to forward drawing commands.
+        """
+        self.canvas = canvas
+        self.items = []
+
+    def create_rectangle(self, *coordinates, **options):
+        """Forward rectangle and record its ID."""
+        item = self.canvas.create_rectangle(*coordinates, **options)
+        self.items.append(item)
+        return item
+
+    def create_text(self, *coordinates, **options):
+        """Forward text and record its ID."""
+        item = self.canvas.create_text(*coordinates, **options)
+        self.items.append(item)
+        return item
+
+    def create_line(self, *coordinates, **options):
+        """Forward line and record its ID."""
+        item = self.canvas.create_line(*coordinates, **options)
+        self.items.append(item)
+        return item
+
+    def create_polygon(self, *coordinates, **options):
+        """Forward polygon and record its ID."""
+        item = self.canvas.create_polygon(*coordinates, **options)
+        self.items.append(item)
+        return item
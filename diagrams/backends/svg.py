@@ -0,0 +1,160 @@
+"""
+diagrams.backends.svg
+=====================
+
+Provides a backend that streams diagrams to SVG files.
+"""
+import os
+from functools import lru_cache
+
+from diagrams._lazy import lazy_import
+from diagrams.backends.base import Backend, flatten_coordinates, resolve_options
+
+# Imports urllib.request, which is slow to import.
+saxutils = lazy_import("xml.sax.saxutils")
+
+
+@lru_cache(maxsize=1024)
+def _color(color):
+    """Convert ``tkinter`` color to SVG paint."""
+    if color == "":
+        return "none"
+    return saxutils.quoteattr(str(color))
+
+
+def _points(coordinates):
+    """Format flat coordinate list as SVG points attribute."""
+    coordinates = flatten_coordinates(coordinates)
+    return " ".join(
+        "%.2f,%.2f" % (x, y) for x, y in zip(coordinates[::2], coordinates[1::2])
+    )
+
+
+class SVGBackend(Backend):
+    """
+    A backend that writes the drawn primitives as SVG elements to a file.
+
+    Elements are written as soon as they are drawn and only a fixed number
+    of them is buffered before being written to the file, so that the
+    memory required is independent of the size of the diagram. The SVG
+    document is completed by calling ``close``, which also happens when
+    the backend is used as context manager.
+
+    Attributes:
+        width(int): The width of the canvas in pixels.
+        height(int): The height of the canvas in pixels.
+        chunk_size(int): The number of elements that are buffered before
+            they are written to the file.
+    """
+
+    def __init__(self, path_or_file, width, height, chunk_size=1024):
+        """
+        Create SVG backend.
+
+        Args:
+            path_or_file: Path of the file to write the SVG document to or
+                file object opened in text mode. A file opened by the
+                backend is closed when the backend is closed.
+            width(int): The width of the canvas in pixels.
+            height(int): The height of the canvas in pixels.
+            chunk_size(int): The number of elements that are buffered before
+                they are written to the file.
+        """
+        if isinstance(path_or_file, (str, os.PathLike)):
+            self._file = open(path_or_file, "w", encoding="utf-8")
+            self._owns_file = True
+        else:
+            self._file = path_or_file
+            self._owns_file = False
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self._buffer = []
+        self._items = 0
+        self._closed = False
+        self._file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+            f'height="{height}" viewBox="0 0 {width} {height}" '
+            'font-family="Helvetica, Arial, sans-serif" font-size="12">\n'
+            f'<rect x="0" y="0" width="{width}" height="{height}" fill="white"/>\n'
+        )
+
+    def _write(self, element):
+        """Append element to buffer and write buffer if it is full."""
+        buffer = self._buffer
+        buffer.append(element)
+        if len(buffer) >= self.chunk_size:
+            self.flush()
+        self._items += 1
+        return self._items
+
+    def flush(self):
+        """Write buffered elements to the file."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._buffer = []
+
+    def close(self):
+        """Complete the SVG document and write it to the file."""
+        if self._closed:
+            return
+        self._buffer.append("</svg>\n")
+        self.flush()
+        self._closed = True
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def create_rectangle(self, *coordinates, **options):
+        """Write rectangle."""
+        x_0, y_0, x_1, y_1 = flatten_coordinates(coordinates)
+        options = resolve_options("rectangle", options)
+        return self._write(
+            '<rect x="%.2f" y="%.2f" width="%.2f" height="%.2f" fill=%s stroke=%s/>\n'
+            % (
+                min(x_0, x_1),
+                min(y_0, y_1),
+                abs(x_1 - x_0),
+                abs(y_1 - y_0),
+                _color(options["fill"]),
+                _color(options["outline"]),
+            )
+        )
+
+    def create_text(self, *coordinates, **options):
+        """Write text."""
+        x, y = flatten_coordinates(coordinates)
+        options = resolve_options("text", options)
+        return self._write(
+            '<text x="%.2f" y="%.2f" fill=%s text-anchor="middle" '
+            'dominant-baseline="central">%s</text>\n'
+            % (x, y, _color(options["fill"]), saxutils.escape(str(options["text"])))
+        )
+
+    def create_line(self, *coordinates, **options):
+        """Write line."""
+        options = resolve_options("line", options)
+        return self._write(
+            '<polyline points="%s" fill="none" stroke=%s/>\n'
+            % (_points(coordinates), _color(options["fill"]))
+        )
+
+    def create_polygon(self, *coordinates, **options):
+        """Write polygon."""
+        options = resolve_options("polygon", options)
+        return self._write(
+            '<polygon points="%s" fill=%s stroke=%s/>\n'
+            % (
+                _points(coordinates),
+                _color(options["fill"]),
+                _color(options["outline"]),
+            )
+        )
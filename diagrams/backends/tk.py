@@ -0,0 +1,243 @@
+"""
+diagrams.backends.tk
+====================
+
+Provides functions to create ``tkinter`` canvases to display diagrams on
+and a backend that draws onto them in batches.
+"""
+from functools import lru_cache
+
+from diagrams.backends.base import Backend, flatten_coordinates
+
+# The default number of drawing commands submitted at once by
+# ``BatchedTkCanvas``.
+TK_BATCH_SIZE = 4096
+
+
+def create_tk_canvas(width, height, batch_size=None):
+    """
+    Create a ``tkinter`` window containing a canvas.
+
+    Args:
+        width(int): The width of the canvas in pixels.
+        height(int): The height of the canvas in pixels.
+        batch_size(int): If given, the canvas is wrapped in a
+            ``BatchedTkCanvas`` submitting this many drawing commands at
+            once.
+
+    Return:
+        Tuple ``(root, canvas)`` containing the ``tkinter.Tk`` root window
+        and the ``tkinter.Canvas`` to draw on.
+    """
+    import tkinter
+
+    root = tkinter.Tk()
+    canvas = tkinter.Canvas(root, bg="white", height=height, width=width)
+    if batch_size is not None:
+        canvas = BatchedTkCanvas(canvas, batch_size)
+    return root, canvas
+
+
+def create_scrollable_tk_canvas(width, height, scroll_region, on_view_change):
+    """
+    Create a ``tkinter`` window containing a scrollable canvas.
+
+    Args:
+        width(int): The width of the visible part of the canvas in pixels.
+        height(int): The height of the visible part of the canvas in pixels.
+        scroll_region: Tuple ``(x_0, y_0, x_1, y_1)`` defining the region
+            of the canvas that can be scrolled to.
+        on_view_change: Function without arguments to call whenever the
+            visible region of the canvas changes.
+
+    Return:
+        Tuple ``(root, canvas)`` containing the ``tkinter.Tk`` root window
+        and the ``tkinter.Canvas`` to draw on.
+    """
+    import tkinter
+
+    root, canvas = create_tk_canvas(width, height)
+
+    def scroll_x(*args):
+        canvas.xview(*args)
+        on_view_change()
+
+    def scroll_y(*args):
+        canvas.yview(*args)
+        on_view_change()
+
+    x_scrollbar = tkinter.Scrollbar(root, orient="horizontal", command=scroll_x)
+    y_scrollbar = tkinter.Scrollbar(root, orient="vertical", command=scroll_y)
+    canvas.configure(
+        scrollregion=scroll_region,
+        xscrollcommand=x_scrollbar.set,
+        yscrollcommand=y_scrollbar.set,
+    )
+    canvas.bind("<Configure>", lambda event: on_view_change())
+    x_scrollbar.pack(side="bottom", fill="x")
+    y_scrollbar.pack(side="right", fill="y")
+    canvas.pack(side="left", fill="both", expand=True)
+    return root, canvas
+
+
+###############################################################################
+# Batched drawing
+###############################################################################
+
+# Tcl procedure that creates items on a canvas. The items are given as a
+# list holding the arguments of the canvas' create command for each item.
+# It returns the ID of the last created item.
+_CREATE_ITEMS = "_diagrams_create_items"
+_CREATE_ITEMS_SCRIPT = f"""
+proc {_CREATE_ITEMS} {{canvas items}} {{
+    set item {{}}
+    foreach arguments $items {{
+        set item [$canvas create {{*}}$arguments]
+    }}
+    return $item
+}}
+"""
+
+
+@lru_cache(maxsize=4096)
+def _option_list(options):
+    """
+    Convert options of a drawing command to a Tcl option list.
+
+    Args:
+        options: Tuple of ``(name, value)`` pairs. Options with value
+            ``None`` are left out, as they are by ``tkinter``.
+
+    Return:
+        Flat ``tuple`` of option names and values.
+    """
+    result = ()
+    for name, value in options:
+        if value is not None:
+            result += ("-" + name.rstrip("_"), value)
+    return result
+
+
+class BatchedTkCanvas(Backend):
+    """
+    Proxy for a ``tkinter.Canvas`` that submits the drawing commands in
+    batches.
+
+    Each call of a drawing method of ``tkinter.Canvas`` is a separate call
+    into the Tcl interpreter. This backend instead collects the commands
+    that create items and submits them in a single call once ``batch_size``
+    commands are pending or when ``flush`` is called. The commands are
+    passed as a list to a Tcl procedure, which creates the items, so that
+    their arguments are neither quoted nor parsed by the interpreter.
+
+    The drawing methods nevertheless return the IDs of the created items.
+    Tk assigns consecutive IDs to the items of a canvas, so the ID of the
+    next item is determined once by creating and deleting an item, and the
+    IDs of the following items are counted on from it.
+
+    All other attributes are forwarded to the wrapped canvas. Calling a
+    forwarded method submits the pending commands first, so that it sees
+    all items created so far. The pending commands are also submitted when
+    the backend is used as context manager.
+
+    Attributes:
+        canvas(``tkinter.Canvas``): The wrapped canvas.
+        batch_size(``int``): The maximum number of pending commands.
+    """
+
+    def __init__(self, canvas, batch_size=TK_BATCH_SIZE):
+        """
+        Create batched canvas.
+
+        Args:
+            canvas(``tkinter.Canvas``): The canvas to draw onto.
+            batch_size(``int``): The maximum number of commands that are
+                submitted together.
+        """
+        self.canvas = canvas
+        self.batch_size = batch_size
+        self._tk = canvas.tk
+        self._path = canvas._w
+        self._items = []
+        self._next_id = None
+        self._tk.eval(_CREATE_ITEMS_SCRIPT)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.canvas, name)
+        if not callable(attribute):
+            return attribute
+
+        def forward(*args, **kwargs):
+            self.flush()
+            # The forwarded method might create items.
+            self._next_id = None
+            return attribute(*args, **kwargs)
+
+        return forward
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.flush()
+
+    def _create(self, primitive, coordinates, options):
+        """Add command creating a canvas item to the pending commands."""
+        if self._next_id is None:
+            self._next_id = self._probe()
+        arguments = [primitive] + flatten_coordinates(coordinates)
+        if options:
+            options = tuple(options.items())
+            try:
+                arguments += _option_list(options)
+            except TypeError:
+                # Unhashable option values can't be cached.
+                arguments += _option_list.__wrapped__(options)
+        self._items.append(arguments)
+        item = self._next_id
+        self._next_id += 1
+        if len(self._items) >= self.batch_size:
+            self.flush()
+        return item
+
+    def _probe(self):
+        """Determine the ID of the next item created on the canvas."""
+        self.flush()
+        item = self._tk.eval(
+            f"lindex [list [{self._path} create line 0 0 0 0 -tags _probe] "
+            f"[{self._path} delete _probe]] 0"
+        )
+        return int(item) + 1
+
+    def flush(self):
+        """Submit pending commands to the Tcl interpreter."""
+        if not self._items:
+            return
+        items = self._items
+        self._items = []
+        last = int(self._tk.call(_CREATE_ITEMS, self._path, items))
+        expected = self._next_id - 1
+        if last != expected:
+            # Items were created on the canvas without going through this
+            # backend, so the returned IDs are wrong.
+            self._next_id = None
+            raise RuntimeError(
+                f"Expected the last item created by the batch to have the ID "
+                f"{expected} but it has the ID {last}."
+            )
+
+    def create_rectangle(self, *coordinates, **options):
+        """Queue rectangle and return its ID."""
+        return self._create("rectangle", coordinates, options)
+
+    def create_text(self, *coordinates, **options):
+        """Queue text and return its ID."""
+        return self._create("text", coordinates, options)
+
+    def create_line(self, *coordinates, **options):
+        """Queue line and return its ID."""
+        return self._create("line", coordinates, options)
+
+    def create_polygon(self, *coordinates, **options):
+        """Queue polygon and return its ID."""
+        return self._create("polygon", coordinates, options)
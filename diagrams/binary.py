@@ -0,0 +1,404 @@
+"""
+diagrams.binary
+===============
+
+Provides a compact binary file format for diagrams, which can be opened
+without reading the file into memory.
+
+A file consists of a fixed-size header, a section directory and the data
+sections. The header holds the magic bytes ``DGRM``, the format version,
+the number of sections, the number of components, the width and height of
+the diagram and the number of rows per block of the block index. Each entry
+of the section directory holds the name of a section and the offset and
+length of its data in bytes. All values are stored in little-endian byte
+order and data sections start at multiples of ``ALIGNMENT`` bytes.
+
+The sections hold the columns of a component table (see
+``diagrams.procedural.table``), one section per column, the color and text
+tables as UTF-8 encoded strings together with their offsets and the
+bounding boxes of consecutive blocks of components. The latter allow
+finding the components in a region of the diagram while only reading the
+blocks that intersect it.
+"""
+import struct
+from collections.abc import Sequence
+from itertools import groupby
+
+import numpy as np
+
+from diagrams.object_oriented.components import (
+    Arrow,
+    Rectangle,
+    RectangularNode,
+    RoutedArrow,
+    Text,
+)
+from diagrams.object_oriented.diagram import Diagram
+from diagrams.procedural.components import ComponentType
+from diagrams.procedural.table import (
+    COLUMNS,
+    bounding_boxes,
+    create_arrows,
+    create_component_table,
+    create_rectangles,
+    create_rectangular_nodes,
+    create_texts,
+    type_runs,
+)
+from diagrams.specs import _color
+
+MAGIC = b"DGRM"
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+BLOCK_SIZE = 4096
+
+_HEADER = struct.Struct("<4sHHQIIQ")
+_SECTION = struct.Struct("<16sQQ")
+
+
+class StringTable(Sequence):
+    """
+    A read-only sequence of strings stored as concatenated UTF-8 data and
+    the offsets of the strings within it. Strings are only decoded when
+    they are accessed.
+    """
+
+    def __init__(self, offsets, data):
+        """
+        Create string table.
+
+        Args:
+            offsets: Array of ``n + 1`` integers holding the start offsets of
+                the ``n`` strings in ``data`` followed by its length.
+            data: Array of bytes holding the concatenated strings.
+        """
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError("String index out of range.")
+        index = index % len(self)
+        start, end = self._offsets[index : index + 2].tolist()
+        return self._data[start:end].tobytes().decode("utf-8")
+
+
+def _encode_strings(strings):
+    """Encode strings into offsets and data arrays."""
+    encoded = [string.encode("utf-8") for string in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(string) for string in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _column_dtype(name):
+    """Little-endian data type of table column."""
+    return np.dtype(COLUMNS[name][0]).newbyteorder("<")
+
+
+def _block_bounds(table, block_size):
+    """Bounding boxes of consecutive blocks of components."""
+    size = table["size"]
+    boxes = bounding_boxes(table, np.arange(size))
+    starts = np.arange(0, size, block_size)
+    if not starts.size:
+        return np.zeros((0, 4))
+    lower = np.minimum.reduceat(boxes[:, :2], starts, axis=0)
+    upper = np.maximum.reduceat(boxes[:, 2:], starts, axis=0)
+    return np.concatenate([lower, upper], 1)
+
+
+def save_table(path, table, width=0, height=0, block_size=BLOCK_SIZE):
+    """
+    Write component table to a binary file.
+
+    Args:
+        path: Path of the file to write.
+        table(``dict``): The component table to write.
+        width: The width of the diagram.
+        height: The height of the diagram.
+        block_size(``int``): The number of components per block of the
+            block index.
+    """
+    size = table["size"]
+    sections = []
+    for name in COLUMNS:
+        sections.append((name, table[name][:size].astype(_column_dtype(name))))
+    for name in ["colors", "texts"]:
+        offsets, data = _encode_strings(table[name])
+        sections.append((name + ".offsets", offsets))
+        sections.append((name + ".data", data))
+    sections.append(("blocks", _block_bounds(table, block_size).astype("<f8")))
+
+    position = _HEADER.size + len(sections) * _SECTION.size
+    directory = []
+    for name, data in sections:
+        position += -position % ALIGNMENT
+        directory.append((name, position, data.nbytes))
+        position += data.nbytes
+
+    with open(path, "wb") as output:
+        output.write(
+            _HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                len(sections),
+                size,
+                int(width),
+                int(height),
+                block_size,
+            )
+        )
+        for name, offset, length in directory:
+            output.write(_SECTION.pack(name.encode("ascii"), offset, length))
+        for (_, data), (_, offset, _) in zip(sections, directory):
+            output.write(b"\0" * (offset - output.tell()))
+            output.write(data.tobytes())
+
+
+def open_table(path):
+    """
+    Open component table stored in a binary file.
+
+    The file is memory-mapped, so that opening it takes constant time and
+    only the parts of the file that are accessed are read. The returned
+    table is read-only. In addition to the entries of a component table, it
+    holds the ``"width"`` and ``"height"`` of the diagram as well as the
+    ``"block_size"`` and ``"block_bounds"`` of the block index, which are
+    used by ``draw_all`` to find the components within a region.
+
+    Args:
+        path: Path of the file to open.
+
+    Return:
+        ``dict`` representing the component table.
+    """
+    data = np.memmap(path, dtype=np.uint8, mode="r")
+    if data.size < _HEADER.size:
+        raise ValueError(f"'{path}' is not a diagram file.")
+    magic, version, n_sections, size, width, height, block_size = _HEADER.unpack(
+        data[: _HEADER.size].tobytes()
+    )
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a diagram file.")
+    if version != FORMAT_VERSION:
+        raise ValueError(
+            f"Diagram file format version {version} is not supported. The "
+            f"supported version is {FORMAT_VERSION}."
+        )
+
+    sections = {}
+    position = _HEADER.size
+    for _ in range(n_sections):
+        name, offset, length = _SECTION.unpack(
+            data[position : position + _SECTION.size].tobytes()
+        )
+        sections[name.rstrip(b"\0").decode("ascii")] = data[offset : offset + length]
+        position += _SECTION.size
+
+    table = {
+        "size": size,
+        "width": width,
+        "height": height,
+        "block_size": block_size,
+        "block_bounds": sections["blocks"].view("<f8").reshape(-1, 4),
+        "color_indices": {},
+    }
+    for name, (_, shape) in COLUMNS.items():
+        column = sections[name].view(_column_dtype(name))
+        table[name] = column.reshape((size,) + shape)
+    for name in ["colors", "texts"]:
+        table[name] = StringTable(
+            sections[name + ".offsets"].view("<u8"), sections[name + ".data"]
+        )
+    return table
+
+
+###############################################################################
+# Diagrams
+###############################################################################
+
+
+def _component_type(component):
+    """Type of procedural component used to store a component."""
+    if isinstance(component, RectangularNode):
+        return ComponentType.RECTANGULAR_NODE
+    if isinstance(component, Rectangle):
+        return ComponentType.RECTANGLE
+    if isinstance(component, Text):
+        return ComponentType.TEXT
+    # Only the start and end of an arrow are stored, so routed arrows would
+    # be loaded as straight arrows.
+    if isinstance(component, Arrow) and not isinstance(component, RoutedArrow):
+        return ComponentType.ARROW
+    raise TypeError(
+        f"Components of type {type(component).__name__} can't be stored in a "
+        "diagram file."
+    )
+
+
+def _save_rectangles(table, rectangles):
+    """Add rectangles of the object oriented API to table."""
+    create_rectangles(
+        table,
+        [(r.position.x, r.position.y) for r in rectangles],
+        [(r.dimensions.x, r.dimensions.y) for r in rectangles],
+        [str(r.color) for r in rectangles],
+    )
+
+
+def _save_texts(table, texts):
+    """Add texts of the object oriented API to table."""
+    create_texts(
+        table,
+        [(t.position.x, t.position.y) for t in texts],
+        [t.text for t in texts],
+        [str(t.color) for t in texts],
+    )
+
+
+def _save_arrows(table, arrows):
+    """Add arrows of the object oriented API to table."""
+    create_arrows(
+        table,
+        [(a.position.x, a.position.y) for a in arrows],
+        [(a.end.x, a.end.y) for a in arrows],
+        [str(a.color) for a in arrows],
+        [a.head_size for a in arrows],
+    )
+
+
+def _save_rectangular_nodes(table, nodes):
+    """Add rectangular nodes of the object oriented API to table."""
+    create_rectangular_nodes(
+        table,
+        [(n.position.x, n.position.y) for n in nodes],
+        [(n.rectangle.dimensions.x, n.rectangle.dimensions.y) for n in nodes],
+        [n.text.text for n in nodes],
+        [str(n.color) for n in nodes],
+        [str(n.text.color) for n in nodes],
+    )
+
+
+_SAVE_FUNCTIONS = {
+    ComponentType.RECTANGLE: _save_rectangles,
+    ComponentType.TEXT: _save_texts,
+    ComponentType.ARROW: _save_arrows,
+    ComponentType.RECTANGULAR_NODE: _save_rectangular_nodes,
+}
+
+
+def _lookup(values, indices, convert=None):
+    """Look up indices into a table converting each used value only once."""
+    unique, inverse = np.unique(indices, return_inverse=True)
+    values = [values[index] for index in unique.tolist()]
+    if convert is not None:
+        values = [convert(value) for value in values]
+    return [values[index] for index in inverse.tolist()]
+
+
+def _colors(table, indices):
+    """Colors of the object oriented API for indices into the color table."""
+    return _lookup(table["colors"], indices, _color)
+
+
+def _load_rectangles(table, rows):
+    """Create rectangles of the object oriented API from rows of table."""
+    return [
+        Rectangle(position, dimensions, color=color)
+        for position, dimensions, color in zip(
+            table["position"][rows].tolist(),
+            table["dimensions"][rows].tolist(),
+            _colors(table, table["color"][rows]),
+        )
+    ]
+
+
+def _load_texts(table, rows):
+    """Create texts of the object oriented API from rows of table."""
+    return [
+        Text(text, position, color=color)
+        for position, text, color in zip(
+            table["position"][rows].tolist(),
+            _lookup(table["texts"], table["text"][rows]),
+            _colors(table, table["color"][rows]),
+        )
+    ]
+
+
+def _load_arrows(table, rows):
+    """Create arrows of the object oriented API from rows of table."""
+    return [
+        Arrow(start, end, color=color, head_size=head_size)
+        for start, end, color, head_size in zip(
+            table["position"][rows].tolist(),
+            table["dimensions"][rows].tolist(),
+            _colors(table, table["color"][rows]),
+            table["head_size"][rows].tolist(),
+        )
+    ]
+
+
+def _load_rectangular_nodes(table, rows):
+    """Create rectangular nodes of the object oriented API from rows of table."""
+    nodes = []
+    for position, dimensions, text, color, text_color in zip(
+        table["position"][rows].tolist(),
+        table["dimensions"][rows].tolist(),
+        _lookup(table["texts"], table["text"][rows]),
+        _colors(table, table["color"][rows]),
+        _colors(table, table["text_color"][rows]),
+    ):
+        node = RectangularNode(position, dimensions, text, color=color)
+        node.text.color = text_color
+        nodes.append(node)
+    return nodes
+
+
+_LOAD_FUNCTIONS = {
+    ComponentType.RECTANGLE: _load_rectangles,
+    ComponentType.TEXT: _load_texts,
+    ComponentType.ARROW: _load_arrows,
+    ComponentType.RECTANGULAR_NODE: _load_rectangular_nodes,
+}
+
+
+def save_diagram(path, diagram, block_size=BLOCK_SIZE):
+    """
+    Write diagram to a binary file.
+
+    Consecutive components of the same type are added to the component
+    table using a single call to the corresponding bulk constructor, so
+    that the order of the components is preserved.
+
+    Args:
+        path: Path of the file to write.
+        diagram(Diagram): The diagram to write.
+        block_size(``int``): The number of components per block of the
+            block index.
+    """
+    table = create_component_table(max(len(diagram.components), 1))
+    for component_type, components in groupby(diagram.components, _component_type):
+        _SAVE_FUNCTIONS[component_type](table, list(components))
+    save_table(path, table, diagram.width, diagram.height, block_size)
+
+
+def load_diagram(path):
+    """
+    Load diagram from a binary file.
+
+    Args:
+        path: Path of the file to load.
+
+    Return:
+        The loaded ``Diagram``.
+    """
+    table = open_table(path)
+    diagram = Diagram(table["width"], table["height"])
+    for component_type, start, end in type_runs(table["type"]):
+        for component in _LOAD_FUNCTIONS[component_type](table, slice(start, end)):
+            diagram.add(component)
+    return diagram
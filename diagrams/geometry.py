@@ -0,0 +1,114 @@
+"""
+diagrams.geometry
+=================
+
+Provides vectorized geometry computations shared by the object oriented and
+the procedural API.
+"""
+from diagrams._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+def arrow_heads(start_x, start_y, end_x, end_y, head_size):
+    """
+    Compute the head polygons of many arrows at once.
+
+    The computation is carried out with the same sequence of operations
+    as the drawing of a single arrow, so that the results are identical.
+
+    Args:
+        start_x: Array holding the horizontal coordinates of the arrow
+            start positions.
+        start_y: Array holding the vertical coordinates of the arrow start
+            positions.
+        end_x: Array holding the horizontal coordinates of the arrow tips.
+        end_y: Array holding the vertical coordinates of the arrow tips.
+        head_size: Size of the arrow heads in pixels as scalar or array.
+
+    Return:
+        Array of shape ``(N, 6)`` holding the coordinates of the three
+        vertices ``x_0, y_0, x_1, y_1, x_2, y_2`` of the head polygon of
+        each arrow.
+    """
+    start_x = np.asarray(start_x, dtype=np.float64)
+    start_y = np.asarray(start_y, dtype=np.float64)
+    end_x = np.asarray(end_x, dtype=np.float64)
+    end_y = np.asarray(end_y, dtype=np.float64)
+    head_size = np.asarray(head_size, dtype=np.float64)
+
+    angle = np.pi + np.arctan2(end_y - start_y, end_x - start_x)
+    heads = np.empty(angle.shape + (6,))
+    heads[..., 0] = end_x
+    heads[..., 1] = end_y
+    heads[..., 2] = end_x + head_size * np.cos(angle + np.pi / 6)
+    heads[..., 3] = end_y + head_size * np.sin(angle + np.pi / 6)
+    heads[..., 4] = end_x + head_size * np.cos(angle - np.pi / 6)
+    heads[..., 5] = end_y + head_size * np.sin(angle - np.pi / 6)
+    return heads
+
+
+def arrow_head(start_x, start_y, end_x, end_y, head_size):
+    """
+    Compute the head polygon of a single arrow.
+
+    The computation is carried out with the same sequence of operations as
+    in ``arrow_heads`` but on scalars, which avoids the overhead of creating
+    arrays for a single arrow.
+
+    Args:
+        start_x: The horizontal coordinate of the arrow start position.
+        start_y: The vertical coordinate of the arrow start position.
+        end_x: The horizontal coordinate of the arrow tip.
+        end_y: The vertical coordinate of the arrow tip.
+        head_size: Size of the arrow head in pixels.
+
+    Return:
+        List holding the coordinates of the three vertices ``x_0, y_0, x_1,
+        y_1, x_2, y_2`` of the head polygon.
+    """
+    angle = np.pi + np.arctan2(end_y - start_y, end_x - start_x)
+    return [
+        end_x,
+        end_y,
+        float(end_x + head_size * np.cos(angle + np.pi / 6)),
+        float(end_y + head_size * np.sin(angle + np.pi / 6)),
+        float(end_x + head_size * np.cos(angle - np.pi / 6)),
+        float(end_y + head_size * np.sin(angle - np.pi / 6)),
+    ]
+
+
+ANCHORS = {
+    "left": (0.0, 0.5),
+    "top_left": (0.0, 0.0),
+    "top": (0.5, 0.0),
+    "top_right": (1.0, 0.0),
+    "right": (1.0, 0.5),
+    "bottom_right": (1.0, 1.0),
+    "bottom": (0.5, 1.0),
+    "bottom_left": (0.0, 1.0),
+}
+
+
+def anchor_positions(positions, dimensions, anchor):
+    """
+    Compute an anchor of many rectangular components at once.
+
+    Args:
+        positions: Array of shape ``(N, 2)`` holding the upper left corners
+            of the components.
+        dimensions: Array of shape ``(N, 2)`` holding the horizontal and
+            vertical extent of the components.
+        anchor(``str``): Name of the anchor, i.e. one of the keys of
+            ``ANCHORS``.
+
+    Return:
+        Array of shape ``(N, 2)`` holding the anchor positions.
+    """
+    try:
+        factors = ANCHORS[anchor]
+    except KeyError:
+        raise ValueError(f"'{anchor}' is not a known anchor.")
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 2)
+    dimensions = np.asarray(dimensions, dtype=np.float64).reshape(-1, 2)
+    return positions + dimensions * np.array(factors)
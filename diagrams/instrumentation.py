@@ -0,0 +1,194 @@
+"""
+diagrams.instrumentation
+========================
+
+Provides opt-in instrumentation of the drawing of diagram components.
+
+While instrumentation is enabled, diagrams and the ``draw`` function of
+the procedural API record for each type of component how often it was
+drawn, the wall time spent drawing it and the number of primitives it
+emitted on the canvas. Hooks can be registered to be called before and
+after each measured drawing call, for example to emit tracing spans.
+
+Instrumentation is disabled by default. The drawing code then only checks
+a single module attribute per drawn diagram or procedural ``draw`` call.
+"""
+from contextlib import contextmanager
+from time import perf_counter
+
+ENABLED = False
+
+_BEFORE_HOOKS = []
+_AFTER_HOOKS = []
+
+
+def enable():
+    """Enable instrumentation."""
+    global ENABLED
+    ENABLED = True
+
+
+def disable():
+    """Disable instrumentation."""
+    global ENABLED
+    ENABLED = False
+
+
+@contextmanager
+def instrumented():
+    """
+    Context manager that enables instrumentation within its body.
+    """
+    global ENABLED
+    previous = ENABLED
+    ENABLED = True
+    try:
+        yield
+    finally:
+        ENABLED = previous
+
+
+def add_hooks(before=None, after=None):
+    """
+    Register functions to call before and after each measured drawing call.
+
+    Args:
+        before: Function called as ``before(name, count)`` with the name of
+            the component type and the number of components about to be
+            drawn.
+        after: Function called as ``after(name, count, seconds,
+            primitives)`` with the wall time in seconds spent drawing and
+            the number of primitives drawn on the canvas.
+    """
+    if before is not None:
+        _BEFORE_HOOKS.append(before)
+    if after is not None:
+        _AFTER_HOOKS.append(after)
+
+
+def remove_hooks(before=None, after=None):
+    """
+    Remove functions registered using ``add_hooks``.
+
+    Args:
+        before: The function to remove from the before hooks.
+        after: The function to remove from the after hooks.
+    """
+    if before is not None:
+        _BEFORE_HOOKS.remove(before)
+    if after is not None:
+        _AFTER_HOOKS.remove(after)
+
+
+class DrawStats:
+    """
+    Accumulates the drawing statistics per component type.
+    """
+
+    def __init__(self):
+        """Create empty statistics."""
+        self._entries = {}
+
+    def record(self, name, calls, seconds, primitives):
+        """
+        Add measurement to statistics.
+
+        Args:
+            name(``str``): The name of the component type.
+            calls(``int``): The number of components drawn.
+            seconds(``float``): The wall time spent drawing them.
+            primitives(``int``): The number of primitives drawn.
+        """
+        entry = self._entries.get(name)
+        if entry is None:
+            entry = self._entries[name] = [0, 0.0, 0]
+        entry[0] += calls
+        entry[1] += seconds
+        entry[2] += primitives
+
+    def reset(self):
+        """Discard all measurements."""
+        self._entries = {}
+
+    def as_dict(self):
+        """
+        Return:
+            ``dict`` mapping the names of the component types to ``dict``s
+            holding the number of ``calls``, the ``time`` in seconds and
+            the number of ``primitives``.
+        """
+        return {
+            name: {"calls": calls, "time": seconds, "primitives": primitives}
+            for name, (calls, seconds, primitives) in self._entries.items()
+        }
+
+
+class PrimitiveCounter:
+    """
+    Canvas proxy that counts the primitives drawn onto a canvas.
+
+    All other attributes are forwarded to the wrapped canvas.
+
+    Attributes:
+        canvas: The wrapped canvas.
+        count(``int``): The number of primitives drawn so far.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.count = 0
+
+    def __getattr__(self, name):
+        return getattr(self.canvas, name)
+
+    def create_rectangle(self, *args, **kwargs):
+        """Draw rectangle on canvas."""
+        self.count += 1
+        return self.canvas.create_rectangle(*args, **kwargs)
+
+    def create_text(self, *args, **kwargs):
+        """Draw text on canvas."""
+        self.count += 1
+        return self.canvas.create_text(*args, **kwargs)
+
+    def create_line(self, *args, **kwargs):
+        """Draw line on canvas."""
+        self.count += 1
+        return self.canvas.create_line(*args, **kwargs)
+
+    def create_polygon(self, *args, **kwargs):
+        """Draw polygon on canvas."""
+        self.count += 1
+        return self.canvas.create_polygon(*args, **kwargs)
+
+
+@contextmanager
+def measure(stats, name, count, canvas):
+    """
+    Measure the drawing of components.
+
+    The body of the ``with`` statement should draw the components on the
+    canvas proxy returned by the context manager, which counts the drawn
+    primitives. The registered hooks are called before and after the
+    body.
+
+    Args:
+        stats(DrawStats): The statistics to add the measurement to.
+        name(``str``): The name of the component type.
+        count(``int``): The number of components drawn.
+        canvas: The canvas onto which the components are drawn.
+
+    Return:
+        A ``PrimitiveCounter`` wrapping the canvas.
+    """
+    counter = PrimitiveCounter(canvas)
+    for hook in _BEFORE_HOOKS:
+        hook(name, count)
+    start = perf_counter()
+    try:
+        yield counter
+    finally:
+        seconds = perf_counter() - start
+        stats.record(name, count, seconds, counter.count)
+        for hook in _AFTER_HOOKS:
+            hook(name, count, seconds, counter.count)
@@ -0,0 +1,726 @@
+"""
+diagrams.layout
+===============
+
+Provides automatic layouts for graphs of rectangular nodes, which are shared
+by the object oriented and the procedural API.
+
+The layered layout arranges the nodes of a directed graph in layers, so that
+edges point in the same direction. It follows the steps of the Sugiyama
+method:
+
+ 1. Cycles are broken by reversing edges that point backwards in an order
+    of the nodes found by a greedy heuristic.
+ 2. Nodes are assigned to layers by the longest path from the sources. Nodes
+    are then moved as close to their successors as possible, to shorten the
+    edges.
+ 3. Edges spanning several layers are split into chains of dummy nodes, so
+    that all edges connect adjacent layers.
+ 4. Edge crossings are reduced by sweeping over the layers and sorting the
+    nodes of each layer by the barycenters of their neighbors in the
+    previous layer.
+ 5. The nodes of each layer are placed close to the barycenters of their
+    neighbors without overlapping.
+
+The graph is given by the sizes of the nodes and the indices of the source
+and target nodes of the edges. Steps 1 and 2 are carried out in Python with
+linear cost, all other steps are vectorized per layer.
+
+The force-directed layout arranges the nodes of an undirected graph by
+simulating forces that pull connected nodes together and push all nodes
+apart. The repulsive forces are approximated using a quadtree (Barnes-Hut),
+which is built and traversed for all nodes at once using sorted Morton
+codes, so that each iteration is vectorized and takes ``O(n log n)`` time.
+"""
+import heapq
+
+from diagrams._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+DIRECTIONS = ("right", "down")
+
+
+def _adjacency(n, sources, targets):
+    """
+    Adjacency lists of a graph in compressed form.
+
+    Return:
+        Tuple ``(starts, neighbors, edges)`` of lists such that the
+        neighbors of node ``i`` are ``neighbors[starts[i]:starts[i + 1]]``
+        and the corresponding edges are ``edges[starts[i]:starts[i + 1]]``.
+    """
+    order = np.argsort(sources, kind="stable")
+    starts = np.searchsorted(sources[order], np.arange(n + 1))
+    return starts.tolist(), targets[order].tolist(), order.tolist()
+
+
+def remove_cycles(n, sources, targets):
+    """
+    Find edges whose reversal makes a directed graph acyclic.
+
+    The nodes are ordered using the greedy heuristic of Eades, Lin and
+    Smyth, which repeatedly moves sinks to the end of the order, sources to
+    the start of the order and otherwise the node with the largest
+    difference of outgoing and incoming edges to the start of the order.
+    Edges pointing backwards in the order are reversed. Graphs without
+    cycles are left unchanged. Loops, i.e. edges from a node to itself,
+    are not reversed.
+
+    Args:
+        n(``int``): The number of nodes.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+
+    Return:
+        Boolean array that is ``True`` for the edges to reverse.
+    """
+    successor_starts, successors, _ = _adjacency(n, sources, targets)
+    predecessor_starts, predecessors, _ = _adjacency(n, targets, sources)
+    out_degrees = np.diff(successor_starts).tolist()
+    in_degrees = np.diff(predecessor_starts).tolist()
+    removed = bytearray(n)
+    sinks = [node for node in range(n) if not out_degrees[node]]
+    node_sources = [node for node in range(n) if not in_degrees[node]]
+    candidates = [(in_degrees[node] - out_degrees[node], node) for node in range(n)]
+    heapq.heapify(candidates)
+    start, end = [], []
+
+    def remove(node):
+        removed[node] = 1
+        for successor in successors[
+            successor_starts[node] : successor_starts[node + 1]
+        ]:
+            if not removed[successor]:
+                in_degrees[successor] -= 1
+                if not in_degrees[successor]:
+                    node_sources.append(successor)
+                heapq.heappush(
+                    candidates,
+                    (in_degrees[successor] - out_degrees[successor], successor),
+                )
+        for predecessor in predecessors[
+            predecessor_starts[node] : predecessor_starts[node + 1]
+        ]:
+            if not removed[predecessor]:
+                out_degrees[predecessor] -= 1
+                if not out_degrees[predecessor]:
+                    sinks.append(predecessor)
+                heapq.heappush(
+                    candidates,
+                    (in_degrees[predecessor] - out_degrees[predecessor], predecessor),
+                )
+
+    remaining = n
+    while remaining:
+        if sinks:
+            node = sinks.pop()
+            if not removed[node]:
+                end.append(node)
+                remove(node)
+                remaining -= 1
+        elif node_sources:
+            node = node_sources.pop()
+            if not removed[node]:
+                start.append(node)
+                remove(node)
+                remaining -= 1
+        else:
+            difference, node = heapq.heappop(candidates)
+            # Skip outdated entries of the heap.
+            if not removed[node] and difference == (
+                in_degrees[node] - out_degrees[node]
+            ):
+                start.append(node)
+                remove(node)
+                remaining -= 1
+
+    order = np.empty(n, dtype=np.int64)
+    order[start + end[::-1]] = np.arange(n)
+    return order[sources] > order[targets]
+
+
+def assign_ranks(n, sources, targets):
+    """
+    Assign the nodes of a directed acyclic graph to layers.
+
+    Each node is first assigned the length of the longest path leading to
+    it. Nodes with successors are then moved to the layer preceding their
+    closest successor.
+
+    Args:
+        n(``int``): The number of nodes.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+
+    Return:
+        Integer array holding the layer of each node.
+    """
+    starts, neighbors, _ = _adjacency(n, sources, targets)
+    in_degrees = np.bincount(targets, minlength=n).tolist()
+    ranks = [0] * n
+    order = [node for node in range(n) if not in_degrees[node]]
+    # ``order`` grows while it is traversed and ends up in topological order.
+    for node in order:
+        rank = ranks[node] + 1
+        for neighbor in neighbors[starts[node] : starts[node + 1]]:
+            if ranks[neighbor] < rank:
+                ranks[neighbor] = rank
+            in_degrees[neighbor] -= 1
+            if not in_degrees[neighbor]:
+                order.append(neighbor)
+    if len(order) != n:
+        raise ValueError("The graph contains cycles.")
+    for node in reversed(order):
+        successors = neighbors[starts[node] : starts[node + 1]]
+        if successors:
+            ranks[node] = min([ranks[successor] for successor in successors]) - 1
+    return np.array(ranks, dtype=np.int64)
+
+
+def insert_dummy_nodes(ranks, sources, targets):
+    """
+    Split edges spanning several layers into chains of edges between
+    adjacent layers.
+
+    Args:
+        ranks: Integer array holding the layer of each node.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+            Each target must be in a layer after that of its source.
+
+    Return:
+        Tuple ``(ranks, sources, targets)`` holding the layers of the nodes
+        followed by those of the dummy nodes and the source and target nodes
+        of the split edges.
+    """
+    n = len(ranks)
+    extra = ranks[targets] - ranks[sources] - 1
+    total = int(extra.sum())
+    if not total:
+        return ranks, sources, targets
+    dummies = n + np.arange(total)
+    edge = np.repeat(np.arange(len(extra)), extra)
+    ends = np.cumsum(extra)
+    step = np.arange(total) - np.repeat(ends - extra, extra)
+    dummy_ranks = ranks[sources][edge] + step + 1
+    previous = np.where(step == 0, sources[edge], dummies - 1)
+    split = extra > 0
+    return (
+        np.concatenate([ranks, dummy_ranks]),
+        np.concatenate([sources[~split], previous, n + ends[split] - 1]),
+        np.concatenate([targets[~split], dummies, targets[split]]),
+    )
+
+
+def _group_edges(ranks, sources, targets, n_layers):
+    """
+    Sort edges by the layer of their targets.
+
+    Return:
+        Tuple ``(sources, targets, starts)`` holding the sorted edges and
+        the index of the first edge into each layer followed by the number
+        of edges.
+    """
+    edges = np.argsort(ranks[targets], kind="stable")
+    sources = sources[edges]
+    targets = targets[edges]
+    starts = np.searchsorted(ranks[targets], np.arange(n_layers + 1))
+    return sources, targets, starts
+
+
+def _barycenters(positions, values, ends, others, size, default):
+    """
+    Compute the barycenters of the neighbors of the nodes of a layer.
+
+    Args:
+        positions: The position of each node within its layer.
+        values: The values to average for each node.
+        ends: The nodes in the layer at one end of the edges.
+        others: The nodes at the other end of the edges.
+        size: The number of nodes in the layer.
+        default: The values to use for nodes without neighbors.
+
+    Return:
+        Array holding the barycenter of each node of the layer in the order
+        of their positions.
+    """
+    counts = np.bincount(positions[ends], minlength=size)
+    sums = np.bincount(positions[ends], weights=values[others], minlength=size)
+    return np.where(counts > 0, sums / np.maximum(counts, 1), default)
+
+
+def _sweeps(n_layers, edge_starts, sources, targets, passes):
+    """
+    Generate the layers visited by downward and upward sweeps together with
+    the nodes at both ends of the edges connecting them to the previous
+    layer of the sweep.
+    """
+    for _ in range(passes):
+        for layer in range(1, n_layers):
+            edges = slice(edge_starts[layer], edge_starts[layer + 1])
+            yield layer, targets[edges], sources[edges]
+        for layer in range(n_layers - 2, -1, -1):
+            edges = slice(edge_starts[layer + 1], edge_starts[layer + 2])
+            yield layer, sources[edges], targets[edges]
+
+
+def order_layers(ranks, sources, targets, sweeps=4):
+    """
+    Order the nodes within their layers to reduce edge crossings.
+
+    Args:
+        ranks: Integer array holding the layer of each node.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+            Each target must be in the layer after that of its source.
+        sweeps(``int``): The number of downward and upward sweeps.
+
+    Return:
+        Tuple ``(nodes, layer_starts, positions)`` holding the indices of
+        the nodes sorted by layer and position within the layer, the start
+        index of each layer in ``nodes`` followed by the number of nodes,
+        and the position of each node within its layer.
+    """
+    n = len(ranks)
+    n_layers = int(ranks.max()) + 1 if n else 0
+    nodes = np.argsort(ranks, kind="stable")
+    layer_starts = np.searchsorted(ranks[nodes], np.arange(n_layers + 1))
+    positions = np.empty(n, dtype=np.int64)
+    positions[nodes] = np.arange(n) - layer_starts[ranks[nodes]]
+
+    sources, targets, edge_starts = _group_edges(ranks, sources, targets, n_layers)
+    for layer, ends, others in _sweeps(n_layers, edge_starts, sources, targets, sweeps):
+        layer_nodes = nodes[layer_starts[layer] : layer_starts[layer + 1]]
+        size = len(layer_nodes)
+        current = np.arange(size, dtype=np.float64)
+        barycenters = _barycenters(positions, positions, ends, others, size, current)
+        layer_nodes[:] = layer_nodes[np.argsort(barycenters, kind="stable")]
+        positions[layer_nodes] = np.arange(size)
+    return nodes, layer_starts, positions
+
+
+def _place(desired, extents, spacing):
+    """
+    Place nodes of a layer close to the desired centers, keeping their order
+    and the given spacing between them.
+
+    The result is the average of placing the nodes from left to right and
+    from right to left, each time moving nodes that overlap their
+    predecessor just far enough.
+    """
+    separations = 0.5 * (extents[:-1] + extents[1:]) + spacing
+    offsets = np.concatenate([[0.0], np.cumsum(separations)])
+    shifted = desired - offsets
+    forward = np.maximum.accumulate(shifted)
+    backward = np.minimum.accumulate(shifted[::-1])[::-1]
+    return 0.5 * (forward + backward) + offsets
+
+
+def assign_coordinates(
+    ranks, nodes, layer_starts, positions, extents, sources, targets, spacing, passes=2
+):
+    """
+    Compute the coordinates of the centers of nodes along their layers.
+
+    The nodes are first packed from the start of their layer. They are then
+    moved towards the barycenters of their neighbors in downward and upward
+    passes over the layers.
+
+    Args:
+        ranks: Integer array holding the layer of each node.
+        nodes: The indices of the nodes sorted by layer and position within
+            the layer as returned by ``order_layers``.
+        layer_starts: The start index of each layer in ``nodes`` followed by
+            the number of nodes.
+        positions: The position of each node within its layer.
+        extents: The extent of each node along its layer.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+            Each target must be in the layer after that of its source.
+        spacing(``float``): The minimum distance between nodes of a layer.
+        passes(``int``): The number of downward and upward passes.
+
+    Return:
+        Array holding the coordinate of the center of each node.
+    """
+    n_layers = len(layer_starts) - 1
+    centers = np.zeros(len(extents))
+    for layer in range(n_layers):
+        layer_nodes = nodes[layer_starts[layer] : layer_starts[layer + 1]]
+        centers[layer_nodes] = _place(
+            np.zeros(len(layer_nodes)), extents[layer_nodes], spacing
+        )
+
+    sources, targets, edge_starts = _group_edges(ranks, sources, targets, n_layers)
+    for layer, ends, others in _sweeps(n_layers, edge_starts, sources, targets, passes):
+        layer_nodes = nodes[layer_starts[layer] : layer_starts[layer + 1]]
+        current = centers[layer_nodes]
+        desired = _barycenters(
+            positions, centers, ends, others, len(layer_nodes), current
+        )
+        centers[layer_nodes] = _place(desired, extents[layer_nodes], spacing)
+    return centers
+
+
+def layered_positions(
+    sizes,
+    sources,
+    targets,
+    direction="right",
+    layer_spacing=50.0,
+    node_spacing=20.0,
+    sweeps=4,
+):
+    """
+    Compute a layered layout of a directed graph.
+
+    Args:
+        sizes: Array of shape ``(n, 2)`` holding the width and height of
+            each node.
+        sources: Array holding the indices of the source nodes of the edges.
+        targets: Array holding the indices of the target nodes of the edges.
+        direction(``str``): The direction in which edges point, i.e.
+            ``"right"`` or ``"down"``.
+        layer_spacing(``float``): The distance between layers.
+        node_spacing(``float``): The minimum distance between the nodes of
+            a layer.
+        sweeps(``int``): The number of sweeps over the layers to reduce
+            edge crossings.
+
+    Return:
+        Tuple ``(positions, extent)`` holding an array of shape ``(n, 2)``
+        with the upper left corners of the nodes and the width and height
+        of the layout. The upper left corner of the layout is at the
+        origin.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Direction must be one of {DIRECTIONS} but is '{direction}'.")
+    sizes = np.asarray(sizes, dtype=np.float64).reshape(-1, 2)
+    sources = np.asarray(sources, dtype=np.int64).ravel()
+    targets = np.asarray(targets, dtype=np.int64).ravel()
+    n = len(sizes)
+    if not n:
+        return np.zeros((0, 2)), (0.0, 0.0)
+    if sources.size and (
+        min(sources.min(), targets.min()) < 0 or max(sources.max(), targets.max()) >= n
+    ):
+        raise ValueError("Edges must connect nodes with indices from 0 to n - 1.")
+
+    # Axis 0 runs along the edges, axis 1 along the layers.
+    if direction == "down":
+        sizes = sizes[:, ::-1]
+    loops = sources == targets
+    sources = sources[~loops]
+    targets = targets[~loops]
+    reverse = remove_cycles(n, sources, targets)
+    sources, targets = (
+        np.where(reverse, targets, sources),
+        np.where(reverse, sources, targets),
+    )
+    ranks = assign_ranks(n, sources, targets)
+    ranks, sources, targets = insert_dummy_nodes(ranks, sources, targets)
+    nodes, layer_starts, positions = order_layers(ranks, sources, targets, sweeps)
+
+    extents = np.zeros(len(ranks))
+    extents[:n] = sizes[:, 1]
+    centers = assign_coordinates(
+        ranks, nodes, layer_starts, positions, extents, sources, targets, node_spacing
+    )[:n]
+
+    thickness = np.zeros(len(layer_starts) - 1)
+    np.maximum.at(thickness, ranks[:n], sizes[:, 0])
+    layer_offsets = np.concatenate([[0.0], np.cumsum(thickness + layer_spacing)])
+
+    result = np.empty((n, 2))
+    result[:, 0] = layer_offsets[ranks[:n]] + 0.5 * (thickness[ranks[:n]] - sizes[:, 0])
+    result[:, 1] = centers - 0.5 * sizes[:, 1]
+    result[:, 1] -= result[:, 1].min()
+    extent = (
+        float((result[:, 0] + sizes[:, 0]).max()),
+        float((result[:, 1] + sizes[:, 1]).max()),
+    )
+    if direction == "down":
+        return result[:, ::-1].copy(), extent[::-1]
+    return result, extent
+
+
+###############################################################################
+# Force-directed layout
+###############################################################################
+
+# The number of levels of the quadtree below its root. Points are located
+# on a grid of 2 ** _QUADTREE_DEPTH cells along each axis.
+_QUADTREE_DEPTH = 15
+
+
+def _spread_bits(values):
+    """Insert a zero bit after each of the lower 16 bits of integers."""
+    values = values.astype(np.uint64)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x33333333)
+    values = (values | (values << np.uint64(1))) & np.uint64(0x55555555)
+    return values
+
+
+def _expand_ranges(starts, counts):
+    """
+    Expand ranges of indices.
+
+    Args:
+        starts: The first index of each range.
+        counts: The length of each range.
+
+    Return:
+        Tuple ``(ranges, indices)`` holding for all indices in all ranges
+        the index of the range and the index itself.
+    """
+    ranges = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.cumsum(counts) - counts
+    indices = np.repeat(starts - offsets, counts) + np.arange(len(ranges))
+    return ranges, indices
+
+
+class Quadtree:
+    """
+    A quadtree over points, which is stored level by level in arrays.
+
+    The points are sorted by the Morton codes of their grid cells, so that
+    the points in each cell of each level are contiguous and so are the
+    children of each cell in the next level. For each level, the tree holds
+    the codes, the number of points and the center of mass of the
+    non-empty cells of the level. The children of cell ``i`` are the cells
+    ``children[i]`` to ``children[i + 1]`` of the next level.
+
+    Attributes:
+        size(``float``): The side length of the square covered by the tree.
+        codes: The Morton code of the cell of each point on the lowest
+            level.
+        levels(``list``): One tuple ``(codes, counts, centers, children)``
+            of arrays per level starting at the root.
+    """
+
+    def __init__(self, points):
+        """
+        Build quadtree.
+
+        Args:
+            points: Array of shape ``(n, 2)`` holding the points.
+        """
+        lower = points.min(axis=0)
+        size = float((points.max(axis=0) - lower).max()) or 1.0
+        cells = 2**_QUADTREE_DEPTH
+        grid = np.minimum(
+            ((points - lower) * (cells / size)).astype(np.int64), cells - 1
+        )
+        codes = _spread_bits(grid[:, 0]) | (_spread_bits(grid[:, 1]) << np.uint64(1))
+        codes = codes.astype(np.int64)
+        order = np.argsort(codes, kind="stable")
+        sorted_codes = codes[order]
+        sorted_points = points[order]
+
+        self.size = size
+        self.codes = codes
+        self.levels = []
+        for level in range(_QUADTREE_DEPTH + 1):
+            level_codes = sorted_codes >> 2 * (_QUADTREE_DEPTH - level)
+            starts = np.flatnonzero(
+                np.concatenate([[True], level_codes[1:] != level_codes[:-1]])
+            )
+            counts = np.diff(np.append(starts, len(points)))
+            centers = np.add.reduceat(sorted_points, starts, axis=0) / counts[:, None]
+            self.levels.append([level_codes[starts], counts, centers])
+        for parent, level in zip(self.levels, self.levels[1:]):
+            children = np.searchsorted(level[0] >> 2, parent[0])
+            parent.append(np.append(children, len(level[0])))
+        self.levels[-1].append(None)
+
+
+def _add_forces(forces, indices, delta, weights):
+    """Add forces along ``delta`` with the given weights to points."""
+    n = len(forces)
+    forces[:, 0] += np.bincount(indices, weights * delta[:, 0], minlength=n)
+    forces[:, 1] += np.bincount(indices, weights * delta[:, 1], minlength=n)
+
+
+def repulsive_forces(points, strength, theta=1.2):
+    """
+    Compute the forces that points repelling each other exert on each
+    other.
+
+    The force between two points at distance ``d`` has the magnitude
+    ``strength / d``. The forces are approximated using the Barnes-Hut
+    method. Starting at the root of a quadtree, the cells that are small
+    compared to their distance to a point, i.e. whose side length is less
+    than ``theta`` times the distance, are treated as a single point at
+    their center of mass. All other cells are replaced by their children.
+    This is done for all points at once, level by level, so that the cost
+    of each level is linear in the number of visited pairs of points and
+    cells.
+
+    Args:
+        points: Array of shape ``(n, 2)`` holding the points.
+        strength(``float``): The strength of the force.
+        theta(``float``): The accuracy parameter of the approximation.
+            Smaller values are more accurate. For 0 the forces are exact.
+
+    Return:
+        Array of shape ``(n, 2)`` holding the total force on each point.
+    """
+    n = len(points)
+    forces = np.zeros((n, 2))
+    if n < 2:
+        return forces
+    tree = Quadtree(points)
+    # Squared distances below this are increased to it to avoid infinite
+    # forces.
+    minimum_2 = (1e-6 * tree.size) ** 2
+    point_indices = np.arange(n)
+    cells = np.zeros(n, dtype=np.int64)
+    for level, (codes, counts, centers, children) in enumerate(tree.levels):
+        count = counts[cells]
+        contains = tree.codes[point_indices] >> 2 * (_QUADTREE_DEPTH - level)
+        contains = contains == codes[cells]
+        delta = points[point_indices] - centers[cells]
+        if level == _QUADTREE_DEPTH:
+            # Points in the same cell of the lowest level are treated as a
+            # single point at the center of mass of the other points.
+            others = count - contains
+            delta[contains] *= (count / np.maximum(others, 1))[contains, None]
+            accept = others > 0
+            count = others
+        else:
+            distance_2 = (delta**2).sum(axis=1)
+            cell_size = tree.size / 2**level
+            far = cell_size**2 < theta**2 * distance_2
+            accept = ~contains & ((count == 1) | far)
+
+        delta = delta[accept]
+        weights = strength * count[accept]
+        weights /= np.maximum((delta**2).sum(axis=1), minimum_2)
+        _add_forces(forces, point_indices[accept], delta, weights)
+        if level == _QUADTREE_DEPTH:
+            break
+
+        # Replace cells that weren't accepted by their children. Cells
+        # holding only the point itself are dropped.
+        expand = ~accept & (count > 1)
+        if not expand.any():
+            break
+        cells = cells[expand]
+        pairs, cells = _expand_ranges(children[cells], np.diff(children)[cells])
+        point_indices = point_indices[expand][pairs]
+    return forces
+
+
+def force_positions(
+    positions,
+    sources,
+    targets,
+    spring_length=50.0,
+    iterations=100,
+    tolerance=0.01,
+    pinned=None,
+    theta=1.2,
+    seed=0,
+):
+    """
+    Position nodes of an undirected graph using a force-directed layout.
+
+    Nodes repel each other with a force of magnitude ``K ** 2 / d`` and
+    connected nodes attract each other with a force of magnitude
+    ``d ** 2 / K``, where ``d`` is the distance between the nodes and ``K``
+    the spring length, so that two connected nodes on their own end up
+    ``K`` apart. The repulsive forces are approximated using the
+    Barnes-Hut method, see ``repulsive_forces``, so that each iteration
+    takes ``O(n log n)`` time.
+
+    In each iteration, all nodes move along the forces on them by at most
+    a step size. The step size is adapted as proposed by Hu (2005): It is
+    reduced whenever the total energy of the forces increases and
+    increased again after five consecutive iterations that reduced it.
+
+    Args:
+        positions: Array of shape ``(n, 2)`` holding the initial positions
+            of the nodes. Nodes at the same position are separated by a
+            small random offset. If all nodes are at the same position,
+            they are scattered randomly first.
+        sources: The indices of the nodes at which the edges start.
+        targets: The indices of the nodes at which the edges end. Edges
+            that start and end at the same node are ignored.
+        spring_length(``float``): The desired length of the edges.
+        iterations(``int``): The maximum number of iterations.
+        tolerance(``float``): The layout is considered converged when no
+            node moves by more than this fraction of the spring length in
+            an iteration.
+        pinned: Optional boolean mask or indices of nodes that keep their
+            positions. They still exert forces on the other nodes.
+        theta(``float``): The accuracy parameter of the Barnes-Hut method.
+        seed(``int``): Seed for the random offsets.
+
+    Return:
+        Tuple ``(positions, iterations)`` holding the positions of the
+        nodes as array of shape ``(n, 2)`` and the number of iterations
+        that were performed.
+    """
+    positions = np.array(positions, dtype=np.float64).reshape(-1, 2)
+    n = len(positions)
+    sources = np.asarray(sources, dtype=np.int64).ravel()
+    targets = np.asarray(targets, dtype=np.int64).ravel()
+    if len(sources) != len(targets):
+        raise ValueError("'sources' and 'targets' must have the same length.")
+    if ((sources < 0) | (sources >= n) | (targets < 0) | (targets >= n)).any():
+        raise ValueError("Edges must connect nodes with indices in [0, n).")
+    if spring_length <= 0:
+        raise ValueError("'spring_length' must be positive.")
+    loops = sources == targets
+    sources = sources[~loops]
+    targets = targets[~loops]
+
+    free = np.ones(n, dtype=bool)
+    if pinned is not None:
+        pinned = np.asarray(pinned)
+        free[pinned if pinned.dtype == bool else pinned.astype(np.int64)] = False
+    free_indices = np.flatnonzero(free)
+    rng = np.random.default_rng(seed)
+    if len(free_indices) > 1 and (positions[free] == positions[free][0]).all():
+        extent = spring_length * np.sqrt(len(free_indices))
+        positions[free] += rng.uniform(-0.5, 0.5, (len(free_indices), 2)) * extent
+    _, inverse, counts = np.unique(
+        positions, axis=0, return_inverse=True, return_counts=True
+    )
+    shared = free & (counts[inverse.reshape(-1)] > 1)
+    offsets = rng.uniform(-5e-4, 5e-4, (np.count_nonzero(shared), 2))
+    positions[shared] += offsets * spring_length
+
+    step = spring_length
+    energy = np.inf
+    progress = 0
+    iteration = 0
+    while iteration < iterations:
+        iteration += 1
+        forces = repulsive_forces(positions, spring_length**2, theta)
+        delta = positions[targets] - positions[sources]
+        weights = np.sqrt((delta**2).sum(axis=1)) / spring_length
+        _add_forces(forces, sources, delta, weights)
+        _add_forces(forces, targets, delta, -weights)
+        forces = forces[free]
+
+        magnitudes = np.sqrt((forces**2).sum(axis=1))
+        scale = np.minimum(step / np.maximum(magnitudes, 1e-300), 1.0)
+        positions[free] += forces * scale[:, None]
+        moved = (magnitudes * scale).max(initial=0.0)
+
+        previous, energy = energy, (magnitudes**2).sum()
+        if energy < previous:
+            progress += 1
+            if progress >= 5:
+                progress = 0
+                step /= 0.9
+        else:
+            progress = 0
+            step *= 0.9
+        if moved < tolerance * spring_length:
+            break
+    return positions, iteration
@@ -0,0 +1,360 @@
+"""
+diagrams.metrics
+================
+
+Provides the measurement of the extent of text, which is shared by the
+object oriented and the procedural API.
+
+Text is measured by a measurer, which determines the widths of many lines
+of text in a given font at once. The ``GlyphTableMeasurer`` computes them
+from tables of the advance widths of the glyphs and doesn't require a
+display server. The ``TkMeasurer`` measures text using ``tkinter`` with a
+single round trip for all lines. The ``TextMetrics`` class caches the
+widths of the most recently measured ``(font, line)`` pairs, so that each
+of them is measured only once.
+
+Fonts are given either as tuples ``(family, size)`` with the size in pixels
+or as the names of fonts known to the measurer.
+"""
+from collections import OrderedDict
+
+from diagrams._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# The font in which the SVG backend draws text.
+DEFAULT_FONT = ("Helvetica", 12)
+
+# The advance widths of the printable ASCII characters from " " to "~" in
+# Helvetica in units of 1/1000 of the font size.
+_HELVETICA_ADVANCES = (
+    (278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278)
+    + (556,) * 10
+    + (278, 278, 584, 584, 584, 556, 1015)
+    + (667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833)
+    + (722, 778, 667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611)
+    + (278, 278, 278, 469, 556, 333)
+    + (556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833)
+    + (556, 556, 556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500)
+    + (334, 260, 334, 584)
+)
+
+# Families whose glyphs all have the same advance width.
+_MONOSPACE_FAMILIES = {"courier", "courier new", "monospace", "tkfixedfont"}
+
+
+###############################################################################
+# Measurers
+###############################################################################
+
+
+class GlyphTableMeasurer:
+    """
+    Measures text using tables of the advance widths of glyphs.
+
+    Proportional fonts are measured using the advance widths of Helvetica
+    and monospace fonts using a width of 0.6 times the font size for all
+    glyphs. Characters outside of the ASCII range are assumed to be as wide
+    as a digit.
+
+    Attributes:
+        default_font: The font used when no font is given, i.e. the font
+            in which the SVG backend draws text.
+        line_spacing(``float``): The height of a line relative to the font
+            size.
+    """
+
+    default_font = DEFAULT_FONT
+
+    def __init__(self, line_spacing=1.2):
+        """
+        Create measurer.
+
+        Args:
+            line_spacing(``float``): The height of a line relative to the
+                font size.
+        """
+        self.line_spacing = line_spacing
+        self._tables = {}
+
+    def _table(self, family):
+        """Advance widths of the first 128 characters relative to size."""
+        monospace = str(family).lower() in _MONOSPACE_FAMILIES
+        table = self._tables.get(monospace)
+        if table is None:
+            if monospace:
+                table = np.full(129, 0.6)
+            else:
+                table = np.full(129, 0.556)
+                table[32:127] = np.array(_HELVETICA_ADVANCES) / 1000.0
+            table[:32] = 0.0
+            self._tables[monospace] = table
+        return table
+
+    def widths(self, font, lines):
+        """
+        Measure the widths of lines of text.
+
+        Args:
+            font: Tuple ``(family, size)`` holding the font.
+            lines: List of strings without line breaks.
+
+        Return:
+            Array holding the width of each line in pixels.
+        """
+        family, size = font
+        table = self._table(family)
+        codes = np.frombuffer("".join(lines).encode("utf-32-le"), dtype=np.uint32)
+        advances = table[np.minimum(codes, 128)]
+        lengths = np.array([len(line) for line in lines], dtype=np.int64)
+        ends = np.cumsum(lengths)
+        totals = np.concatenate([[0.0], np.cumsum(advances)])
+        return (totals[ends] - totals[ends - lengths]) * size
+
+    def line_height(self, font):
+        """
+        Args:
+            font: Tuple ``(family, size)`` holding the font.
+
+        Return:
+            The height of a line of text in pixels.
+        """
+        return self.line_spacing * font[1]
+
+
+# Tcl procedure that measures a list of lines in a font.
+_MEASURE_TEXTS = "_diagrams_measure_texts"
+_MEASURE_TEXTS_BODY = (
+    "set widths {}; "
+    "foreach text $texts { lappend widths [font measure $font $text] }; "
+    "return $widths"
+)
+
+
+class TkMeasurer:
+    """
+    Measures text using ``tkinter``.
+
+    All lines measured at once are measured using a single Tcl command, so
+    that measuring many lines doesn't require a round trip for each of them.
+
+    Attributes:
+        default_font: The font used when no font is given, i.e. the font in
+            which the Tk canvas draws text.
+    """
+
+    default_font = "TkDefaultFont"
+
+    def __init__(self, widget):
+        """
+        Create measurer.
+
+        Args:
+            widget: Any ``tkinter`` widget, such as the canvas onto which the
+                text is drawn.
+        """
+        self.tk = widget.tk
+        self.tk.call("proc", _MEASURE_TEXTS, "font texts", _MEASURE_TEXTS_BODY)
+
+    @staticmethod
+    def _font(font):
+        """Convert font to Tk font description with size in pixels."""
+        if isinstance(font, tuple):
+            family, size = font
+            return (family, -int(round(size)))
+        return font
+
+    def widths(self, font, lines):
+        """
+        Measure the widths of lines of text.
+
+        Args:
+            font: Tuple ``(family, size)`` or name of a Tk font.
+            lines: List of strings without line breaks.
+
+        Return:
+            Array holding the width of each line in pixels.
+        """
+        widths = self.tk.call(_MEASURE_TEXTS, self._font(font), tuple(lines))
+        return np.array(self.tk.splitlist(widths), dtype=np.float64)
+
+    def line_height(self, font):
+        """
+        Args:
+            font: Tuple ``(family, size)`` or name of a Tk font.
+
+        Return:
+            The height of a line of text in pixels.
+        """
+        return float(self.tk.call("font", "metrics", self._font(font), "-linespace"))
+
+
+###############################################################################
+# Text metrics
+###############################################################################
+
+
+class TextMetrics:
+    """
+    Measures the extent of text with a cache of measured lines.
+
+    The widths of the most recently used ``(font, line)`` pairs are kept in a
+    least recently used cache, so that only lines that aren't cached are
+    passed on to the measurer. Text is split into lines at line breaks. Its
+    extent is the width of its widest line and the height of all lines.
+
+    Attributes:
+        measurer: The measurer used to measure lines that aren't cached.
+        cache_size(``int``): The maximum number of cached lines.
+        hits(``int``): The number of lines found in the cache.
+        misses(``int``): The number of lines passed on to the measurer.
+    """
+
+    def __init__(self, measurer=None, cache_size=65536):
+        """
+        Create text metrics.
+
+        Args:
+            measurer: The measurer to use. Defaults to a
+                ``GlyphTableMeasurer``.
+            cache_size(``int``): The maximum number of cached lines.
+        """
+        if measurer is None:
+            measurer = GlyphTableMeasurer()
+        self.measurer = measurer
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._widths = OrderedDict()
+        self._line_heights = {}
+
+    def line_height(self, font=None):
+        """
+        Args:
+            font: The font. Defaults to the default font of the measurer.
+
+        Return:
+            The height of a line of text in the font in pixels.
+        """
+        if font is None:
+            font = self.measurer.default_font
+        height = self._line_heights.get(font)
+        if height is None:
+            height = self._line_heights[font] = self.measurer.line_height(font)
+        return height
+
+    def _line_widths(self, font, lines):
+        """Widths of lines looked up in the cache or measured."""
+        cache = self._widths
+        widths = []
+        missing = {}
+        for line in lines:
+            key = (font, line)
+            width = cache.get(key)
+            if width is None:
+                missing[line] = None
+            else:
+                cache.move_to_end(key)
+            widths.append(width)
+        self.hits += len(lines) - len(missing)
+        if missing:
+            missing = list(missing)
+            self.misses += len(missing)
+            measured = dict(zip(missing, self.measurer.widths(font, missing).tolist()))
+            for line in missing:
+                cache[(font, line)] = measured[line]
+            while len(cache) > self.cache_size:
+                cache.popitem(last=False)
+            widths = [
+                measured[line] if width is None else width
+                for line, width in zip(lines, widths)
+            ]
+        return widths
+
+    def measure_batch(self, texts, font=None):
+        """
+        Measure the extent of many texts at once.
+
+        Args:
+            texts: Sequence of strings.
+            font: The font. Defaults to the default font of the measurer.
+
+        Return:
+            Array of shape ``(n, 2)`` holding the width and height of each
+            text in pixels.
+        """
+        if font is None:
+            font = self.measurer.default_font
+        texts = [str(text) for text in texts]
+        extents = np.zeros((len(texts), 2))
+        if not texts:
+            return extents
+        if any("\n" in text for text in texts):
+            lines = []
+            counts = []
+            for text in texts:
+                text_lines = text.split("\n")
+                lines += text_lines
+                counts.append(len(text_lines))
+            counts = np.array(counts)
+            widths = np.array(self._line_widths(font, lines))
+            starts = np.cumsum(counts) - counts
+            extents[:, 0] = np.maximum.reduceat(widths, starts)
+        else:
+            counts = 1
+            extents[:, 0] = self._line_widths(font, texts)
+        extents[:, 1] = counts * self.line_height(font)
+        return extents
+
+    def measure(self, text, font=None):
+        """
+        Measure the extent of a text.
+
+        Args:
+            text(``str``): The text.
+            font: The font. Defaults to the default font of the measurer.
+
+        Return:
+            Tuple ``(width, height)`` holding the extent of the text in
+            pixels.
+        """
+        if font is None:
+            font = self.measurer.default_font
+        lines = str(text).split("\n")
+        width = max(self._line_widths(font, lines))
+        return (width, len(lines) * self.line_height(font))
+
+
+_text_metrics = None
+
+
+def get_text_metrics():
+    """
+    Return:
+        The ``TextMetrics`` used by the components of diagrams to measure
+        their text. Unless set using ``set_text_metrics``, these are metrics
+        based on a ``GlyphTableMeasurer``.
+    """
+    global _text_metrics
+    if _text_metrics is None:
+        _text_metrics = TextMetrics()
+    return _text_metrics
+
+
+def set_text_metrics(metrics):
+    """
+    Set the ``TextMetrics`` used by the components of diagrams to measure
+    their text, e.g. metrics based on a ``TkMeasurer`` to match the text
+    drawn on a Tk canvas.
+
+    Args:
+        metrics(TextMetrics): The new metrics or ``None`` to restore the
+            default metrics.
+
+    Return:
+        The previously used metrics.
+    """
+    global _text_metrics
+    previous = get_text_metrics()
+    _text_metrics = metrics
+    return previous
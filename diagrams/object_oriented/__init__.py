@@ -9,3 +9,5 @@ from diagrams.object_oriented.color import *
 from diagrams.object_oriented.coordinates import *
 from diagrams.object_oriented.diagram import *
 from diagrams.object_oriented.components import *
+from diagrams.object_oriented.viewport import *
+from diagrams.object_oriented.layout import *
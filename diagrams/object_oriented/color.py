@@ -2,37 +2,92 @@
 diagram.object_oriented.color
 =============================
 
-Provides the color class representing colors of diagram components.
+Provides the color class representing colors of diagram components, the
+``ColorArray`` class representing many of them at once and the ``Colormap``
+class mapping scalar values to colors.
 """
+import re
+from functools import lru_cache
+
+from diagrams._lazy import lazy_import
+
+np = lazy_import("numpy")
+
+_COLOR_CODE = re.compile("#[0-9a-fA-F]{6}")
 
 
 class Color:
     """
     The color of diagram components.
 
+    Colors are stored as 24-bit integers packing the red, green and blue
+    components. The HEX string representation is computed only when it is
+    needed. Colors are immutable, so that the same object can be shared by
+    any number of components.
+
     Attributes:
         color_code(``str``): The color represented in HTML HEX string format.
+        rgb(``tuple``): The red, green and blue components as integers in
+            the range [0, 255].
     """
 
+    __slots__ = ("_rgb", "_color_code")
+
     @staticmethod
     def black():
         """The color black."""
-        return Color("#000000")
+        return _BLACK
 
     @staticmethod
     def red():
         """The color red."""
-        return Color("#FF0000")
+        return _RED
 
     @staticmethod
     def green():
         """The color green."""
-        return Color("#00FF00")
+        return _GREEN
 
     @staticmethod
     def blue():
         """The color blue."""
-        return Color("#0000FF")
+        return _BLUE
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def from_code(color_code):
+        """
+        Get color for given color code.
+
+        In contrast to the constructor, this returns the same object for
+        repeated calls with the same color code. The most recently used
+        colors are kept in a cache.
+
+        Args:
+            color_code(``str``): HEX string specifying the color.
+        """
+        named = _NAMED_COLORS.get(color_code)
+        if named is not None:
+            return named
+        return Color(color_code)
+
+    @staticmethod
+    def from_rgb(red, green, blue):
+        """
+        Create color from its red, green and blue components.
+
+        Args:
+            red(``int``): The red component in the range [0, 255].
+            green(``int``): The green component in the range [0, 255].
+            blue(``int``): The blue component in the range [0, 255].
+        """
+        rgb = 0
+        for component in (red, green, blue):
+            value = int(component)
+            if value != component or not 0 <= value <= 255:
+                raise ValueError("Color components must be integers within [0, 255].")
+            rgb = (rgb << 8) | value
+        return _make_color(rgb)
 
     def __init__(self, color_code):
         """
@@ -43,29 +98,309 @@ class Color:
         """
         if not isinstance(color_code, str):
             raise TypeError("The given color code must be of type str.")
-        if not color_code[0] == "#" or len(color_code) != 7:
+        if _COLOR_CODE.fullmatch(color_code) is None:
             raise ValueError(
                 "The given color code does must match the format" "'#xxxxxx'"
             )
-        self.color_code = color_code
+        self._rgb = int(color_code[1:], 16)
+        self._color_code = color_code
+
+    @property
+    def color_code(self):
+        """The color represented in HTML HEX string format."""
+        if self._color_code is None:
+            self._color_code = f"#{self._rgb:06X}"
+        return self._color_code
+
+    @property
+    def rgb(self):
+        """The red, green and blue components of the color."""
+        rgb = self._rgb
+        return (rgb >> 16, (rgb >> 8) & 0xFF, rgb & 0xFF)
 
     def __add__(self, other):
         """
         Mixes two colors by adding the respective RGB components.
         """
-        r_self = int(self.color_code[1:3], 16)
-        g_self = int(self.color_code[3:5], 16)
-        b_self = int(self.color_code[5:7], 16)
-        r_other = int(other.color_code[1:3], 16)
-        g_other = int(other.color_code[3:5], 16)
-        b_other = int(other.color_code[5:7], 16)
-        r = min(r_self + r_other, 255)
-        g = min(g_self + g_other, 255)
-        b = min(b_self + b_other, 255)
-        return Color(f"#{r:02X}{g:02X}{b:02X}")
+        a = self._rgb
+        try:
+            b = other._rgb
+        except AttributeError:
+            return NotImplemented
+        r = min((a >> 16) + (b >> 16), 0xFF)
+        g = min(((a >> 8) & 0xFF) + ((b >> 8) & 0xFF), 0xFF)
+        b = min((a & 0xFF) + (b & 0xFF), 0xFF)
+        return _make_color((r << 16) | (g << 8) | b)
+
+    def __eq__(self, other):
+        """Compares the RGB components of two colors."""
+        if not isinstance(other, Color):
+            return NotImplemented
+        return self._rgb == other._rgb
+
+    def __hash__(self):
+        return hash(self._rgb)
 
     def __repr__(self):
         return f"Color({str(self)})"
 
     def __str__(self):
         return self.color_code
+
+
+_new = object.__new__
+
+
+def _make_color(rgb):
+    """
+    Create color from a packed 24-bit RGB integer without validating it.
+    """
+    color = _new(Color)
+    color._rgb = rgb
+    color._color_code = None
+    return color
+
+
+_BLACK = Color("#000000")
+_RED = Color("#FF0000")
+_GREEN = Color("#00FF00")
+_BLUE = Color("#0000FF")
+_NAMED_COLORS = {color.color_code: color for color in [_BLACK, _RED, _GREEN, _BLUE]}
+
+
+###############################################################################
+# Color arrays
+###############################################################################
+
+
+class ColorArray:
+    """
+    The ColorArray class represents N colors stored in a single array, so
+    that they can be manipulated using vectorized operations.
+
+    Attributes:
+        array(``numpy.ndarray``): Array of shape ``(N, 3)`` and type
+            ``uint8`` holding the red, green and blue components of each
+            color.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, colors):
+        """
+        Create new color array.
+
+        Args:
+            colors: Either
+                - An existing ColorArray object to copy
+                - An array of shape ``(N, 3)`` holding RGB components in
+                  the range [0, 255]
+                - An iterable of Color objects, HEX strings or iterables of
+                  length 3 containing the RGB components.
+        """
+        if isinstance(colors, ColorArray):
+            array = colors.array.copy()
+        else:
+            if not isinstance(colors, np.ndarray):
+                colors = [_as_rgb(color) for color in colors]
+            array = np.asarray(colors)
+            if array.size == 0:
+                array = array.reshape(0, 3)
+            if array.ndim != 2 or array.shape[1] != 3:
+                raise ValueError(
+                    "The array provided to the ColorArray constructor must "
+                    "have shape (N, 3)."
+                )
+            if array.size and (array.min() < 0 or array.max() > 255):
+                raise ValueError("Color components must lie within [0, 255].")
+            array = array.astype(np.uint8)
+        self.array = array
+
+    @classmethod
+    def _wrap(cls, array):
+        """Wrap a ``uint8`` array of shape ``(N, 3)`` without copying it."""
+        colors = cls.__new__(cls)
+        colors.array = array
+        return colors
+
+    @staticmethod
+    def _as_array(other):
+        """Convert operand of arithmetic operation to array."""
+        if isinstance(other, ColorArray):
+            return other.array
+        if isinstance(other, Color):
+            return np.array(other.rgb, dtype=np.uint8)
+        return np.asarray(other)
+
+    @property
+    def packed(self):
+        """The colors as 24-bit integers in an array of shape ``(N,)``."""
+        array = self.array.astype(np.int32)
+        return (array[:, 0] << 16) | (array[:, 1] << 8) | array[:, 2]
+
+    @property
+    def codes(self):
+        """List of the colors represented in HTML HEX string format."""
+        return [f"#{rgb:06X}" for rgb in self.packed.tolist()]
+
+    def __array__(self, dtype=None):
+        """The ``uint8`` array of shape ``(N, 3)`` holding the colors."""
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype)
+
+    def __len__(self):
+        """The number of colors."""
+        return self.array.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Integer indices return a single ``Color`` object, all other indices
+        a ``ColorArray``.
+        """
+        if isinstance(index, (int, np.integer)):
+            red, green, blue = self.array[index].tolist()
+            return _make_color((red << 16) | (green << 8) | blue)
+        return ColorArray._wrap(self.array[index].reshape(-1, 3))
+
+    def __iter__(self):
+        """Iterate over colors as ``Color`` objects."""
+        for rgb in self.packed.tolist():
+            yield _make_color(rgb)
+
+    def __add__(self, other):
+        """
+        Mixes colors by adding the respective RGB components, which are
+        limited to 255 like for ``Color`` objects. The other operand may be
+        a single ``Color`` object, which is added to all colors.
+        """
+        total = self.array.astype(np.uint16) + self._as_array(other)
+        return ColorArray._wrap(np.minimum(total, 255).astype(np.uint8))
+
+    __radd__ = __add__
+
+    def blend(self, other, weight=0.5):
+        """
+        Blend colors linearly with other colors.
+
+        Args:
+            other: ``ColorArray`` of the same length or a single ``Color``.
+            weight: The weight of the other colors given either as scalar
+                or as array of shape ``(N,)``. Weights are clipped to
+                [0, 1].
+
+        Return:
+            ``ColorArray`` holding the blended colors.
+        """
+        weight = np.clip(np.asarray(weight, dtype=np.float64), 0.0, 1.0)
+        if weight.ndim == 1 and weight.shape[0] == len(self):
+            weight = weight[:, np.newaxis]
+        elif weight.ndim != 0:
+            raise ValueError("Weights must be a scalar or an array of shape (N,).")
+        array = self.array.astype(np.float64)
+        blended = array + weight * (self._as_array(other) - array)
+        blended = np.clip(np.rint(blended), 0.0, 255.0)
+        return ColorArray._wrap(blended.astype(np.uint8))
+
+    def __eq__(self, other):
+        """Compares the RGB components of all colors."""
+        other = self._as_array(other)
+        return other.shape == self.array.shape and bool(np.all(self.array == other))
+
+    def __repr__(self):
+        """Prints color codes."""
+        return f"ColorArray({self.codes})"
+
+
+def _as_rgb(color):
+    """RGB components of a Color object, HEX string or RGB triple."""
+    if isinstance(color, Color):
+        return color.rgb
+    if isinstance(color, str):
+        return Color.from_code(color).rgb
+    return tuple(color)
+
+
+###############################################################################
+# Colormaps
+###############################################################################
+
+
+class Colormap:
+    """
+    Maps scalar values to colors using a lookup table.
+
+    The lookup table interpolates linearly between equally spaced control
+    colors and is computed once, so that mapping values to colors requires
+    only their normalization and an index into the table.
+
+    Attributes:
+        lut(``numpy.ndarray``): Array of shape ``(size, 3)`` and type
+            ``uint8`` holding the colors of the lookup table.
+    """
+
+    __slots__ = ("lut",)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def viridis():
+        """Perceptually uniform colormap from dark blue to yellow."""
+        return Colormap(["#440154", "#3B528B", "#21918C", "#5EC962", "#FDE725"])
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def traffic_light():
+        """Colormap from green over yellow to red, e.g. for latencies."""
+        return Colormap(["#00A000", "#FFD000", "#E00000"])
+
+    def __init__(self, colors, size=256):
+        """
+        Create colormap.
+
+        Args:
+            colors: At least two control colors given in any form accepted
+                by ``ColorArray``. The first color is used for the lowest
+                values and the last one for the highest values.
+            size(``int``): The number of colors in the lookup table.
+        """
+        colors = ColorArray(colors).array
+        if len(colors) < 2:
+            raise ValueError("Colormaps require at least two colors.")
+        if size < 2:
+            raise ValueError(
+                f"The size of a colormap must be at least two, not {size}."
+            )
+        control = np.linspace(0.0, 1.0, len(colors))
+        steps = np.linspace(0.0, 1.0, size)
+        lut = np.stack(
+            [np.interp(steps, control, colors[:, channel]) for channel in range(3)],
+            axis=1,
+        )
+        self.lut = np.rint(lut).astype(np.uint8)
+
+    def __call__(self, values, vmin=None, vmax=None):
+        """
+        Map values to colors.
+
+        Args:
+            values: Array of shape ``(N,)`` holding the values to map.
+            vmin(``float``): The value mapped to the first color. Defaults
+                to the minimum of the values.
+            vmax(``float``): The value mapped to the last color. Defaults
+                to the maximum of the values.
+
+        Return:
+            ``ColorArray`` holding the colors of the values. Values outside
+            of ``[vmin, vmax]`` are clipped and NaN values mapped to the
+            first color.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        finite = values[np.isfinite(values)]
+        if vmin is None:
+            vmin = finite.min() if finite.size else 0.0
+        if vmax is None:
+            vmax = finite.max() if finite.size else 0.0
+        scale = (len(self.lut) - 1) / (vmax - vmin) if vmax > vmin else 0.0
+        indices = np.nan_to_num((values - vmin) * scale)
+        indices = np.clip(np.rint(indices), 0, len(self.lut) - 1).astype(np.intp)
+        return ColorArray._wrap(self.lut[indices])
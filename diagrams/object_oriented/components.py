@@ -6,11 +6,28 @@ Provides the component classes that can be used to construct
 diagrams.
 """
 from abc import ABC, abstractproperty
-import numpy as np
-
-from diagrams.object_oriented.color import Color
-from diagrams.object_oriented.coordinates import Coordinates
+from itertools import chain
+from operator import attrgetter
+
+from diagrams._lazy import lazy_import
+from diagrams.object_oriented.color import Color, ColorArray
+from diagrams.object_oriented.coordinates import (
+    Coordinates,
+    CoordinatesArray,
+    _make_coordinates,
+)
 from diagrams.object_oriented.diagram import DiagramComponent
+from diagrams.geometry import arrow_head, arrow_heads, anchor_positions
+from diagrams.metrics import get_text_metrics
+from diagrams.routing import Router
+
+np = lazy_import("numpy")
+
+
+def _pack(values):
+    """Pack iterable of numbers into a single flat tuple."""
+    return tuple(values)
+
 
 ###############################################################################
 # Connectable
@@ -23,6 +40,8 @@ class Connectable(ABC):
     arrows.
     """
 
+    __slots__ = ()
+
     @abstractproperty
     def left(self):
         """
@@ -96,6 +115,8 @@ class ComponentBase(DiagramComponent):
             as Color object.
     """
 
+    __slots__ = ("position", "color")
+
     def __init__(self, position, color):
         """
         Create diagram component.
@@ -116,6 +137,7 @@ class ComponentBase(DiagramComponent):
                 step by which to translate the object.
         """
         self.position = self.position + delta
+        self._changed(delta=delta)
 
     def set_color(self, new_color):
         """
@@ -125,6 +147,35 @@ class ComponentBase(DiagramComponent):
             new_color(Color): The new color of the component.
         """
         self.color = new_color
+        self._changed(recolor=True)
+
+    def update_items(self, canvas):
+        """
+        Apply changes to the items of the component on the canvas.
+
+        Translations are applied by moving the existing items. Color changes
+        are applied using ``_recolor_items``.
+
+        Args:
+            canvas: The canvas on which the items of the component were
+                created.
+        """
+        delta_x, delta_y, recolor, redraw = self._dirty
+        if redraw:
+            self._redraw(canvas)
+            return
+        if delta_x or delta_y:
+            for item in self._items:
+                canvas.move(item, delta_x, delta_y)
+        if recolor:
+            self._recolor_items(canvas)
+
+    def _recolor_items(self, canvas):
+        """
+        Apply the color of the component to its items on the canvas. The
+        default implementation redraws the component.
+        """
+        self._redraw(canvas)
 
 
 ###############################################################################
@@ -137,6 +188,8 @@ class Text(ComponentBase):
     A colored text in a diagram.
     """
 
+    __slots__ = ("text",)
+
     def __init__(self, text, position, color=Color.black()):
         """
         Create text object.
@@ -162,6 +215,52 @@ class Text(ComponentBase):
         position = self.position + offset
         canvas.create_text(position.x, position.y, text=self.text, fill=str(self.color))
 
+    def _recolor_items(self, canvas):
+        """Apply color of text to its item on canvas."""
+        canvas.itemconfigure(self._items[0], fill=str(self.color))
+
+    def content_key(self):
+        """Tuple describing the content of the text."""
+        if type(self) is not Text:
+            return super().content_key()
+        position = self.position
+        return (Text, position.x, position.y, self.color, self.text)
+
+    @classmethod
+    def content_keys(cls, components):
+        """Content of many texts packed into arrays."""
+        if cls is not Text:
+            return super().content_keys(components)
+        positions = map(attrgetter("position.x", "position.y"), components)
+        return (
+            _pack(chain.from_iterable(positions)),
+            tuple(map(attrgetter("color"), components)),
+            tuple(map(attrgetter("text"), components)),
+        )
+
+    @property
+    def extent(self):
+        """
+        Tuple ``(width, height)`` holding the extent of the text measured
+        using the metrics from ``diagrams.metrics.get_text_metrics``.
+        """
+        return get_text_metrics().measure(self.text)
+
+    @property
+    def bounding_box(self):
+        """
+        Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and lower right
+        corner of the text centered around its position.
+        """
+        position = self.position
+        width, height = self.extent
+        return (
+            position.x - 0.5 * width,
+            position.y - 0.5 * height,
+            position.x + 0.5 * width,
+            position.y + 0.5 * height,
+        )
+
 
 ###############################################################################
 # Arrow
@@ -172,10 +271,15 @@ class Arrow(ComponentBase):
     """
     An arrow in a diagram.
 
+    Arrows created using ``connect`` remember the components they connect,
+    so that they can be moved along with them using ``reconnect``.
+
     Attributes:
         end(Coorinates): End position of the arrow.
     """
 
+    __slots__ = ("end", "head_size", "_connection")
+
     def __init__(self, start, end, color=Color.black(), head_size=10):
         """
         Create arrow.
@@ -189,6 +293,84 @@ class Arrow(ComponentBase):
         super().__init__(Coordinates(start), color)
         self.end = Coordinates(end)
         self.head_size = head_size
+        self._connection = None
+
+    @classmethod
+    def connect(
+        cls,
+        source,
+        target,
+        source_anchor="right",
+        target_anchor="left",
+        color=Color.black(),
+        head_size=10,
+    ):
+        """
+        Create arrow connecting two components.
+
+        Args:
+            source(Connectable): The component from which the arrow starts.
+            target(Connectable): The component to which the arrow points.
+            source_anchor(``str``): The anchor of the source component at
+                which the arrow starts.
+            target_anchor(``str``): The anchor of the target component at
+                which the arrow ends.
+            color(Color): Arrow color.
+            head_size(int): Size of arrow head in pixels.
+
+        Return:
+            The arrow connecting the components.
+        """
+        for component in [source, target]:
+            if not isinstance(component, Connectable):
+                raise TypeError(
+                    "Given component does not implement the Connectable interface."
+                )
+        arrow = cls(
+            getattr(source, source_anchor),
+            getattr(target, target_anchor),
+            color,
+            head_size,
+        )
+        arrow._connection = (source, source_anchor, target, target_anchor)
+        return arrow
+
+    @property
+    def source(self):
+        """
+        The component from which the arrow starts or ``None`` if the arrow
+        wasn't created using ``connect``.
+        """
+        if self._connection is None:
+            return None
+        return self._connection[0]
+
+    @property
+    def target(self):
+        """
+        The component to which the arrow points or ``None`` if the arrow
+        wasn't created using ``connect``.
+        """
+        if self._connection is None:
+            return None
+        return self._connection[2]
+
+    def reconnect(self):
+        """
+        Move the start and end of the arrow to the anchors of the components
+        it connects. Does nothing if the arrow wasn't created using
+        ``connect``.
+        """
+        if self._connection is None:
+            return
+        source, source_anchor, target, target_anchor = self._connection
+        start = getattr(source, source_anchor)
+        end = getattr(target, target_anchor)
+        if start == self.position and end == self.end:
+            return
+        self.position = Coordinates(start)
+        self.end = Coordinates(end)
+        self._changed()
 
     def draw(self, canvas, offset=Coordinates(0, 0)):
         """
@@ -200,20 +382,337 @@ class Arrow(ComponentBase):
         Args:
             canvas(ipycanvas.Canvas): Canvas to draw the rectangle on.
         """
+        line, head = self._geometry(offset)
+        canvas.create_line(*line, fill=str(self.color))
+        canvas.create_polygon(head, outline=str(self.color), fill=None)
+
+    def _geometry(self, offset):
+        """
+        Compute the coordinates of the line and the head polygon of the
+        arrow.
+        """
         position = self.position + offset
         end = self.end + offset
+        head = arrow_head(position.x, position.y, end.x, end.y, self.head_size)
+        return [position.x, position.y, end.x, end.y], head
+
+    def update_items(self, canvas):
+        """
+        Apply changes to the line and head items of the arrow.
+
+        Since translating an arrow only moves its start, the coordinates
+        of both items are recomputed.
+
+        Args:
+            canvas: The canvas on which the items of the arrow were created.
+        """
+        delta_x, delta_y, recolor, redraw = self._dirty
+        if redraw:
+            self._redraw(canvas)
+            return
+        line_item, head_item = self._items
+        if delta_x or delta_y:
+            line, head = self._geometry(Coordinates(0, 0))
+            canvas.coords(line_item, *line)
+            canvas.coords(head_item, *head)
+        if recolor:
+            color = str(self.color)
+            canvas.itemconfigure(line_item, fill=color)
+            canvas.itemconfigure(head_item, outline=color)
+
+    def content_key(self):
+        """Tuple describing the content of the arrow."""
+        if type(self) is not Arrow:
+            return super().content_key()
+        start = self.position
+        end = self.end
+        return (
+            Arrow,
+            start.x,
+            start.y,
+            end.x,
+            end.y,
+            self.color,
+            self.head_size,
+        )
+
+    @classmethod
+    def content_keys(cls, components):
+        """Content of many arrows packed into arrays."""
+        if cls is not Arrow:
+            return super().content_keys(components)
+        geometry = map(
+            attrgetter("position.x", "position.y", "end.x", "end.y", "head_size"),
+            components,
+        )
+        return (
+            _pack(chain.from_iterable(geometry)),
+            tuple(map(attrgetter("color"), components)),
+        )
+
+    @property
+    def bounding_box(self):
+        """
+        Bounding box of the arrow including its head.
+        """
+        start = self.position
+        end = self.end
+        size = self.head_size
+        return (
+            min(start.x, end.x) - size,
+            min(start.y, end.y) - size,
+            max(start.x, end.x) + size,
+            max(start.y, end.y) + size,
+        )
+
+    @classmethod
+    def draw_batch(cls, canvas, components, offset=Coordinates(0, 0)):
+        """
+        Draw many arrows on canvas.
+
+        The head polygons of all arrows are computed in a single vectorized
+        pass. The emitted drawing commands are identical to those produced
+        by drawing the arrows one by one.
+
+        Args:
+            canvas: The backend to draw the arrows on.
+            components: List of arrows to draw.
+            offset(Coordinates): Offset to add to all arrow positions.
+        """
+        if cls.draw is not Arrow.draw:
+            return super().draw_batch(canvas, components, offset)
+        if not components:
+            return
+        lines = np.array(
+            [
+                (arrow.position.x, arrow.position.y, arrow.end.x, arrow.end.y)
+                for arrow in components
+            ]
+        )
+        lines += (offset.x, offset.y, offset.x, offset.y)
+        head_sizes = [arrow.head_size for arrow in components]
+        heads = arrow_heads(
+            lines[:, 0], lines[:, 1], lines[:, 2], lines[:, 3], head_sizes
+        )
+        for arrow, line, head in zip(components, lines.tolist(), heads.tolist()):
+            color = str(arrow.color)
+            canvas.create_line(*line, fill=color)
+            canvas.create_polygon(head, outline=color, fill=None)
+
+
+###############################################################################
+# Routed arrow
+###############################################################################
+
+# The directions in which routes leave the anchors of components.
+_ANCHOR_DIRECTIONS = {
+    "left": "left",
+    "top_left": "left",
+    "bottom_left": "left",
+    "right": "right",
+    "top_right": "right",
+    "bottom_right": "right",
+    "top": "up",
+    "bottom": "down",
+}
+_OPPOSITE_DIRECTIONS = {"left": "right", "right": "left", "up": "down", "down": "up"}
+
+
+class RoutedArrow(Arrow):
+    """
+    An arrow consisting of horizontal and vertical segments, which is routed
+    around the nodes of a diagram.
+
+    The route is computed using the ``router`` of the first diagram that
+    the arrow was added to, so that it avoids the components of the
+    diagram that have a ``frame``. Arrows that aren't part of a diagram are
+    routed without obstacles. Routed arrows created using ``connect`` are
+    rerouted automatically when the components they connect or the
+    components along their route are moved.
 
-        canvas.create_line(position.x, position.y, end.x, end.y, fill=str(self.color))
+    Attributes:
+        start_direction(``str``): The direction in which the arrow leaves its
+            start, i.e. ``"right"``, ``"left"``, ``"down"`` or ``"up"``.
+        end_direction(``str``): The direction in which the arrow arrives at
+            its end.
+        points(``tuple``): The corners of the route as ``Coordinates``
+            objects including start and end or ``None`` if the arrow hasn't
+            been routed yet.
+    """
+
+    __slots__ = ("start_direction", "end_direction", "points", "_router")
+
+    def __init__(
+        self,
+        start,
+        end,
+        color=Color.black(),
+        head_size=10,
+        start_direction="right",
+        end_direction="right",
+    ):
+        """
+        Create routed arrow.
+
+        Args:
+            start(Coordinates): Start position of arrow.
+            end(Coordinates): End position of arrow.
+            color(Color): Arrow color.
+            head_size(int): Size of arrow head in pixels.
+            start_direction(``str``): The direction in which the arrow leaves
+                its start.
+            end_direction(``str``): The direction in which the arrow arrives
+                at its end.
+        """
+        super().__init__(start, end, color, head_size)
+        self.start_direction = start_direction
+        self.end_direction = end_direction
+        self.points = None
+        self._router = None
+
+    @classmethod
+    def connect(
+        cls,
+        source,
+        target,
+        source_anchor="right",
+        target_anchor="left",
+        color=Color.black(),
+        head_size=10,
+    ):
+        """
+        Create routed arrow connecting two components.
+
+        The arrow leaves the source and enters the target perpendicular to
+        the sides of the components on which the anchors lie. Arrows at
+        corner anchors leave and enter horizontally.
 
-        angle = np.pi + np.arctan2(
-            self.end.y - self.position.y, self.end.x - self.position.x
+        Args:
+            source(Connectable): The component from which the arrow starts.
+            target(Connectable): The component to which the arrow points.
+            source_anchor(``str``): The anchor of the source component at
+                which the arrow starts.
+            target_anchor(``str``): The anchor of the target component at
+                which the arrow ends.
+            color(Color): Arrow color.
+            head_size(int): Size of arrow head in pixels.
+
+        Return:
+            The arrow connecting the components.
+        """
+        arrow = super().connect(
+            source, target, source_anchor, target_anchor, color, head_size
+        )
+        arrow.start_direction = _ANCHOR_DIRECTIONS.get(source_anchor, "right")
+        direction = _ANCHOR_DIRECTIONS.get(target_anchor, "left")
+        arrow.end_direction = _OPPOSITE_DIRECTIONS[direction]
+        return arrow
+
+    def _route(self, force=False):
+        """
+        Compute the route of the arrow if it hasn't been computed with the
+        router of its diagram yet.
+
+        Args:
+            force(``bool``): Whether to recompute the route in any case.
+
+        Return:
+            Whether the route has changed.
+        """
+        diagrams = getattr(self, "_diagrams", ())
+        router = diagrams[0].router if diagrams else None
+        if not force and self.points is not None and router is self._router:
+            return False
+        if self._router is not None and self._router is not router:
+            self._router.remove_route(self)
+
+        if self._connection is not None:
+            source, source_anchor, target, target_anchor = self._connection
+            self.position = Coordinates(getattr(source, source_anchor))
+            self.end = Coordinates(getattr(target, target_anchor))
+        start = self.position
+        end = self.end
+        points = (router or Router()).route(
+            (start.x, start.y),
+            (end.x, end.y),
+            self.start_direction,
+            self.end_direction,
         )
-        x_1 = self.end.x + self.head_size * np.cos(angle + np.pi / 6)
-        y_1 = self.end.y + self.head_size * np.sin(angle + np.pi / 6)
-        x_2 = self.end.x + self.head_size * np.cos(angle - np.pi / 6)
-        y_2 = self.end.y + self.head_size * np.sin(angle - np.pi / 6)
-        coordinates = [end.x, end.y, x_1, y_1, x_2, y_2]
-        canvas.create_polygon(coordinates, outline=str(self.color), fill=None)
+        if router is not None:
+            router.set_route(self, points)
+        self._router = router
+        points = tuple(_make_coordinates(x, y) for x, y in points)
+        if points == self.points:
+            return False
+        self.points = points
+        return True
+
+    def reroute(self):
+        """
+        Recompute the route of the arrow, e.g. after the components it
+        connects or avoids were moved. Arrows created using ``connect`` are
+        moved to the anchors of the components first.
+        """
+        if self._route(force=True):
+            self._changed()
+
+    reconnect = reroute
+
+    def translate(self, delta):
+        """
+        Translate the whole route of the arrow by given direction.
+
+        Args:
+            delta(Coordinates): Coordinates object representing the direction
+                step by which to translate the object.
+        """
+        self._route()
+        self.end = self.end + delta
+        self.points = tuple(point + delta for point in self.points)
+        if self._router is not None:
+            self._router.set_route(self, [(p.x, p.y) for p in self.points])
+        super().translate(delta)
+
+    def draw(self, canvas, offset=Coordinates(0, 0)):
+        """
+        Draw the route and the head of the arrow on canvas.
+
+        Args:
+            canvas: The backend to draw the arrow on.
+            offset(Coordinates): Offset to add to the position of the arrow.
+        """
+        self._route()
+        super().draw(canvas, offset)
+
+    def _geometry(self, offset):
+        """
+        Compute the coordinates of the route and the head polygon of the
+        arrow.
+        """
+        line = []
+        for point in self.points:
+            line += [point.x + offset.x, point.y + offset.y]
+        head = arrow_head(line[-4], line[-3], line[-2], line[-1], self.head_size)
+        return line, head
+
+    @property
+    def bounding_box(self):
+        """
+        Bounding box of the route of the arrow including its head.
+        """
+        self._route()
+        x = [point.x for point in self.points]
+        y = [point.y for point in self.points]
+        size = self.head_size
+        return (min(x) - size, min(y) - size, max(x) + size, max(y) + size)
+
+    @classmethod
+    def draw_batch(cls, canvas, components, offset=Coordinates(0, 0)):
+        """
+        Draw routed arrows one by one.
+        """
+        for component in components:
+            component.draw(canvas, offset)
 
 
 ###############################################################################
@@ -230,6 +729,8 @@ class Rectangle(ComponentBase, Connectable):
             and height of the rectangle.
     """
 
+    __slots__ = ("dimensions",)
+
     def __init__(self, position, dimensions, color=Color.red()):
         """
         Create rectangle.
@@ -241,8 +742,8 @@ class Rectangle(ComponentBase, Connectable):
                     and vertical extent of the rectangle
                 color(Color): The color with which to fill rectangle
         """
-        super().__init__(position, color)
-        self.dimensions = dimensions
+        super().__init__(Coordinates(position), color)
+        self.dimensions = Coordinates(dimensions)
 
     def draw(self, canvas, offset=Coordinates(0, 0)):
         """
@@ -260,13 +761,70 @@ class Rectangle(ComponentBase, Connectable):
             position.x, position.y, lower_right.x, lower_right.y, fill=str(self.color)
         )
 
+    def _recolor_items(self, canvas):
+        """Apply color of rectangle to its item on canvas."""
+        canvas.itemconfigure(self._items[0], fill=str(self.color))
+
+    @property
+    def frame(self):
+        """
+        Tuple ``(x, y, width, height)`` holding the upper left corner and the
+        extent of the rectangle.
+        """
+        position = self.position
+        dimensions = self.dimensions
+        return (position.x, position.y, dimensions.x, dimensions.y)
+
+    def content_key(self):
+        """Tuple describing the content of the rectangle."""
+        if type(self) is not Rectangle:
+            return super().content_key()
+        position = self.position
+        dimensions = self.dimensions
+        return (
+            Rectangle,
+            position.x,
+            position.y,
+            dimensions.x,
+            dimensions.y,
+            self.color,
+        )
+
+    @classmethod
+    def content_keys(cls, components):
+        """Content of many rectangles packed into arrays."""
+        if cls is not Rectangle:
+            return super().content_keys(components)
+        return (
+            _pack(chain.from_iterable(map(attrgetter("frame"), components))),
+            tuple(map(attrgetter("color"), components)),
+        )
+
+    @property
+    def bounding_box(self):
+        """
+        Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and lower right
+        corner of the rectangle.
+        """
+        x, y, width, height = self.frame
+        return (x, y, x + width, y + height)
+
+    def _anchor(self, horizontal, vertical):
+        """Position at given relative coordinates of the rectangle."""
+        position = self.position
+        dimensions = self.dimensions
+        return _make_coordinates(
+            position.x + dimensions.x * horizontal,
+            position.y + dimensions.y * vertical,
+        )
+
     @property
     def left(self):
         """
         ``Coordinates`` object representing the position located left of the
         diagram component.
         """
-        return self.position + Coordinates(0, self.dimensions.y / 2)
+        return self._anchor(0.0, 0.5)
 
     @property
     def top_left(self):
@@ -274,7 +832,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located upper left of
         the diagram component.
         """
-        return self.position
+        return self._anchor(0.0, 0.0)
 
     @property
     def top(self):
@@ -282,7 +840,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located above of the
         diagram component.
         """
-        return self.position + Coordinates(self.dimensions.x / 2, 0)
+        return self._anchor(0.5, 0.0)
 
     @property
     def top_right(self):
@@ -290,7 +848,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located to the upper
         right of the diagram component.
         """
-        return self.position + Coordinates(self.dimensions.x, 0)
+        return self._anchor(1.0, 0.0)
 
     @property
     def right(self):
@@ -298,7 +856,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located to the
         right of the diagram component.
         """
-        return self.position + Coordinates(self.dimensions.x, self.dimensions.y / 2)
+        return self._anchor(1.0, 0.5)
 
     @property
     def bottom_right(self):
@@ -306,7 +864,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located at the
         bottom right of the diagram component.
         """
-        return self.position + Coordinates(self.dimensions.x, self.dimensions.y)
+        return self._anchor(1.0, 1.0)
 
     @property
     def bottom(self):
@@ -314,7 +872,7 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located below the
         diagram component.
         """
-        return self.position + Coordinates(self.dimensions.x / 2, self.dimensions.y)
+        return self._anchor(0.5, 1.0)
 
     @property
     def bottom_left(self):
@@ -322,13 +880,26 @@ class Rectangle(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located at the
         bottom left of the diagram component.
         """
-        return self.position + Coordinates(0, self.dimensions.y)
+        return self._anchor(0.0, 1.0)
 
 
 ###############################################################################
 # RectangularNode
 ###############################################################################
 
+# The default space between the text and the border of auto-sized nodes.
+TEXT_PADDING = (10.0, 5.0)
+
+
+def _fit_dimensions(extent, padding, minimum):
+    """Dimensions of a node fitting text of the given extent."""
+    padding = Coordinates(padding)
+    minimum = Coordinates(minimum)
+    return (
+        max(extent[0] + 2.0 * padding.x, minimum.x),
+        max(extent[1] + 2.0 * padding.y, minimum.y),
+    )
+
 
 class RectangularNode(ComponentBase, Connectable):
     """
@@ -338,22 +909,55 @@ class RectangularNode(ComponentBase, Connectable):
         text(Text): The text component of the node.
     """
 
-    def __init__(self, position, dimensions, text, color=Color.red()):
+    __slots__ = ("rectangle", "text")
+
+    def __init__(
+        self,
+        position,
+        dimensions,
+        text,
+        color=Color.red(),
+        auto_size=False,
+        padding=TEXT_PADDING,
+    ):
         """
         Create new node.
 
         Args:
             position(Coordinates): The position of the node.
-            dimensions(Coordinates): The dimensions of the node.
+            dimensions(Coordinates): The dimensions of the node. If
+                ``auto_size`` is set, these are the minimum dimensions and
+                may be ``None``.
             text(str): The text to print in the node.
             color(Color): Color of node background.
+            auto_size(``bool``): Whether to size the node to fit its text
+                as measured using ``diagrams.metrics.get_text_metrics``.
+            padding(Coordinates): The horizontal and vertical space between
+                the text and the border of an auto-sized node.
         """
         position = Coordinates(position)
+        if auto_size:
+            minimum = (0.0, 0.0) if dimensions is None else Coordinates(dimensions)
+            extent = get_text_metrics().measure(text)
+            dimensions = _fit_dimensions(extent, padding, minimum)
         dimensions = Coordinates(dimensions)
         super().__init__(position, color)
         self.rectangle = Rectangle(Coordinates(0, 0), dimensions, color=color)
         self.text = Text(text, dimensions * 0.5, color=Color.black())
 
+    def resize(self, dimensions):
+        """
+        Change the dimensions of the node keeping its upper left corner in
+        place.
+
+        Args:
+            dimensions(Coordinates): The new dimensions of the node.
+        """
+        dimensions = Coordinates(dimensions)
+        self.rectangle.dimensions = dimensions
+        self.text.position = dimensions * 0.5
+        self._changed()
+
     def draw(self, canvas, offset=Coordinates(0, 0)):
         """
         Draw node on canvas.
@@ -372,13 +976,96 @@ class RectangularNode(ComponentBase, Connectable):
         self.rectangle.draw(canvas, offset=absolute_position)
         self.text.draw(canvas, offset=absolute_position)
 
+    def set_color(self, new_color):
+        """
+        Set background color of node.
+
+        Args:
+            new_color(Color): The new background color of the node.
+        """
+        self.rectangle.color = new_color
+        super().set_color(new_color)
+
+    def _recolor_items(self, canvas):
+        """Apply background color of node to its rectangle item on canvas."""
+        canvas.itemconfigure(self._items[0], fill=str(self.rectangle.color))
+
+    @property
+    def frame(self):
+        """
+        Tuple ``(x, y, width, height)`` holding the upper left corner and the
+        extent of the node.
+        """
+        position = self.position
+        rectangle = self.rectangle
+        dimensions = rectangle.dimensions
+        return (
+            rectangle.position.x + position.x,
+            rectangle.position.y + position.y,
+            dimensions.x,
+            dimensions.y,
+        )
+
+    def content_key(self):
+        """Tuple describing the content of the node."""
+        if type(self) is not RectangularNode:
+            return super().content_key()
+        position = self.position
+        return (
+            RectangularNode,
+            position.x,
+            position.y,
+            self.color,
+            self.rectangle.content_key(),
+            self.text.content_key(),
+        )
+
+    @classmethod
+    def content_keys(cls, components):
+        """Content of many nodes packed into arrays."""
+        if cls is not RectangularNode:
+            return super().content_keys(components)
+        geometry = map(
+            attrgetter(
+                "position.x",
+                "position.y",
+                "rectangle.position.x",
+                "rectangle.position.y",
+                "rectangle.dimensions.x",
+                "rectangle.dimensions.y",
+                "text.position.x",
+                "text.position.y",
+            ),
+            components,
+        )
+        colors = map(attrgetter("color", "rectangle.color", "text.color"), components)
+        return (
+            _pack(chain.from_iterable(geometry)),
+            tuple(chain.from_iterable(colors)),
+            tuple(map(attrgetter("text.text"), components)),
+        )
+
+    @property
+    def bounding_box(self):
+        """
+        Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and lower right
+        corner of the node.
+        """
+        x, y, width, height = self.frame
+        return (x, y, x + width, y + height)
+
+    def _anchor(self, horizontal, vertical):
+        """Position at given relative coordinates of the node."""
+        x, y, width, height = self.frame
+        return _make_coordinates(x + width * horizontal, y + height * vertical)
+
     @property
     def left(self):
         """
         ``Coordinates`` object representing the position located left of the
         diagram component.
         """
-        return self.rectangle.left + self.position
+        return self._anchor(0.0, 0.5)
 
     @property
     def top_left(self):
@@ -386,7 +1073,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located upper left of
         the diagram component.
         """
-        return self.rectangle.top_left + self.position
+        return self._anchor(0.0, 0.0)
 
     @property
     def top(self):
@@ -394,7 +1081,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located above of the
         diagram component.
         """
-        return self.rectangle.top + self.position
+        return self._anchor(0.5, 0.0)
 
     @property
     def top_right(self):
@@ -402,7 +1089,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located to the upper
         right of the diagram component.
         """
-        return self.rectangle.top_right + self.position
+        return self._anchor(1.0, 0.0)
 
     @property
     def right(self):
@@ -410,7 +1097,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located to the
         right of the diagram component.
         """
-        return self.rectangle.right + self.position
+        return self._anchor(1.0, 0.5)
 
     @property
     def bottom_right(self):
@@ -418,7 +1105,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located at the
         bottom right of the diagram component.
         """
-        return self.rectangle.bottom_right + self.position
+        return self._anchor(1.0, 1.0)
 
     @property
     def bottom(self):
@@ -426,7 +1113,7 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located below the
         diagram component.
         """
-        return self.rectangle.bottom + self.position
+        return self._anchor(0.5, 1.0)
 
     @property
     def bottom_left(self):
@@ -434,4 +1121,115 @@ class RectangularNode(ComponentBase, Connectable):
         ``Coordinates`` object representing the position located at the
         bottom left of the diagram component.
         """
-        return self.rectangle.bottom_left + self.position
+        return self._anchor(0.0, 1.0)
+
+
+###############################################################################
+# Batch anchors
+###############################################################################
+
+
+def anchors(components, anchor):
+    """
+    Compute the same anchor of many components at once.
+
+    Args:
+        components: Sequence of ``Connectable`` components.
+        anchor(``str``): The name of the anchor, i.e. one of ``"left"``,
+            ``"top_left"``, ``"top"``, ``"top_right"``, ``"right"``,
+            ``"bottom_right"``, ``"bottom"`` or ``"bottom_left"``.
+
+    Return:
+        ``CoordinatesArray`` holding the anchor positions.
+    """
+    components = list(components)
+    component_types = set(map(type, components))
+    for component_type in component_types:
+        if not issubclass(component_type, Connectable):
+            raise TypeError(
+                "Given component does not implement the Connectable interface."
+            )
+    if all(hasattr(component_type, "frame") for component_type in component_types):
+        values = chain.from_iterable(map(attrgetter("frame"), components))
+        frames = np.fromiter(values, dtype=np.float64, count=4 * len(components))
+    else:
+        frames = []
+        for component in components:
+            try:
+                frames.append(component.frame)
+            except AttributeError:
+                # Connectable components that don't describe themselves by a
+                # frame are treated as degenerate rectangles at their anchor.
+                position = getattr(component, anchor)
+                frames.append((position.x, position.y, 0.0, 0.0))
+        frames = np.array(frames, dtype=np.float64)
+    frames = frames.reshape(-1, 4)
+    positions = anchor_positions(frames[:, :2], frames[:, 2:], anchor)
+    return CoordinatesArray._wrap(positions)
+
+
+###############################################################################
+# Batch text fitting
+###############################################################################
+
+
+def auto_size_nodes(nodes, padding=TEXT_PADDING, minimum=(0.0, 0.0)):
+    """
+    Resize many nodes at once to fit their texts.
+
+    The texts of all nodes are measured using a single call to
+    ``diagrams.metrics.TextMetrics.measure_batch``, so that texts repeated
+    among the nodes are measured only once and texts that aren't cached
+    are measured together.
+
+    Args:
+        nodes: Sequence of ``RectangularNode`` objects.
+        padding(Coordinates): The horizontal and vertical space between the
+            text and the border of the nodes.
+        minimum(Coordinates): The minimum dimensions of the nodes.
+
+    Return:
+        ``CoordinatesArray`` holding the new dimensions of the nodes.
+    """
+    nodes = list(nodes)
+    extents = get_text_metrics().measure_batch([node.text.text for node in nodes])
+    padding = Coordinates(padding)
+    minimum = Coordinates(minimum)
+    dimensions = np.maximum(
+        extents + (2.0 * padding.x, 2.0 * padding.y), (minimum.x, minimum.y)
+    )
+    for node, (width, height) in zip(nodes, dimensions.tolist()):
+        rectangle = node.rectangle
+        if (width, height) != (rectangle.dimensions.x, rectangle.dimensions.y):
+            node.resize(_make_coordinates(width, height))
+    return CoordinatesArray._wrap(dimensions)
+
+
+###############################################################################
+# Batch colors
+###############################################################################
+
+
+def set_colors(components, colors):
+    """
+    Set the colors of many components at once.
+
+    Args:
+        components: Sequence of diagram components.
+        colors: A single ``Color`` applied to all components or a
+            ``ColorArray`` holding one color for each component, such as
+            the colors obtained from a ``Colormap``. Other sequences of
+            colors are converted to a ``ColorArray``.
+    """
+    components = list(components)
+    if isinstance(colors, Color):
+        colors = [colors] * len(components)
+    else:
+        if not isinstance(colors, ColorArray):
+            colors = ColorArray(colors)
+        if len(colors) != len(components):
+            raise ValueError(
+                "The number of colors must match the number of components."
+            )
+    for component, color in zip(components, colors):
+        component.set_color(color)
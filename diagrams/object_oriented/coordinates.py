@@ -3,8 +3,12 @@ diagram.object_oriented.coordinates
 ===================================
 
 Provides the ``Coordinates`` class representing coordinates in a 2D
-Cartesian space.
+Cartesian space and the ``CoordinatesArray`` class representing many of
+them at once.
 """
+from diagrams._lazy import lazy_import
+
+np = lazy_import("numpy")
 
 
 class Coordinates:
@@ -16,6 +20,8 @@ class Coordinates:
         self.y(float): The vertical coordinate.
     """
 
+    __slots__ = ("x", "y")
+
     def __init__(self, *args):
         """
         Create new coordinate pair.
@@ -60,11 +66,13 @@ class Coordinates:
 
     def __add__(self, other):
         """Component-wise addition of coordinates."""
-        return Coordinates(self.x + other.x, self.y + other.y)
+        if isinstance(other, CoordinatesArray):
+            return NotImplemented
+        return _make_coordinates(self.x + other.x, self.y + other.y)
 
     def __mul__(self, other):
         """Component-wise multiplication by scalar"""
-        return Coordinates(self.x * other, self.y * other)
+        return _make_coordinates(self.x * other, self.y * other)
 
     def __eq__(self, other):
         """Comparse horizontal and vertical components."""
@@ -73,3 +81,175 @@ class Coordinates:
     def __repr__(self):
         """Prints components."""
         return f"Coordinates({self.x}, {self.y})"
+
+
+_new = object.__new__
+
+
+def _make_coordinates(x, y):
+    """
+    Create coordinates without validating the arguments.
+
+    This is the construction path for the results of arithmetic on existing
+    coordinates, which are known to be valid floats. All other code should
+    use the ``Coordinates`` constructor.
+    """
+    coordinates = _new(Coordinates)
+    coordinates.x = x
+    coordinates.y = y
+    return coordinates
+
+
+class CoordinatesArray:
+    """
+    The CoordinatesArray class represents N pairs of 2D Cartesian coordinates
+    stored in a single array, so that they can be manipulated using
+    vectorized operations.
+
+    Attributes:
+        array(``numpy.ndarray``): Array of shape ``(N, 2)`` holding the
+            horizontal and vertical coordinates of each point.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, coordinates):
+        """
+        Create new coordinates array.
+
+        Args:
+            coordinates: Either
+                - An existing CoordinatesArray object to copy
+                - An array of shape ``(N, 2)``
+                - An iterable of Coordinates objects or iterables of length
+                  2 containing the two coordinates.
+        """
+        if isinstance(coordinates, CoordinatesArray):
+            array = coordinates.array.copy()
+        elif isinstance(coordinates, np.ndarray):
+            array = coordinates.astype(np.float64)
+        else:
+            array = [
+                (c.x, c.y) if isinstance(c, Coordinates) else tuple(c)
+                for c in coordinates
+            ]
+            try:
+                array = np.array(array, dtype=np.float64)
+            except ValueError:
+                raise ValueError(
+                    "The elements provided to the CoordinatesArray "
+                    "constructor must be Coordinates objects or iterables of "
+                    "length 2 with elements that can be converted to float."
+                )
+        if array.size == 0:
+            array = array.reshape(0, 2)
+        if array.ndim != 2 or array.shape[1] != 2:
+            raise ValueError(
+                "The array provided to the CoordinatesArray constructor must "
+                "have shape (N, 2)."
+            )
+        self.array = array
+
+    @classmethod
+    def _wrap(cls, array):
+        """Wrap an array of shape ``(N, 2)`` without copying or checking it."""
+        coordinates = cls.__new__(cls)
+        coordinates.array = array
+        return coordinates
+
+    @staticmethod
+    def _as_array(other):
+        """Convert operand of arithmetic operation to array."""
+        if isinstance(other, CoordinatesArray):
+            return other.array
+        if isinstance(other, Coordinates):
+            return np.array([other.x, other.y])
+        return np.asarray(other, dtype=np.float64)
+
+    @property
+    def x(self):
+        """The horizontal coordinates as array of shape ``(N,)``."""
+        return self.array[:, 0]
+
+    @property
+    def y(self):
+        """The vertical coordinates as array of shape ``(N,)``."""
+        return self.array[:, 1]
+
+    def __len__(self):
+        """The number of coordinate pairs."""
+        return self.array.shape[0]
+
+    def __getitem__(self, index):
+        """
+        Integer indices return a single ``Coordinates`` object, all other
+        indices a ``CoordinatesArray``.
+        """
+        if isinstance(index, (int, np.integer)):
+            x, y = self.array[index].tolist()
+            return _make_coordinates(x, y)
+        return CoordinatesArray._wrap(self.array[index].reshape(-1, 2))
+
+    def __iter__(self):
+        """Iterate over coordinates as ``Coordinates`` objects."""
+        for x, y in self.array.tolist():
+            yield _make_coordinates(x, y)
+
+    def __add__(self, other):
+        """
+        Component-wise addition of coordinates. The other operand may be a
+        single ``Coordinates`` object, which is added to all coordinates.
+        """
+        return CoordinatesArray._wrap(self.array + self._as_array(other))
+
+    __radd__ = __add__
+
+    def __mul__(self, other):
+        """
+        Component-wise multiplication by scalar or by an array of N scalars.
+        """
+        other = np.asarray(other, dtype=np.float64)
+        if other.ndim == 1 and other.shape[0] == len(self):
+            other = other[:, np.newaxis]
+        return CoordinatesArray._wrap(self.array * other)
+
+    __rmul__ = __mul__
+
+    def translate(self, delta):
+        """
+        Translate all coordinates in place.
+
+        Args:
+            delta: ``Coordinates`` object by which to translate all
+                coordinates or ``CoordinatesArray`` holding one step for
+                each of the coordinates.
+        """
+        self.array += self._as_array(delta)
+
+    def anchor(self, dimensions, horizontal, vertical):
+        """
+        Compute anchor positions of rectangular areas.
+
+        Args:
+            dimensions: ``Coordinates`` or ``CoordinatesArray`` holding the
+                extent of the areas whose upper left corners are given by
+                this object.
+            horizontal(``float``): Relative horizontal position of the
+                anchor, i.e. 0 for left and 1 for right.
+            vertical(``float``): Relative vertical position of the anchor,
+                i.e. 0 for top and 1 for bottom.
+
+        Return:
+            ``CoordinatesArray`` holding the anchor positions.
+        """
+        factors = np.array([horizontal, vertical], dtype=np.float64)
+        return CoordinatesArray._wrap(self.array + self._as_array(dimensions) * factors)
+
+    def __eq__(self, other):
+        """Compares all horizontal and vertical components."""
+        other = self._as_array(other)
+        return other.shape == self.array.shape and bool(np.all(self.array == other))
+
+    def __repr__(self):
+        """Prints components."""
+        return f"CoordinatesArray({self.array.tolist()})"
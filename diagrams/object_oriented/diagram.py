@@ -6,20 +6,71 @@ Provides the diagram class, which acts as a container for diagram components
 and draws them onto an canvas.
 """
 from abc import ABC, abstractmethod
-import tkinter
+from functools import lru_cache
+from itertools import groupby
+from diagrams import instrumentation
+from diagrams.backends.raster import RasterBackend
+from diagrams.backends.recording import ItemRecorder, RecordingBackend
+from diagrams.backends.svg import SVGBackend
+from diagrams.backends.tk import (
+    TK_BATCH_SIZE,
+    create_scrollable_tk_canvas,
+    create_tk_canvas,
+)
 from diagrams.object_oriented.coordinates import Coordinates
+from diagrams.object_oriented.viewport import Viewport
+from diagrams.routing import Router
+from diagrams.spatial import SpatialIndex
 
 ###############################################################################
 # DiagramComponent ABC
 ###############################################################################
 
+# Attributes holding the drawing state or references to other components
+# rather than the content of components.
+_STATE_ATTRIBUTES = frozenset(
+    ["_diagrams", "_items", "_dirty", "_connection", "_router"]
+)
+
+
+@lru_cache(maxsize=None)
+def _content_attributes(cls):
+    """Names of the slots holding the content of components of a class."""
+    names = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name not in _STATE_ATTRIBUTES and name not in names:
+                names.append(name)
+    return tuple(names)
+
+
+def _content_value(value):
+    """Convert attribute value to a value that can be hashed reproducibly."""
+    if isinstance(value, DiagramComponent):
+        return value.content_key()
+    if isinstance(value, Coordinates):
+        return (value.x, value.y)
+    if isinstance(value, (list, tuple)):
+        return tuple(_content_value(element) for element in value)
+    return value
+
 
 class DiagramComponent(ABC):
     """
     The basic interface for components that can be added to and drawn as
     parts of a diagram.
+
+    When a diagram is drawn in retained mode, each of its components keeps
+    the IDs of the canvas items it created and records the changes made to
+    it, so that the diagram can apply them to the canvas without redrawing
+    everything.
     """
 
+    __slots__ = ("_diagrams", "_items", "_dirty")
+
     @abstractmethod
     def draw(self, canvas, offset=Coordinates(0, 0)):
         """
@@ -28,21 +79,164 @@ class DiagramComponent(ABC):
         given canvas relative to the given offset.
 
         Params:
-            canvas: ``tkinter.Canvas`` object onto which to draw the component.
+            canvas: ``tkinter.Canvas`` or other backend implementing the
+                ``diagrams.backends.Backend`` interface onto which to draw the
+                component.
             offset: Offset to calculate the absolute position at which to
                 draw the component.
         """
 
+    @property
+    def bounding_box(self):
+        """
+        Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and lower right
+        corner of the smallest rectangle containing the component or
+        ``None`` if the extent of the component is unknown.
+        """
+        return None
+
+    def _changed(self, delta=None, recolor=False):
+        """
+        Mark component as changed and notify the diagrams containing it.
+
+        Args:
+            delta: ``Coordinates`` object holding the translation of the
+                component if it was moved.
+            recolor(``bool``): Whether the color of the component was changed.
+
+        If neither of the two arguments is given, the component is redrawn
+        on the next update.
+        """
+        if getattr(self, "_items", None) is not None:
+            dirty = getattr(self, "_dirty", None)
+            if dirty is None:
+                dirty = self._dirty = [0.0, 0.0, False, False]
+            if delta is not None:
+                dirty[0] += delta.x
+                dirty[1] += delta.y
+            if recolor:
+                dirty[2] = True
+            if delta is None and not recolor:
+                dirty[3] = True
+        for diagram in getattr(self, "_diagrams", ()):
+            diagram._component_changed(self)
+
+    def _redraw(self, canvas):
+        """
+        Replace the items of the component on the canvas with new ones
+        at the same position in the stacking order.
+        """
+        recorder = ItemRecorder(canvas)
+        self.draw(recorder)
+        old_items = getattr(self, "_items", None)
+        if old_items:
+            for item in recorder.items:
+                canvas.tag_lower(item, old_items[0])
+            canvas.delete(*old_items)
+        self._items = recorder.items
+
+    def update_items(self, canvas):
+        """
+        Apply the changes made to the component since it was last drawn
+        to its items on the canvas.
+
+        The default implementation redraws the component. Components
+        override this method to update their items more efficiently.
+
+        Params:
+            canvas: The canvas on which the items of the component were
+                created.
+        """
+        self._redraw(canvas)
+
+    def content_key(self):
+        """
+        A hashable tuple describing the content of the component, i.e.
+        everything that determines what is drawn.
+
+        The default implementation collects the class and the values of all
+        slots and instance attributes, except those holding the drawing
+        state. Two components with equal keys draw the same primitives.
+        Components whose attributes can't be compared by value should
+        override this method.
+        """
+        cls = type(self)
+        key = [cls]
+        for name in _content_attributes(cls):
+            key.append(_content_value(getattr(self, name, None)))
+        attributes = getattr(self, "__dict__", None)
+        if attributes:
+            for name in sorted(attributes):
+                if name not in _STATE_ATTRIBUTES:
+                    key.append((name, _content_value(attributes[name])))
+        return tuple(key)
+
+    @classmethod
+    def draw_batch(cls, canvas, components, offset=Coordinates(0, 0)):
+        """
+        Draw several components of this class at once.
+
+        Component classes whose drawing can be vectorized override this
+        method. The default implementation draws the components one by one.
+
+        Params:
+            canvas: The backend onto which to draw the components.
+            components: List of components of this class.
+            offset: Offset to calculate the absolute position at which to
+                draw the components.
+        """
+        for component in components:
+            component.draw(canvas, offset)
+
+    @classmethod
+    def content_keys(cls, components):
+        """
+        A hashable value describing the content of several components of
+        this class. Two lists of components with equal keys draw the same
+        primitives.
+
+        Component classes of which diagrams hold many instances override
+        this method to pack the content of all components into a few
+        arrays instead of creating a tuple per component. The default
+        implementation collects the content keys of the components.
+
+        Params:
+            components: List of components of this class.
+        """
+        return tuple([component.content_key() for component in components])
+
 
 ###############################################################################
 # Diagram class
 ###############################################################################
 
 
+def _obstacle_box(component):
+    """
+    The bounding box of a component that routed arrows avoid, i.e. a
+    component with a ``frame``, or ``None`` for all other components.
+    """
+    frame = getattr(component, "frame", None)
+    if frame is None:
+        return None
+    x, y, width, height = frame
+    return (x, y, x + width, y + height)
+
+
 class Diagram:
     """
     The diagram class contains diagram components and draws them
     onto a canvas.
+
+    The diagram maintains a spatial index over the bounding boxes of its
+    components, which is used to efficiently find components by their
+    location. The index is kept up to date when components are added,
+    removed or changed through their ``translate`` method.
+
+    Routed arrows share the ``router`` of the diagram, which keeps track of
+    the components they avoid in the same way. Arrows whose routes are
+    affected by changes to these components are rerouted before the
+    diagram is drawn, updated or queried.
     """
 
     def __init__(self, width, height):
@@ -56,6 +250,15 @@ class Diagram:
         self.width = width
         self.height = height
         self.components = []
+        self._index = SpatialIndex()
+        self._unbounded = set()
+        self._order = {}
+        self._counter = 0
+        self._canvas = None
+        self._viewport = None
+        self._pending = {}
+        self._stats = instrumentation.DrawStats()
+        self._router = None
 
     def add(self, component):
         """Add component to diagram. """
@@ -64,18 +267,362 @@ class Diagram:
                 "Given component does not implement the" " DiagramComponent interface."
             )
         self.components.append(component)
+        self._order[component] = self._counter
+        self._counter += 1
+        diagrams = getattr(component, "_diagrams", ())
+        if self not in diagrams:
+            component._diagrams = diagrams + (self,)
+        box = component.bounding_box
+        if box is not None:
+            self._index.insert(component, box)
+        else:
+            self._unbounded.add(component)
+        if self._router is not None:
+            obstacle = _obstacle_box(component)
+            if obstacle is not None:
+                self._router.set_obstacle(component, obstacle)
+        if self._canvas is not None:
+            self._pending[component] = None
+
+    def remove(self, component):
+        """
+        Remove component from diagram.
 
-    def draw(self):
+        Args:
+            component: The component to remove.
+        """
+        self.components.remove(component)
+        if component in self.components:
+            return
+        del self._order[component]
+        if component in self._index:
+            self._index.remove(component)
+        self._unbounded.discard(component)
+        self._pending.pop(component, None)
+        if self._router is not None:
+            self._router.remove_obstacle(component)
+            self._router.remove_route(component)
+        items = getattr(component, "_items", None)
+        if items is not None:
+            if items and self._canvas is not None:
+                self._canvas.delete(*items)
+            component._items = None
+            component._dirty = None
+        component._diagrams = tuple(d for d in component._diagrams if d is not self)
+
+    def _component_changed(self, component):
+        """
+        Callback for components of this diagram that have changed.
         """
-        Draws diagram components on HTML5 canvas.
+        box = component.bounding_box
+        if box is not None:
+            self._index.update(component, box)
+            self._unbounded.discard(component)
+        else:
+            if component in self._index:
+                self._index.remove(component)
+            self._unbounded.add(component)
+        if self._router is not None:
+            obstacle = _obstacle_box(component)
+            if obstacle is not None:
+                self._router.set_obstacle(component, obstacle)
+        if self._canvas is not None:
+            self._pending[component] = None
+
+    @property
+    def router(self):
+        """
+        The ``diagrams.routing.Router`` shared by the routed arrows of the
+        diagram. Its obstacles are the components with a ``frame``, such as
+        ``RectangularNode`` objects. It is created when it is first used.
+        """
+        if self._router is None:
+            router = Router()
+            for component in self.components:
+                obstacle = _obstacle_box(component)
+                if obstacle is not None:
+                    router.set_obstacle(component, obstacle)
+            self._router = router
+        return self._router
+
+    def _update_routes(self):
+        """
+        Reroute the arrows whose routes are affected by changes to the
+        obstacles of the router.
+        """
+        if self._router is not None:
+            for arrow in self._router.pop_stale():
+                arrow.reroute()
+
+    def query_rect(self, x_0, y_0, x_1, y_1, include_unbounded=False):
+        """
+        Find components intersecting a rectangular region.
+
+        Args:
+            x_0: The left boundary of the region.
+            y_0: The upper boundary of the region.
+            x_1: The right boundary of the region.
+            y_1: The lower boundary of the region.
+            include_unbounded(``bool``): Whether to include components
+                without bounding box in the result.
+
+        Return:
+            List of the components whose bounding boxes intersect the region
+            in the order in which they are drawn.
+        """
+        self._update_routes()
+        components = self._index.query(x_0, y_0, x_1, y_1)
+        if include_unbounded:
+            components.update(self._unbounded)
+        return sorted(components, key=self._order.__getitem__)
+
+    @property
+    def bounding_box(self):
+        """
+        Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and lower right
+        corner of the region covered by the diagram, i.e. the canvas area
+        and the bounding boxes of all components.
+        """
+        self._update_routes()
+        return self._index.bounds((0, 0, self.width, self.height))
+
+    @property
+    def canvas(self):
+        """
+        The canvas onto which the diagram was drawn in retained or virtual
+        mode or ``None`` if it hasn't been drawn in either mode.
+        """
+        return self._canvas
+
+    def component_at(self, x, y):
+        """
+        Find the topmost component at a given position.
+
+        Args:
+            x: The horizontal coordinate of the position.
+            y: The vertical coordinate of the position.
+
+        Return:
+            The component drawn last among those whose bounding boxes contain
+            the position or ``None`` if there is no such component.
+        """
+        self._update_routes()
+        components = self._index.query_point(x, y)
+        return max(components, key=self._order.__getitem__, default=None)
+
+    def draw(
+        self, canvas=None, virtual=False, margin=200, retained=False, cache=None
+    ):
+        """
+        Draws diagram components onto a canvas.
+
+        Args:
+            canvas: The backend onto which to draw the components. If not
+                given, the diagram is displayed in a ``tkinter`` window.
+            virtual(``bool``): If ``True``, the diagram is displayed in a
+                scrollable ``tkinter`` window of the size of the diagram,
+                which only contains canvas items for the components in
+                the visible region. Ignored if a canvas is given.
+            margin(``float``): Size of the margin around the visible region
+                in which components are drawn in virtual mode.
+            retained(``bool``): If ``True``, the diagram is drawn in retained
+                mode, i.e. changes made to its components afterwards can be
+                applied to the canvas using ``update``. This requires the
+                canvas to support the ``coords``, ``itemconfigure``,
+                ``move``, ``delete`` and ``tag_lower`` methods of
+                ``tkinter.Canvas``. Virtual mode implies retained mode.
+            cache(DisplayListCache): Optional cache of display lists. If
+                given, the drawing commands of the diagram are looked up in
+                the cache using its ``content_key`` and replayed onto the
+                canvas. If they aren't found, they are recorded and stored
+                in the cache. Ignored in retained and virtual mode.
 
         Return:
             Canvas with all diagram components drawn onto.
         """
-        root = tkinter.Tk()
-        canvas = tkinter.Canvas(root, bg="white", height=self.height, width=self.width)
-        for component in self.components:
-            component.draw(canvas)
+        self._update_routes()
+        if canvas is None and virtual:
+            viewport = None
+
+            def on_view_change():
+                viewport.refresh()
+
+            root, canvas = create_scrollable_tk_canvas(
+                self.width, self.height, self.bounding_box, on_view_change
+            )
+            viewport = Viewport(self, canvas, margin=margin)
+            self._canvas = canvas
+            self._viewport = viewport
+            self._pending = {}
+            viewport.update(0, 0, self.width, self.height)
+            root.mainloop()
+            return canvas
+
+        root = None
+        if canvas is None:
+            root, canvas = create_tk_canvas(
+                self.width, self.height, batch_size=TK_BATCH_SIZE
+            )
+
+        if retained:
+            self._canvas = canvas
+            self._viewport = None
+            self._pending = {}
+            instrumented = instrumentation.ENABLED
+            for component in self.components:
+                component._items = None
+                component._dirty = None
+                if instrumented:
+                    with instrumentation.measure(
+                        self._stats, type(component).__name__, 1, canvas
+                    ) as counter:
+                        component._redraw(counter)
+                else:
+                    component._redraw(canvas)
+        elif cache is not None:
+            key = self.content_key()
+            display_list = cache.get(key)
+            if display_list is None:
+                display_list = self.record()
+                cache.put(key, display_list)
+            # The replay is measured separately from the recording, so that
+            # drawing from the cache also shows up in the statistics.
+            if instrumentation.ENABLED:
+                with instrumentation.measure(
+                    self._stats,
+                    type(display_list).__name__,
+                    len(self.components),
+                    canvas,
+                ) as counter:
+                    display_list.replay(counter)
+            else:
+                display_list.replay(canvas)
+        # Consecutive components of the same class are drawn together so
+        # that their drawing can be vectorized without changing the order in
+        # which they are drawn.
+        elif instrumentation.ENABLED:
+            for cls, components in groupby(self.components, key=type):
+                components = list(components)
+                with instrumentation.measure(
+                    self._stats, cls.__name__, len(components), canvas
+                ) as counter:
+                    cls.draw_batch(counter, components)
+        else:
+            for cls, components in groupby(self.components, key=type):
+                cls.draw_batch(canvas, list(components))
+
+        if root is not None:
+            canvas.pack()
+            root.mainloop()
+        return canvas
+
+    def content_key(self):
+        """
+        A hashable tuple describing the content of the diagram, i.e. its
+        size and the content keys of consecutive components of the same
+        class in drawing order. Diagrams with equal keys draw the same
+        primitives.
+        """
+        self._update_routes()
+        keys = tuple(
+            [
+                (cls, cls.content_keys(list(components)))
+                for cls, components in groupby(self.components, key=type)
+            ]
+        )
+        return (self.width, self.height, keys)
+
+    def record(self):
+        """
+        Record the drawing commands of the diagram.
+
+        Return:
+            ``DisplayList`` holding the commands, which can be replayed onto
+            any backend.
+        """
+        canvas = RecordingBackend(self.width, self.height)
+        self.draw(canvas)
+        return canvas.display_list
+
+    def stats(self, reset=False):
+        """
+        Drawing statistics recorded while instrumentation was enabled.
+
+        Args:
+            reset(``bool``): Whether to discard the statistics after
+                returning them.
+
+        Return:
+            ``dict`` mapping the names of the component classes to ``dict``s
+            holding the number of drawn components (``calls``), the wall
+            time spent drawing them in seconds (``time``) and the number of
+            primitives drawn on the canvas (``primitives``). Replaying a
+            display list from a cache is recorded under ``"DisplayList"``
+            with the number of components of the diagram.
+        """
+        stats = self._stats.as_dict()
+        if reset:
+            self._stats.reset()
+        return stats
 
-        canvas.pack()
-        root.mainloop()
+    def export_svg(self, path_or_file, cache=None):
+        """
+        Write diagram to an SVG file.
+
+        The SVG elements are streamed to the file while the components are
+        drawn, so that the document is never held in memory.
+
+        Args:
+            path_or_file: Path of the file to write to or file object
+                opened in text mode.
+            cache(DisplayListCache): Optional cache of display lists to use
+                for drawing.
+        """
+        with SVGBackend(path_or_file, self.width, self.height) as canvas:
+            self.draw(canvas, cache=cache)
+
+    def export_png(self, path_or_file, background="white", cache=None):
+        """
+        Render diagram to a PNG file without requiring a display server.
+
+        Args:
+            path_or_file: Path of the file to write to or file object
+                opened in binary mode.
+            background: The background color of the image.
+            cache(DisplayListCache): Optional cache of display lists to use
+                for drawing.
+        """
+        canvas = RasterBackend(self.width, self.height, background=background)
+        self.draw(canvas, cache=cache)
+        canvas.write_png(path_or_file)
+
+    def update(self):
+        """
+        Apply the changes made to the components of the diagram since it was
+        drawn in retained mode to the canvas.
+
+        Components that were translated or recolored through their
+        ``translate`` and ``set_color`` methods only have their existing
+        canvas items moved or reconfigured. Components added since the last
+        update are drawn on top of the diagram.
+        """
+        canvas = self._canvas
+        if canvas is None:
+            raise RuntimeError(
+                "The diagram must be drawn in retained mode before it can be "
+                "updated."
+            )
+        self._update_routes()
+        pending = self._pending
+        self._pending = {}
+        viewport = self._viewport
+        for component in pending:
+            items = getattr(component, "_items", None)
+            if items is None:
+                if viewport is None:
+                    component._redraw(canvas)
+            elif getattr(component, "_dirty", None) is not None:
+                component.update_items(canvas)
+            component._dirty = None
+        if viewport is not None:
+            viewport.update(*viewport.region)
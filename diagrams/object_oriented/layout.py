@@ -0,0 +1,182 @@
+"""
+diagrams.object_oriented.layout
+===============================
+
+Provides functions to arrange the components of a diagram automatically.
+"""
+from diagrams._lazy import lazy_import
+from diagrams.layout import force_positions, layered_positions
+from diagrams.object_oriented.components import Arrow
+from diagrams.object_oriented.coordinates import Coordinates, CoordinatesArray
+
+np = lazy_import("numpy")
+
+
+def _edge_indices(nodes, edges):
+    """Indices of the nodes connected by edges."""
+    indices = {id(node): index for index, node in enumerate(nodes)}
+    sources = []
+    targets = []
+    for edge in edges:
+        if isinstance(edge, Arrow):
+            if edge.source is None:
+                raise ValueError(
+                    "Arrows used as edges of a layout must be created using "
+                    "'Arrow.connect'."
+                )
+            source, target = edge.source, edge.target
+        else:
+            source, target = edge
+        try:
+            sources.append(indices[id(source)])
+            targets.append(indices[id(target)])
+        except KeyError:
+            raise ValueError("Edges must connect components from the given nodes.")
+    return sources, targets
+
+
+def layered_layout(
+    nodes,
+    edges,
+    direction="right",
+    origin=Coordinates(0, 0),
+    layer_spacing=50.0,
+    node_spacing=20.0,
+    sweeps=4,
+):
+    """
+    Arrange nodes connected by edges in layers.
+
+    The nodes are placed in layers such that the edges point in the given
+    direction wherever the graph allows it, and ordered within the layers
+    so that few edges cross. See ``diagrams.layout`` for details. The
+    nodes are moved to their new positions using ``translate`` and the
+    arrows among the edges are moved along with them using ``reconnect``.
+
+    Args:
+        nodes: Sequence of the ``Connectable`` components to arrange, such
+            as ``RectangularNode`` objects, which must describe their
+            extent by a ``frame``.
+        edges: Sequence of the edges between the nodes given either as
+            arrows created using ``Arrow.connect`` or as pairs
+            ``(source, target)`` of nodes.
+        direction(``str``): The direction in which edges point, i.e.
+            ``"right"`` or ``"down"``.
+        origin(Coordinates): The upper left corner of the layout.
+        layer_spacing(``float``): The distance between layers.
+        node_spacing(``float``): The minimum distance between the nodes of
+            a layer.
+        sweeps(``int``): The number of sweeps over the layers to reduce
+            edge crossings.
+
+    Return:
+        ``Coordinates`` object holding the width and height of the layout.
+    """
+    nodes = list(nodes)
+    edges = list(edges)
+    sources, targets = _edge_indices(nodes, edges)
+    frames = np.array([node.frame for node in nodes], dtype=np.float64)
+    frames = frames.reshape(-1, 4)
+    positions, (width, height) = layered_positions(
+        frames[:, 2:],
+        sources,
+        targets,
+        direction=direction,
+        layer_spacing=layer_spacing,
+        node_spacing=node_spacing,
+        sweeps=sweeps,
+    )
+    origin = Coordinates(origin)
+    deltas = positions + (origin.x, origin.y) - frames[:, :2]
+    for node, (delta_x, delta_y) in zip(nodes, deltas.tolist()):
+        if delta_x or delta_y:
+            node.translate(Coordinates(delta_x, delta_y))
+    for edge in edges:
+        if isinstance(edge, Arrow):
+            edge.reconnect()
+    return Coordinates(width, height)
+
+
+def force_layout(
+    nodes,
+    edges,
+    spring_length=None,
+    iterations=100,
+    tolerance=0.01,
+    pinned=(),
+    theta=1.2,
+    seed=0,
+):
+    """
+    Arrange nodes of an undirected graph using a force-directed layout.
+
+    The nodes start at their current positions and are moved by the
+    forces between them until no node moves by more than the given
+    tolerance or the iteration budget is spent. Calling the function again
+    continues the layout, so that it can be computed in small batches of
+    iterations with the diagram redrawn in between. See
+    ``diagrams.layout.force_positions`` for details. The nodes are moved
+    to their new positions using ``translate`` and the arrows among the
+    edges are moved along with them using ``reconnect``.
+
+    Args:
+        nodes: Sequence of the ``Connectable`` components to arrange, such
+            as ``RectangularNode`` objects, which must describe their
+            extent by a ``frame``.
+        edges: Sequence of the edges between the nodes given either as
+            arrows created using ``Arrow.connect`` or as pairs
+            ``(source, target)`` of nodes. Their direction is ignored.
+        spring_length(``float``): The desired length of the edges between
+            the centers of the nodes. Defaults to twice the largest side of
+            the average node.
+        iterations(``int``): The maximum number of iterations.
+        tolerance(``float``): The layout is considered converged when no
+            node moves by more than this fraction of the spring length in
+            an iteration.
+        pinned: Sequence of nodes that keep their positions.
+        theta(``float``): The accuracy parameter of the Barnes-Hut
+            approximation of the repulsive forces.
+        seed(``int``): Seed for the random offsets applied to nodes at the
+            same position.
+
+    Return:
+        The number of iterations that were performed. If it is less than
+        ``iterations``, the layout converged.
+    """
+    nodes = list(nodes)
+    edges = list(edges)
+    sources, targets = _edge_indices(nodes, edges)
+    if not nodes:
+        return 0
+    frames = np.array([node.frame for node in nodes], dtype=np.float64)
+    frames = frames.reshape(-1, 4)
+    centers = CoordinatesArray._wrap(frames[:, :2]).anchor(
+        CoordinatesArray._wrap(frames[:, 2:]), 0.5, 0.5
+    )
+    if spring_length is None:
+        spring_length = 2.0 * frames[:, 2:].mean(axis=0).max(initial=0.0) or 50.0
+    indices = {id(node): index for index, node in enumerate(nodes)}
+    try:
+        pinned = [indices[id(node)] for node in pinned]
+    except KeyError:
+        raise ValueError("Pinned components must be among the given nodes.")
+
+    positions, performed = force_positions(
+        centers.array,
+        sources,
+        targets,
+        spring_length=spring_length,
+        iterations=iterations,
+        tolerance=tolerance,
+        pinned=pinned,
+        theta=theta,
+        seed=seed,
+    )
+    deltas = positions - centers.array
+    for node, (delta_x, delta_y) in zip(nodes, deltas.tolist()):
+        if delta_x or delta_y:
+            node.translate(Coordinates(delta_x, delta_y))
+    for edge in edges:
+        if isinstance(edge, Arrow):
+            edge.reconnect()
+    return performed
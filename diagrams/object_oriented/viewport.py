@@ -0,0 +1,118 @@
+"""
+diagrams.object_oriented.viewport
+=================================
+
+Provides the viewport class, which draws only the visible part of a
+diagram.
+"""
+from diagrams.backends.recording import ItemRecorder
+
+###############################################################################
+# Viewport
+###############################################################################
+
+
+class Viewport:
+    """
+    A viewport onto a diagram, which only creates canvas items for the
+    components that are visible.
+
+    Each time the visible region changes, items are created for components
+    that have become visible and deleted for those that are no longer
+    visible. Components within a margin around the visible region are kept
+    so that small scroll steps don't cause any redrawing. The IDs of the
+    items of each drawn component are stored with the component, so that
+    changes to drawn components can be applied using ``Diagram.update``.
+    The canvas must support the ``delete`` and ``tag_lower`` methods of
+    ``tkinter.Canvas`` in addition to the backend interface.
+
+    Attributes:
+        diagram(Diagram): The diagram to display.
+        canvas: The canvas onto which to draw the diagram.
+        margin(``float``): Size of the margin around the visible region in
+            pixels.
+        region: Tuple ``(x_0, y_0, x_1, y_1)`` holding the visible region.
+    """
+
+    def __init__(self, diagram, canvas, margin=200):
+        """
+        Create viewport.
+
+        Args:
+            diagram(Diagram): The diagram to display.
+            canvas: The canvas onto which to draw the diagram.
+            margin(``float``): Size of the margin around the visible region
+                in pixels.
+        """
+        self.diagram = diagram
+        self.canvas = canvas
+        self.margin = margin
+        self._drawn = {}
+        self.region = (0, 0, 0, 0)
+
+    @property
+    def drawn_components(self):
+        """The components that currently have items on the canvas."""
+        return list(self._drawn)
+
+    def update(self, x_0, y_0, x_1, y_1):
+        """
+        Update canvas items for a new visible region.
+
+        Args:
+            x_0: The left boundary of the visible region.
+            y_0: The upper boundary of the visible region.
+            x_1: The right boundary of the visible region.
+            y_1: The lower boundary of the visible region.
+        """
+        self.region = (x_0, y_0, x_1, y_1)
+        margin = self.margin
+        canvas = self.canvas
+        drawn = self._drawn
+        visible = self.diagram.query_rect(
+            x_0 - margin, y_0 - margin, x_1 + margin, y_1 + margin, True
+        )
+
+        visible_set = set(visible)
+        for component in [c for c in drawn if c not in visible_set]:
+            del drawn[component]
+            if component._items:
+                canvas.delete(*component._items)
+            component._items = None
+            component._dirty = None
+
+        created = set()
+        for component in visible:
+            if component not in drawn:
+                recorder = ItemRecorder(canvas)
+                component.draw(recorder)
+                component._items = recorder.items
+                component._dirty = None
+                drawn[component] = None
+                created.add(component)
+
+        # New items are created on top of all existing ones. Those that
+        # belong to components drawn before already existing components are
+        # moved below them to preserve the drawing order of the diagram.
+        above = None
+        existing_above = False
+        for component in reversed(visible):
+            component_items = component._items
+            if component in created:
+                if existing_above and above is not None:
+                    for item in component_items:
+                        canvas.tag_lower(item, above)
+            else:
+                existing_above = True
+            if component_items:
+                above = component_items[0]
+
+    def refresh(self, *args):
+        """
+        Update canvas items for the region currently visible on a
+        ``tkinter.Canvas``. Can be used as an event callback.
+        """
+        canvas = self.canvas
+        x_0 = canvas.canvasx(0)
+        y_0 = canvas.canvasy(0)
+        self.update(x_0, y_0, x_0 + canvas.winfo_width(), y_0 + canvas.winfo_height())
@@ -8,3 +8,4 @@ the tkinter graphical interface.
 from diagrams.procedural.coordinates import *
 from diagrams.procedural.components import *
 from diagrams.procedural.diagram import *
+from diagrams.procedural.table import *
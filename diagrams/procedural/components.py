@@ -72,6 +72,7 @@ def create_arrow(start, end, color="black", head_size=10):
             end(``tuple``): Position of the arrow tip.
             color(``str``): The arrow color given as ``tkinter``-compatible
                             color string.
+            head_size(``int``): Size of the arrow head in pixels.
 
         Return:
             ``dict`` representing the diagram component.
@@ -82,7 +83,7 @@ def create_arrow(start, end, color="black", head_size=10):
         "start": start,
         "end": end,
         "color": color,
-        "head_size": 10,
+        "head_size": head_size,
     }
 
 
@@ -5,8 +5,26 @@ diagrams.procedural.coordinates
 This module provides functions for manipulating 2D coordinates represented
 as length-2 tuples.
 """
+from itertools import chain
+from operator import itemgetter
+
+from diagrams._lazy import lazy_import
+from diagrams.geometry import anchor_positions
 from diagrams.procedural.components import ComponentType
 
+np = lazy_import("numpy")
+
+_ANCHORED_TYPES = frozenset([ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE])
+
+
+def _coordinate_column(components, key):
+    """Gather the coordinates stored under key in all components."""
+    values = chain.from_iterable(map(itemgetter(key), components))
+    column = np.fromiter(values, dtype=np.float64)
+    if column.size != 2 * len(components):
+        raise ValueError(f"All components must have 2D coordinates as '{key}'.")
+    return column.reshape(-1, 2)
+
 
 def add_coordinates(coord_1, coord_2):
     """
@@ -51,7 +69,7 @@ def left(component):
         left of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (0, dimensions[1] / 2.0))
@@ -74,7 +92,7 @@ def top_left(component):
         top-left of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         return position
     else:
@@ -96,7 +114,7 @@ def top(component):
         top of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (dimensions[0] / 2.0, 0))
@@ -119,7 +137,7 @@ def top_right(component):
         top-right of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (dimensions[0], 0))
@@ -142,7 +160,7 @@ def right(component):
         right of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (dimensions[0], dimensions[1] / 2.0))
@@ -165,7 +183,7 @@ def bottom_right(component):
         bottom-right of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (dimensions[0], dimensions[1]))
@@ -188,7 +206,7 @@ def bottom(component):
         bottom of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (dimensions[0] / 2, dimensions[1]))
@@ -211,7 +229,7 @@ def bottom_left(component):
         bottom-left of the component.
     """
     component_type = component["type"]
-    if component_type in [ComponentType.RECTANGLE, ComponentType.RECTANGULAR_NODE]:
+    if component_type in _ANCHORED_TYPES:
         position = component["position"]
         dimensions = component["dimensions"]
         return add_coordinates(position, (0, dimensions[1]))
@@ -219,3 +237,44 @@ def bottom_left(component):
         raise ValueError(
             f"Component type {component_type} is not a known" "component type."
         )
+
+
+def anchors(components, anchor, indices=None):
+    """
+    Compute the same anchor of many components at once.
+
+    Args:
+        components: Either a sequence of dictionaries representing diagram
+            components or a component table created using
+            ``create_component_table``.
+        anchor(``str``): The name of the anchor, i.e. one of ``"left"``,
+            ``"top_left"``, ``"top"``, ``"top_right"``, ``"right"``,
+            ``"bottom_right"``, ``"bottom"`` or ``"bottom_left"``.
+        indices: If components is a component table, the indices of the
+            components for which to compute the anchors. Defaults to all
+            components in the table.
+
+    Return:
+        Array of shape ``(N, 2)`` holding the anchor positions.
+    """
+    if isinstance(components, dict) and "size" in components:
+        if indices is None:
+            indices = slice(0, components["size"])
+        types = components["type"][indices]
+        anchored = [component_type.value for component_type in _ANCHORED_TYPES]
+        if not np.all(np.isin(types, anchored)):
+            raise ValueError("All components must be rectangles or rectangular nodes.")
+        positions = components["position"][indices]
+        dimensions = components["dimensions"][indices]
+    else:
+        components = list(components)
+        types = list(map(itemgetter("type"), components))
+        # list.count compares by identity first, which is much faster than
+        # hashing the enum members.
+        if sum(map(types.count, _ANCHORED_TYPES)) != len(types):
+            for component_type in types:
+                if component_type not in _ANCHORED_TYPES:
+                    raise ValueError(f"Component type {component_type} has no anchors.")
+        positions = _coordinate_column(components, "position")
+        dimensions = _coordinate_column(components, "dimensions")
+    return anchor_positions(positions, dimensions, anchor)
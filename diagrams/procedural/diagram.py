@@ -4,33 +4,57 @@ diagrams.procedural.diagram
 
 This module provides functions related to the drawing of diagram components.
 """
-import tkinter
-import numpy as np
+from diagrams import instrumentation
+from diagrams._lazy import lazy_import
+from diagrams.backends.raster import RasterBackend
+from diagrams.backends.svg import SVGBackend
+from diagrams.backends.tk import TK_BATCH_SIZE, create_tk_canvas
 from diagrams.procedural.coordinates import add_coordinates, scale_coordinates
 from diagrams.procedural.components import ComponentType
+from diagrams.geometry import arrow_head, arrow_heads
+
+np = lazy_import("numpy")
 
 _ROOT = None
 _CANVAS = None
+_STATS = instrumentation.DrawStats()
 
 
-def create_canvas(width, height):
+def create_canvas(width, height, canvas=None):
     """
     Create a global canvas object.
 
     Args:
         width(int): The width in pixels.
         height(int): The height in pixels.
+        canvas: Optional backend to use as global canvas. If not given, a
+            ``tkinter`` canvas is created, onto which drawing commands are
+            submitted in batches.
     """
     global _ROOT
     global _CANVAS
-    _ROOT = tkinter.Tk()
-    _CANVAS = tkinter.Canvas(_ROOT, bg="white", height=height, width=width)
+    if canvas is None:
+        _ROOT, _CANVAS = create_tk_canvas(width, height, batch_size=TK_BATCH_SIZE)
+    else:
+        _ROOT = None
+        _CANVAS = canvas
+
+
+def get_canvas():
+    """
+    Return:
+        The global canvas object.
+    """
+    return _CANVAS
 
 
 def show():
     """
-    Displays the canvas.
+    Displays the canvas. Does nothing if the global canvas is not a
+    ``tkinter`` canvas.
     """
+    if _ROOT is None:
+        return
     _CANVAS.pack()
     _ROOT.mainloop()
 
@@ -82,13 +106,36 @@ def draw_arrow(component):
     color = component["color"]
     head_size = component["head_size"]
     canvas.create_line(start[0], start[1], end[0], end[1], fill=color)
-    angle = np.pi + np.arctan2(end[1] - start[1], end[0] - start[0])
-    x_1 = end[0] + head_size * np.cos(angle + np.pi / 6)
-    y_1 = end[1] + head_size * np.sin(angle + np.pi / 6)
-    x_2 = end[0] + head_size * np.cos(angle - np.pi / 6)
-    y_2 = end[1] + head_size * np.sin(angle - np.pi / 6)
-    coordinates = [end[0], end[1], x_1, y_1, x_2, y_2]
-    canvas.create_polygon(coordinates, outline=color, fill=None)
+    head = arrow_head(start[0], start[1], end[0], end[1], head_size)
+    canvas.create_polygon(head, outline=color, fill=None)
+
+def draw_arrows(components):
+    """
+    Draw many arrows on canvas.
+
+    The head polygons of all arrows are computed in a single vectorized
+    pass. The result is identical to drawing the arrows one by one using
+    ``draw_arrow``.
+
+    Args:
+        components: Iterable of arrows created using the create_arrow
+            function.
+    """
+    global _CANVAS
+    canvas = _CANVAS
+    components = list(components)
+    if not components:
+        return
+    lines = np.array(
+        [(*component["start"], *component["end"]) for component in components],
+        dtype=np.float64,
+    )
+    head_sizes = [component["head_size"] for component in components]
+    heads = arrow_heads(lines[:, 0], lines[:, 1], lines[:, 2], lines[:, 3], head_sizes)
+    for component, line, head in zip(components, lines.tolist(), heads.tolist()):
+        color = component["color"]
+        canvas.create_line(*line, fill=color)
+        canvas.create_polygon(head, outline=color, fill=None)
 
 def draw_rectangular_node(component):
     """
@@ -118,20 +165,123 @@ def draw_rectangular_node(component):
         text_position[0], text_position[1], text=text, fill=text_color
     )
 
+_DRAW_FUNCTIONS = {
+    ComponentType.RECTANGLE: draw_rectangle,
+    ComponentType.TEXT: draw_text,
+    ComponentType.ARROW: draw_arrow,
+    ComponentType.RECTANGULAR_NODE: draw_rectangular_node,
+}
+
+
 def draw(component):
     """
-    Draw component on the current canvas.
+    Draw component on the current canvas. Components of unknown type are
+    ignored.
 
     Args:
         component(``dict``): A dictionary representing the component
             to be drawn.
     """
-    component_type = component["type"]
-    if component_type == ComponentType.RECTANGLE:
-        draw_rectangle(component)
-    elif component_type == ComponentType.TEXT:
-        draw_text(component)
-    elif component_type == ComponentType.ARROW:
-        draw_arrow(component)
-    elif component_type == ComponentType.RECTANGULAR_NODE:
-        draw_rectangular_node(component)
+    draw_function = _DRAW_FUNCTIONS.get(component["type"])
+    if draw_function is None:
+        return
+    if instrumentation.ENABLED:
+        _draw_instrumented(component, draw_function)
+    else:
+        draw_function(component)
+
+
+def _draw_instrumented(component, draw_function):
+    """Draw component and record drawing statistics."""
+    global _CANVAS
+    canvas = _CANVAS
+    name = component["type"].name
+    with instrumentation.measure(_STATS, name, 1, canvas) as counter:
+        _CANVAS = counter
+        try:
+            draw_function(component)
+        finally:
+            _CANVAS = canvas
+
+
+def draw_stats(reset=False):
+    """
+    Drawing statistics of the ``draw`` function recorded while
+    instrumentation was enabled.
+
+    Args:
+        reset(``bool``): Whether to discard the statistics after returning
+            them.
+
+    Return:
+        ``dict`` mapping the names of the component types to ``dict``s
+        holding the number of drawn components (``calls``), the wall time
+        spent drawing them in seconds (``time``) and the number of
+        primitives drawn on the canvas (``primitives``).
+    """
+    stats = _STATS.as_dict()
+    if reset:
+        _STATS.reset()
+    return stats
+
+
+def _draw_onto(canvas, components):
+    """
+    Draw components onto a given canvas instead of the global canvas.
+
+    Args:
+        canvas: The backend to draw the components onto.
+        components: Iterable of dictionaries representing the components to
+            draw or a component table.
+    """
+    global _CANVAS
+    previous = _CANVAS
+    _CANVAS = canvas
+    try:
+        if isinstance(components, dict) and "size" in components:
+            from diagrams.procedural.table import draw_all
+
+            draw_all(components)
+        else:
+            for component in components:
+                draw(component)
+    finally:
+        _CANVAS = previous
+
+
+def export_svg(path_or_file, components, width, height):
+    """
+    Write components to an SVG file.
+
+    The SVG elements are streamed to the file while the components are
+    drawn. If the components are provided by a generator, the memory
+    required is therefore independent of the number of components.
+
+    Args:
+        path_or_file: Path of the file to write to or file object opened in
+            text mode.
+        components: Iterable of dictionaries representing the components to
+            draw or a component table.
+        width(int): The width of the diagram in pixels.
+        height(int): The height of the diagram in pixels.
+    """
+    with SVGBackend(path_or_file, width, height) as canvas:
+        _draw_onto(canvas, components)
+
+
+def export_png(path_or_file, components, width, height, background="white"):
+    """
+    Render components to a PNG file without requiring a display server.
+
+    Args:
+        path_or_file: Path of the file to write to or file object opened in
+            binary mode.
+        components: Iterable of dictionaries representing the components to
+            draw or a component table.
+        width(int): The width of the diagram in pixels.
+        height(int): The height of the diagram in pixels.
+        background: The background color of the image.
+    """
+    canvas = RasterBackend(width, height, background=background)
+    _draw_onto(canvas, components)
+    canvas.write_png(path_or_file)
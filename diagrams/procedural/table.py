@@ -0,0 +1,585 @@
+"""
+diagrams.procedural.table
+=========================
+
+This module provides functions to create and draw large numbers of diagram
+components stored in a columnar component table.
+
+A component table is a ``dict`` holding one typed ``numpy`` array per
+component attribute. Colors and texts are stored in side tables and
+referenced by their index. For arrows, the ``"position"`` and
+``"dimensions"`` columns hold the start and end positions of the arrow,
+respectively. Components are drawn in the order in which they were added,
+with each run of consecutive components of the same type drawn together.
+"""
+from diagrams._lazy import lazy_import
+from diagrams.geometry import arrow_heads
+from diagrams.procedural.components import ComponentType
+from diagrams.procedural.diagram import get_canvas
+
+np = lazy_import("numpy")
+
+COLUMNS = {
+    "type": ("int8", ()),
+    "position": ("float64", (2,)),
+    "dimensions": ("float64", (2,)),
+    "color": ("int32", ()),
+    "text_color": ("int32", ()),
+    "text": ("int32", ()),
+    "head_size": ("float64", ()),
+}
+
+
+def create_component_table(capacity=1024):
+    """
+    Create an empty component table.
+
+    Args:
+        capacity(``int``): The number of components for which to allocate
+            memory initially. The table grows automatically when more
+            components are added.
+
+    Return:
+        ``dict`` representing the component table. The number of components
+        in the table is stored under the key ``"size"``, the color and text
+        side tables under the keys ``"colors"`` and ``"texts"``.
+    """
+    table = {"size": 0, "colors": [], "color_indices": {}, "texts": []}
+    for name, (dtype, shape) in COLUMNS.items():
+        table[name] = np.zeros((capacity,) + shape, dtype=dtype)
+    return table
+
+
+def _reserve(table, n):
+    """
+    Grow columns of table so that n more components fit into it.
+
+    Return:
+        ``slice`` selecting the rows for the new components.
+    """
+    start = table["size"]
+    end = start + n
+    capacity = table["type"].shape[0]
+    if end > capacity:
+        capacity = max(end, 2 * capacity)
+        for name in COLUMNS:
+            column = table[name]
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:start] = column[:start]
+            table[name] = grown
+    table["size"] = end
+    return slice(start, end)
+
+
+def _unique_colors(colors, n):
+    """
+    Validate colors and find the unique colors among them.
+
+    Args:
+        colors: A single color or a sequence of n colors given as
+            ``tkinter``-compatible color strings, or an array of shape
+            ``(n, 3)`` and type ``uint8`` holding RGB components, such as
+            a ``ColorArray``.
+        n: The number of components.
+
+    Return:
+        Tuple ``(unique, inverse)`` holding the list of unique colors and
+        an array of shape ``(1,)`` or ``(n,)`` holding the index of each
+        color in it.
+    """
+    if isinstance(colors, str):
+        colors = [colors]
+    rgb = np.asarray(colors)
+    if rgb.dtype == np.uint8 and rgb.ndim == 2 and rgb.shape[1] == 3:
+        # RGB colors are deduplicated as packed integers, so that only the
+        # unique colors are converted to color codes.
+        rgb = rgb.astype(np.int32)
+        packed = (rgb[:, 0] << 16) | (rgb[:, 1] << 8) | rgb[:, 2]
+        unique, inverse = np.unique(packed, return_inverse=True)
+        unique = [f"#{color:06X}" for color in unique.tolist()]
+    else:
+        unique, inverse = np.unique(
+            np.asarray(colors, dtype=object), return_inverse=True
+        )
+    inverse = inverse.reshape(-1)
+    if inverse.shape[0] not in [1, n]:
+        raise ValueError(
+            "The number of colors must be one or match the number of components."
+        )
+    return unique, inverse
+
+
+def _color_indices(table, colors):
+    """
+    Look up or insert colors into color table of component table.
+
+    Args:
+        table: The component table.
+        colors: Tuple ``(unique, inverse)`` returned by ``_unique_colors``.
+
+    Return:
+        Array of shape ``(1,)`` or ``(n,)`` holding the color indices.
+    """
+    unique, inverse = colors
+    indices = table["color_indices"]
+    lookup = np.empty(len(unique), dtype=np.int32)
+    for i, color in enumerate(unique):
+        index = indices.get(color)
+        if index is None:
+            index = len(table["colors"])
+            table["colors"].append(color)
+            indices[color] = index
+        lookup[i] = index
+    return lookup[inverse]
+
+
+def _as_texts(texts, n):
+    """Convert texts to list and check that there is one per component."""
+    texts = list(texts)
+    if len(texts) != n:
+        raise ValueError("The number of texts must match the number of components.")
+    return texts
+
+
+def _text_indices(table, texts):
+    """Append texts to text table and return their indices."""
+    start = len(table["texts"])
+    table["texts"].extend(texts)
+    return np.arange(start, len(table["texts"]), dtype=np.int32)
+
+
+def _as_coordinates(coordinates):
+    """Convert coordinates to array of shape ``(n, 2)``."""
+    return np.asarray(coordinates, dtype=np.float64).reshape(-1, 2)
+
+
+def _check_dimensions(position, dimensions):
+    """Check that there are one or n dimensions for n positions."""
+    if dimensions.shape[0] not in [1, position.shape[0]]:
+        raise ValueError(
+            "The number of dimensions must be one or match the number of positions."
+        )
+
+
+def _add_components(table, component_type, position, dimensions):
+    """
+    Add rows for components with given geometry to the table. All other
+    inputs must be validated beforehand, so that invalid inputs leave the
+    table unchanged.
+    """
+    rows = _reserve(table, position.shape[0])
+    table["type"][rows] = component_type.value
+    table["position"][rows] = position
+    table["dimensions"][rows] = dimensions
+    table["text"][rows] = -1
+    return rows
+
+
+def create_rectangles(table, positions, dimensions, colors="red"):
+    """
+    Add filled rectangles to a component table.
+
+    Args:
+        table(``dict``): The component table to add the rectangles to.
+        positions: Array of shape ``(n, 2)`` holding the positions of the
+            upper left corners of the rectangles.
+        dimensions: Array of shape ``(n, 2)`` or ``(2,)`` holding the
+            horizontal and vertical extent of the rectangles.
+        colors: A single color or a sequence of n colors given as
+            ``tkinter``-compatible color strings or as an RGB array of shape
+            ``(n, 3)``, such as a ``ColorArray``.
+
+    Return:
+        Array holding the indices of the added components in the table.
+    """
+    positions = _as_coordinates(positions)
+    dimensions = _as_coordinates(dimensions)
+    _check_dimensions(positions, dimensions)
+    colors = _unique_colors(colors, positions.shape[0])
+    rows = _add_components(table, ComponentType.RECTANGLE, positions, dimensions)
+    table["color"][rows] = _color_indices(table, colors)
+    return np.arange(rows.start, rows.stop)
+
+
+def create_texts(table, positions, texts, colors="red"):
+    """
+    Add text components to a component table.
+
+    Args:
+        table(``dict``): The component table to add the texts to.
+        positions: Array of shape ``(n, 2)`` holding the positions around
+            which to center the texts.
+        texts: Sequence of n strings.
+        colors: A single color or a sequence of n colors given as
+            ``tkinter``-compatible color strings or as an RGB array of shape
+            ``(n, 3)``, such as a ``ColorArray``.
+
+    Return:
+        Array holding the indices of the added components in the table.
+    """
+    positions = _as_coordinates(positions)
+    colors = _unique_colors(colors, positions.shape[0])
+    texts = _as_texts(texts, positions.shape[0])
+    rows = _add_components(table, ComponentType.TEXT, positions, np.zeros((1, 2)))
+    table["color"][rows] = _color_indices(table, colors)
+    table["text"][rows] = _text_indices(table, texts)
+    return np.arange(rows.start, rows.stop)
+
+
+def create_arrows(table, starts, ends, colors="black", head_sizes=10):
+    """
+    Add arrows to a component table.
+
+    Args:
+        table(``dict``): The component table to add the arrows to.
+        starts: Array of shape ``(n, 2)`` holding the start positions of the
+            arrows.
+        ends: Array of shape ``(n, 2)`` holding the positions of the arrow
+            tips.
+        colors: A single color or a sequence of n colors given as
+            ``tkinter``-compatible color strings or as an RGB array of shape
+            ``(n, 3)``, such as a ``ColorArray``.
+        head_sizes: Size of the arrow heads in pixels as scalar or sequence
+            of n sizes.
+
+    Return:
+        Array holding the indices of the added components in the table.
+    """
+    starts = _as_coordinates(starts)
+    ends = _as_coordinates(ends)
+    n = starts.shape[0]
+    _check_dimensions(starts, ends)
+    colors = _unique_colors(colors, n)
+    head_sizes = np.asarray(head_sizes, dtype=np.float64).reshape(-1)
+    if head_sizes.shape[0] not in [1, n]:
+        raise ValueError(
+            "The number of head sizes must be one or match the number of arrows."
+        )
+    rows = _add_components(table, ComponentType.ARROW, starts, ends)
+    table["color"][rows] = _color_indices(table, colors)
+    table["head_size"][rows] = head_sizes
+    return np.arange(rows.start, rows.stop)
+
+
+def create_rectangular_nodes(
+    table, positions, dimensions, texts, background_colors="red", text_colors="black"
+):
+    """
+    Add rectangular nodes to a component table.
+
+    Args:
+        table(``dict``): The component table to add the nodes to.
+        positions: Array of shape ``(n, 2)`` holding the positions of the
+            upper left corners of the nodes.
+        dimensions: Array of shape ``(n, 2)`` or ``(2,)`` holding the
+            horizontal and vertical extent of the nodes.
+        texts: Sequence of n strings to render inside the nodes.
+        background_colors: A single color or a sequence of n colors for the
+            rectangles given as ``tkinter``-compatible color strings or as
+            an RGB array of shape ``(n, 3)``, such as a ``ColorArray``.
+        text_colors: A single color or a sequence of n colors for the texts
+            given in the same way as the background colors.
+
+    Return:
+        Array holding the indices of the added components in the table.
+    """
+    positions = _as_coordinates(positions)
+    dimensions = _as_coordinates(dimensions)
+    n = positions.shape[0]
+    _check_dimensions(positions, dimensions)
+    background_colors = _unique_colors(background_colors, n)
+    text_colors = _unique_colors(text_colors, n)
+    texts = _as_texts(texts, n)
+    rows = _add_components(table, ComponentType.RECTANGULAR_NODE, positions, dimensions)
+    table["color"][rows] = _color_indices(table, background_colors)
+    table["text_color"][rows] = _color_indices(table, text_colors)
+    table["text"][rows] = _text_indices(table, texts)
+    return np.arange(rows.start, rows.stop)
+
+
+def add_component(table, component):
+    """
+    Add a single component to a component table.
+
+    Args:
+        table(``dict``): The component table to add the component to.
+        component(``dict``): Dictionary representing a diagram component
+            created using a suitable ``create_<component_name>`` function.
+
+    Return:
+        The index of the component in the table.
+    """
+    component_type = component["type"]
+    if component_type == ComponentType.RECTANGLE:
+        indices = create_rectangles(
+            table, component["position"], component["dimensions"], component["color"]
+        )
+    elif component_type == ComponentType.TEXT:
+        indices = create_texts(
+            table, component["position"], [component["text"]], component["color"]
+        )
+    elif component_type == ComponentType.ARROW:
+        indices = create_arrows(
+            table,
+            component["start"],
+            component["end"],
+            component["color"],
+            component["head_size"],
+        )
+    elif component_type == ComponentType.RECTANGULAR_NODE:
+        indices = create_rectangular_nodes(
+            table,
+            component["position"],
+            component["dimensions"],
+            [component["text"]],
+            component["background_color"],
+            component["text_color"],
+        )
+    else:
+        raise ValueError(
+            f"Component type {component_type} is not a known" "component type."
+        )
+    return int(indices[0])
+
+
+def get_component(table, index):
+    """
+    Get a component from a component table.
+
+    Args:
+        table(``dict``): The component table.
+        index(``int``): The index of the component in the table.
+
+    Return:
+        ``dict`` representing the diagram component in the same format as
+        returned by the corresponding ``create_<component_name>`` function.
+    """
+    if not 0 <= index < table["size"]:
+        raise IndexError("Component index out of range.")
+    component_type = ComponentType(int(table["type"][index]))
+    position = tuple(table["position"][index].tolist())
+    dimensions = tuple(table["dimensions"][index].tolist())
+    color = table["colors"][table["color"][index]]
+    if component_type == ComponentType.RECTANGLE:
+        return {
+            "type": component_type,
+            "position": position,
+            "dimensions": dimensions,
+            "color": color,
+        }
+    if component_type == ComponentType.TEXT:
+        return {
+            "type": component_type,
+            "position": position,
+            "text": table["texts"][table["text"][index]],
+            "color": color,
+        }
+    if component_type == ComponentType.ARROW:
+        return {
+            "type": component_type,
+            "start": position,
+            "end": dimensions,
+            "color": color,
+            "head_size": float(table["head_size"][index]),
+        }
+    return {
+        "type": component_type,
+        "position": position,
+        "dimensions": dimensions,
+        "text": table["texts"][table["text"][index]],
+        "background_color": color,
+        "text_color": table["colors"][table["text_color"][index]],
+    }
+
+
+def _draw_rectangles(canvas, table, indices):
+    """Draw rectangles with given indices."""
+    colors = table["colors"]
+    position = table["position"][indices]
+    corners = np.concatenate([position, position + table["dimensions"][indices]], 1)
+    for corners, color in zip(corners.tolist(), table["color"][indices].tolist()):
+        canvas.create_rectangle(*corners, fill=colors[color])
+
+
+def _draw_texts(canvas, table, indices):
+    """Draw texts with given indices."""
+    colors = table["colors"]
+    texts = table["texts"]
+    for (x, y), text, color in zip(
+        table["position"][indices].tolist(),
+        table["text"][indices].tolist(),
+        table["color"][indices].tolist(),
+    ):
+        canvas.create_text(x, y, text=texts[text], fill=colors[color])
+
+
+def _draw_arrows(canvas, table, indices):
+    """Draw arrows with given indices."""
+    colors = table["colors"]
+    start = table["position"][indices]
+    end = table["dimensions"][indices]
+    heads = arrow_heads(
+        start[:, 0],
+        start[:, 1],
+        end[:, 0],
+        end[:, 1],
+        table["head_size"][indices],
+    )
+    lines = np.concatenate([start, end], 1)
+    for line, head, color in zip(
+        lines.tolist(), heads.tolist(), table["color"][indices].tolist()
+    ):
+        color = colors[color]
+        canvas.create_line(*line, fill=color)
+        canvas.create_polygon(head, outline=color, fill=None)
+
+
+def _draw_rectangular_nodes(canvas, table, indices):
+    """Draw rectangular nodes with given indices."""
+    colors = table["colors"]
+    texts = table["texts"]
+    position = table["position"][indices]
+    dimensions = table["dimensions"][indices]
+    corners = np.concatenate([position, position + dimensions], 1)
+    centers = position + dimensions * 0.5
+    for corners, (x, y), text, background_color, text_color in zip(
+        corners.tolist(),
+        centers.tolist(),
+        table["text"][indices].tolist(),
+        table["color"][indices].tolist(),
+        table["text_color"][indices].tolist(),
+    ):
+        canvas.create_rectangle(*corners, fill=colors[background_color])
+        canvas.create_text(x, y, text=texts[text], fill=colors[text_color])
+
+
+_DRAW_FUNCTIONS = {
+    ComponentType.RECTANGLE: _draw_rectangles,
+    ComponentType.TEXT: _draw_texts,
+    ComponentType.ARROW: _draw_arrows,
+    ComponentType.RECTANGULAR_NODE: _draw_rectangular_nodes,
+}
+
+
+def type_runs(types):
+    """
+    Split a column of component types into runs of consecutive components
+    of the same type.
+
+    Args:
+        types: Array holding the values of the component types.
+
+    Return:
+        ``list`` of tuples ``(component_type, start, end)`` holding the
+        ``ComponentType`` of each run and the start and end of its slice of
+        the column.
+    """
+    types = np.asarray(types)
+    starts = (np.flatnonzero(np.diff(types)) + 1).tolist()
+    starts = [0] + starts if types.size else []
+    ends = starts[1:] + [types.size]
+    return [
+        (ComponentType(int(types[start])), start, end)
+        for start, end in zip(starts, ends)
+    ]
+
+
+def bounding_boxes(table, indices):
+    """
+    Compute the bounding boxes of components in a component table.
+
+    Args:
+        table(``dict``): The component table.
+        indices: Array holding the indices of the components.
+
+    Return:
+        Array of shape ``(n, 4)`` holding the upper left and lower right
+        corner ``x_0, y_0, x_1, y_1`` of the bounding box of each component.
+    """
+    types = table["type"][indices]
+    position = table["position"][indices]
+    other = table["dimensions"][indices]
+    arrows = types == ComponentType.ARROW.value
+    texts = types == ComponentType.TEXT.value
+    corner = position + other
+    corner[arrows] = other[arrows]
+    corner[texts] = position[texts]
+    padding = np.where(arrows, table["head_size"][indices], 0.0)[:, np.newaxis]
+    return np.concatenate(
+        [
+            np.minimum(position, corner) - padding,
+            np.maximum(position, corner) + padding,
+        ],
+        1,
+    )
+
+
+def rows_in_region(table, x_0, y_0, x_1, y_1):
+    """
+    Find the components in a component table that intersect a region.
+
+    If the table holds the bounding boxes of blocks of consecutive rows
+    under the keys ``"block_size"`` and ``"block_bounds"``, as is the case
+    for tables opened using ``diagrams.binary.open_table``, only the blocks
+    intersecting the region are searched.
+
+    Args:
+        table(``dict``): The component table.
+        x_0: The left boundary of the region.
+        y_0: The upper boundary of the region.
+        x_1: The right boundary of the region.
+        y_1: The lower boundary of the region.
+
+    Return:
+        Sorted array holding the indices of the components whose bounding
+        boxes intersect the region.
+    """
+    size = table["size"]
+    block_bounds = table.get("block_bounds")
+    if block_bounds is None:
+        rows = np.arange(size)
+    else:
+        block_size = table["block_size"]
+        b_x_0, b_y_0, b_x_1, b_y_1 = np.asarray(block_bounds).T
+        blocks = np.flatnonzero(
+            (b_x_0 <= x_1) & (x_0 <= b_x_1) & (b_y_0 <= y_1) & (y_0 <= b_y_1)
+        )
+        rows = np.concatenate(
+            [
+                np.arange(block_size * block, min(block_size * (block + 1), size))
+                for block in blocks.tolist()
+            ]
+            + [np.zeros(0, dtype=np.int64)]
+        )
+    boxes = bounding_boxes(table, rows)
+    inside = (
+        (boxes[:, 0] <= x_1)
+        & (x_0 <= boxes[:, 2])
+        & (boxes[:, 1] <= y_1)
+        & (y_0 <= boxes[:, 3])
+    )
+    return rows[inside]
+
+
+def draw_all(table, region=None):
+    """
+    Draw all components in a component table on the current canvas.
+
+    Components are drawn in the order of their rows, so that overlapping
+    components are stacked in the order in which they were added. Each run
+    of consecutive rows holding components of the same type is drawn with
+    a single call to the draw function of that type.
+
+    Args:
+        table(``dict``): The component table to draw.
+        region: Optional tuple ``(x_0, y_0, x_1, y_1)``. If given, only the
+            components intersecting this region are drawn.
+    """
+    canvas = get_canvas()
+    if region is None:
+        rows = np.arange(table["size"])
+    else:
+        rows = rows_in_region(table, *region)
+    types = table["type"][rows]
+    for component_type, start, end in type_runs(types):
+        _DRAW_FUNCTIONS[component_type](canvas, table, rows[start:end])
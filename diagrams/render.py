@@ -0,0 +1,224 @@
+"""
+diagrams.render
+===============
+
+Renders many diagram specifications to image files in parallel without
+requiring a display server.
+
+Usage::
+
+    python -m diagrams.render SOURCE [-o OUTPUT_DIR] [-f {png,svg}]
+                              [-w WORKERS] [-c CHUNKSIZE]
+
+``SOURCE`` is either a directory, in which case all ``.json`` files in it
+are rendered, or a manifest file listing the paths of the specifications
+to render, one per line. Relative paths in a manifest are interpreted
+relative to the directory containing it. The format of the specifications
+is described in ``diagrams.specs``.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from diagrams.procedural.diagram import export_png, export_svg
+from diagrams.specs import load_spec
+
+FORMATS = ("png", "svg")
+
+
+def find_specs(source):
+    """
+    Find the diagram specifications to render.
+
+    Args:
+        source: Path of a directory containing the specifications as
+            ``.json`` files or of a manifest file listing them.
+
+    Return:
+        ``list`` of the paths of the specifications.
+    """
+    source = Path(source)
+    if source.is_dir():
+        return sorted(source.glob("*.json"))
+    specs = []
+    with open(source, "r", encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                specs.append(source.parent / line)
+    return specs
+
+
+def render_file(spec_path, output_path, format="png"):
+    """
+    Render a single diagram specification.
+
+    Args:
+        spec_path: Path of the specification to render.
+        output_path: Path of the file to write the rendered diagram to.
+        format(``str``): The output format, i.e. one of ``FORMATS``.
+    """
+    spec = load_spec(spec_path)
+    if format == "png":
+        export_png(output_path, spec["components"], spec["width"], spec["height"])
+    elif format == "svg":
+        export_svg(output_path, spec["components"], spec["width"], spec["height"])
+    else:
+        raise ValueError(f"'{format}' is not a supported output format.")
+
+
+def _output_paths(specs, output_dir, format):
+    """
+    Map specifications to output files that keep the directory structure
+    below the common parent directory of the specifications.
+    """
+    if not specs:
+        return []
+    specs = [spec.resolve() for spec in specs]
+    root = Path(os.path.commonpath([spec.parent for spec in specs]))
+    output_paths = [
+        output_dir / spec.parent.relative_to(root) / (spec.stem + "." + format)
+        for spec in specs
+    ]
+    seen = {}
+    for spec, output_path in zip(specs, output_paths):
+        other = seen.setdefault(output_path, spec)
+        if other is not spec:
+            raise ValueError(
+                f"The specifications '{other}' and '{spec}' would both be "
+                f"rendered to '{output_path}'."
+            )
+    return output_paths
+
+
+def _render_job(job):
+    """
+    Render a specification and catch any errors so that they can be
+    reported without aborting the remaining jobs.
+
+    Return:
+        Tuple ``(spec_path, output_path, seconds, error)`` where ``error`` is
+        ``None`` if rendering succeeded.
+    """
+    spec_path, output_path, format = job
+    start = time.perf_counter()
+    try:
+        render_file(spec_path, output_path, format)
+        error = None
+    except Exception as exception:
+        error = f"{type(exception).__name__}: {exception}"
+    return spec_path, output_path, time.perf_counter() - start, error
+
+
+def render_all(specs, output_dir, format="png", workers=None, chunksize=8):
+    """
+    Render diagram specifications using a pool of worker processes.
+
+    The worker processes are reused for all specifications, so that the
+    interpreter start-up and imports are paid only once per worker.
+    Specifications are sent to the workers in chunks to reduce the
+    communication overhead.
+
+    Args:
+        specs: Iterable of the paths of the specifications to render.
+        output_dir: The directory to write the rendered diagrams to. Each
+            output file is named after its specification and placed in the
+            same subdirectory relative to the common parent directory of
+            all specifications.
+        format(``str``): The output format, i.e. one of ``FORMATS``.
+        workers(``int``): The number of worker processes. Defaults to the
+            number of CPUs. If 1, the specifications are rendered in the
+            calling process.
+        chunksize(``int``): The number of specifications sent to a worker
+            at a time.
+
+    Return:
+        Iterator over tuples ``(spec_path, output_path, seconds, error)`` in
+        the order of the specifications, where ``error`` is ``None`` if
+        rendering succeeded and a description of the error otherwise. A
+        ``ValueError`` is raised before any specification is rendered if
+        two of them would be rendered to the same output file.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"'{format}' is not a supported output format.")
+    specs = [Path(spec) for spec in specs]
+    output_dir = Path(output_dir)
+    output_paths = _output_paths(specs, output_dir, format)
+    for output_path in set(output_paths):
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    jobs = [
+        (spec, output_path, format) for spec, output_path in zip(specs, output_paths)
+    ]
+    if workers == 1:
+        yield from map(_render_job, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_render_job, jobs, chunksize=chunksize)
+
+
+def main(args=None):
+    """
+    Command line entry point.
+
+    Args:
+        args: List of command line arguments. Defaults to ``sys.argv``.
+
+    Return:
+        The exit status, which is 1 if any diagram failed to render.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m diagrams.render",
+        description="Render diagram specifications to image files.",
+    )
+    parser.add_argument(
+        "source", help="Directory containing specifications or manifest file."
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default=".", help="Directory to write output to."
+    )
+    parser.add_argument("-f", "--format", choices=FORMATS, default="png")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunksize",
+        type=int,
+        default=8,
+        help="Number of specifications sent to a worker at a time.",
+    )
+    args = parser.parse_args(args)
+
+    specs = find_specs(args.source)
+    failures = 0
+    start = time.perf_counter()
+    results = render_all(
+        specs, args.output_dir, args.format, args.workers, args.chunksize
+    )
+    try:
+        for spec_path, output_path, seconds, error in results:
+            if error is None:
+                print(f"{spec_path} -> {output_path}: {1e3 * seconds:.1f} ms")
+            else:
+                failures += 1
+                print(f"{spec_path}: FAILED ({error})", file=sys.stderr)
+    except ValueError as error:
+        print(error, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    print(
+        f"Rendered {len(specs) - failures} of {len(specs)} diagrams "
+        f"in {elapsed:.2f} s."
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+"""
+diagrams.routing
+================
+
+Provides orthogonal routing of connectors around rectangular obstacles,
+which is shared by the object oriented and the procedural API.
+
+Routes are found using A* on a sparse orthogonal visibility graph, which
+is built for each route from the obstacles in a region around its end
+points. The vertices of the graph are the intersections of the lines
+through the end points of the route and through the sides of the
+obstacles, which are enlarged by a margin. Its edges connect neighboring
+vertices unless they pass through an obstacle. The search minimizes the
+length of the route plus a penalty for each bend. If no route is found in
+the region, the region is enlarged up to a limit depending on the distance
+between the end points. If there is still no route, for example because
+the gaps between obstacles are narrower than twice the margin, the search
+is repeated with half the margin and finally without margin.
+
+The ``Router`` class keeps the obstacles in a spatial index, which is
+shared by all connectors, and keeps track of the segments of the routes of
+the connectors in a second one. When an obstacle is added, moved or
+removed, only the connectors with segments in its old or new region are
+marked for rerouting.
+"""
+import heapq
+
+from diagrams._lazy import lazy_import
+from diagrams.spatial import SpatialIndex
+
+np = lazy_import("numpy")
+
+# The directions in which routes can leave their start and arrive at their
+# end and the corresponding unit vectors.
+DIRECTIONS = {"right": (1, 0), "left": (-1, 0), "down": (0, 1), "up": (0, -1)}
+_DIRECTIONS = list(DIRECTIONS)
+_VECTORS = list(DIRECTIONS.values())
+_OPPOSITE = {0: 1, 1: 0, 2: 3, 3: 2}
+
+# Points closer than this to the boundary of an obstacle aren't considered
+# inside of it, so that rounding errors don't block routes along obstacles.
+_EPSILON = 1e-6
+
+
+def _simplify(points):
+    """Remove repeated points and points in the middle of straight lines."""
+    result = []
+    for point in points:
+        if result and result[-1] == point:
+            continue
+        if len(result) >= 2:
+            (x_0, y_0), (x_1, y_1) = result[-2:]
+            if (x_0 == x_1 == point[0]) or (y_0 == y_1 == point[1]):
+                result[-1] = point
+                continue
+        result.append(point)
+    return result
+
+
+def _minimum_bends(direction, end_direction, delta_x, delta_y):
+    """
+    Lower bound for the number of bends of a route that currently moves in
+    one direction and arrives in another at an end at ``(delta_x,
+    delta_y)`` relative to the current position. Arriving perpendicular to
+    the direction at the end counts as a bend.
+    """
+    if not delta_x and not delta_y:
+        return 0
+    u_x, u_y = _VECTORS[direction]
+    ahead = delta_x * u_x + delta_y * u_y
+    aside = delta_x * u_y - delta_y * u_x
+    if direction == end_direction:
+        if ahead > 0 and not aside:
+            return 0
+        return 2 if ahead >= 0 else 4
+    if direction == _OPPOSITE[end_direction]:
+        return 2 if aside else 4
+    v_x, v_y = _VECTORS[end_direction]
+    if ahead >= 0 and delta_x * v_x + delta_y * v_y >= 0:
+        return 1
+    return 3
+
+
+def _grid_search(boxes, region, start, end, start_direction, end_direction, bend):
+    """
+    Find shortest route on the visibility graph of obstacles in a region.
+
+    Args:
+        boxes: Array of shape ``(k, 4)`` holding the obstacles.
+        region: Tuple ``(x_0, y_0, x_1, y_1)`` holding the region in which
+            to search.
+        start: The point at which the route starts.
+        end: The point at which the route ends.
+        start_direction(``int``): The index of the direction in which the
+            route leaves the start.
+        end_direction(``int``): The index of the direction in which the
+            route arrives at the end.
+        bend(``float``): The penalty for each bend.
+
+    Return:
+        List of the corners of the route including start and end or
+        ``None`` if there is no route in the region.
+    """
+    x_0, y_0, x_1, y_1 = region
+    xs = np.concatenate([[x_0, x_1, start[0], end[0]], boxes[:, 0], boxes[:, 2]])
+    ys = np.concatenate([[y_0, y_1, start[1], end[1]], boxes[:, 1], boxes[:, 3]])
+    xs = np.unique(xs[(xs >= x_0) & (xs <= x_1)])
+    ys = np.unique(ys[(ys >= y_0) & (ys <= y_1)])
+    n_x, n_y = len(xs), len(ys)
+
+    # An edge is blocked if its center lies inside of an obstacle.
+    horizontal = np.ones((max(n_x - 1, 0), n_y), dtype=bool)
+    vertical = np.ones((n_x, max(n_y - 1, 0)), dtype=bool)
+    center_x = 0.5 * (xs[1:] + xs[:-1])
+    center_y = 0.5 * (ys[1:] + ys[:-1])
+    lower = boxes[:, :2] + _EPSILON
+    upper = boxes[:, 2:] - _EPSILON
+    ranges = np.stack(
+        [
+            np.searchsorted(center_x, lower[:, 0], "right"),
+            np.searchsorted(center_x, upper[:, 0], "left"),
+            np.searchsorted(ys, lower[:, 1], "right"),
+            np.searchsorted(ys, upper[:, 1], "left"),
+            np.searchsorted(xs, lower[:, 0], "right"),
+            np.searchsorted(xs, upper[:, 0], "left"),
+            np.searchsorted(center_y, lower[:, 1], "right"),
+            np.searchsorted(center_y, upper[:, 1], "left"),
+        ],
+        axis=1,
+    )
+    for h_0, h_1, r_0, r_1, v_0, v_1, c_0, c_1 in ranges.tolist():
+        horizontal[h_0:h_1, r_0:r_1] = False
+        vertical[v_0:v_1, c_0:c_1] = False
+    horizontal = horizontal.ravel().tolist()
+    vertical = vertical.ravel().tolist()
+    xs = xs.tolist()
+    ys = ys.tolist()
+
+    start_i, start_j = xs.index(start[0]), ys.index(start[1])
+    end_i, end_j = xs.index(end[0]), ys.index(end[1])
+    end_x, end_y = xs[end_i], ys[end_j]
+    opposite_end = _OPPOSITE[end_direction]
+
+    # The queue is ordered by the estimated total cost and, among equal
+    # estimates, by the largest cost so far, so that the search follows one
+    # of many equally good routes instead of expanding all of them.
+    state = (start_i, start_j, start_direction)
+    costs = {state: 0.0}
+    parents = {state: None}
+    queue = [(0.0, 0.0, state)]
+    while queue:
+        _, cost, state = heapq.heappop(queue)
+        cost = -cost
+        i, j, direction = state
+        if cost > costs[state]:
+            continue
+        if i == end_i and j == end_j:
+            break
+        for new_direction in range(4):
+            if new_direction == _OPPOSITE[direction]:
+                continue
+            if new_direction == 0:
+                if i + 1 >= n_x or not horizontal[i * n_y + j]:
+                    continue
+                new_i, new_j, length = i + 1, j, xs[i + 1] - xs[i]
+            elif new_direction == 1:
+                if i == 0 or not horizontal[(i - 1) * n_y + j]:
+                    continue
+                new_i, new_j, length = i - 1, j, xs[i] - xs[i - 1]
+            elif new_direction == 2:
+                if j + 1 >= n_y or not vertical[i * (n_y - 1) + j]:
+                    continue
+                new_i, new_j, length = i, j + 1, ys[j + 1] - ys[j]
+            else:
+                if j == 0 or not vertical[i * (n_y - 1) + j - 1]:
+                    continue
+                new_i, new_j, length = i, j - 1, ys[j] - ys[j - 1]
+            new_cost = cost + length
+            if new_direction != direction:
+                new_cost += bend
+            delta_x = end_x - xs[new_i]
+            delta_y = end_y - ys[new_j]
+            if not delta_x and not delta_y and new_direction != end_direction:
+                # Routes can't turn back at the end.
+                if new_direction == opposite_end:
+                    continue
+                new_cost += bend
+            new_state = (new_i, new_j, new_direction)
+            if new_cost < costs.get(new_state, float("inf")):
+                costs[new_state] = new_cost
+                parents[new_state] = state
+                bends = _minimum_bends(new_direction, end_direction, delta_x, delta_y)
+                estimate = new_cost + abs(delta_x) + abs(delta_y) + bend * bends
+                heapq.heappush(queue, (estimate, -new_cost, new_state))
+    else:
+        return None
+
+    points = []
+    while state is not None:
+        points.append((xs[state[0]], ys[state[1]]))
+        state = parents[state]
+    return points[::-1]
+
+
+class Router:
+    """
+    Routes orthogonal connectors around rectangular obstacles.
+
+    The router holds the obstacles and the routes of the connectors
+    sharing them. Obstacles and connectors can be any hashable objects.
+    When obstacles change, the connectors whose routes may be affected are
+    marked as stale and can be retrieved using ``pop_stale`` to reroute
+    them.
+
+    Attributes:
+        margin(``float``): The distance between routes and obstacles.
+            Routes leave and enter their end points straight for this
+            distance. Where obstacles are too close to each other, routes
+            pass between them with half or no margin.
+        bend_penalty(``float``): The length by which a route with one
+            bend less may be longer.
+    """
+
+    def __init__(self, margin=10.0, bend_penalty=20.0):
+        """
+        Create router without obstacles.
+
+        Args:
+            margin(``float``): The minimum distance between routes and
+                obstacles.
+            bend_penalty(``float``): The penalty for each bend of a route.
+        """
+        self.margin = float(margin)
+        self.bend_penalty = float(bend_penalty)
+        self._obstacles = SpatialIndex()
+        self._segments = SpatialIndex()
+        self._routes = {}
+        self._stale = {}
+
+    def __contains__(self, item):
+        """Whether the item is an obstacle of the router."""
+        return item in self._obstacles
+
+    def set_obstacle(self, item, box):
+        """
+        Add obstacle or change its extent.
+
+        Args:
+            item: The obstacle.
+            box: Tuple ``(x_0, y_0, x_1, y_1)`` holding the upper left and
+                lower right corner of the obstacle.
+        """
+        margin = self.margin
+        x_0, y_0, x_1, y_1 = box
+        box = (x_0 - margin, y_0 - margin, x_1 + margin, y_1 + margin)
+        if item in self._obstacles:
+            old = self._obstacles.bounding_box(item)
+            if old == box:
+                return
+            self._invalidate(old)
+        self._obstacles.update(item, box)
+        self._invalidate(box)
+
+    def remove_obstacle(self, item):
+        """
+        Remove obstacle. Does nothing if the item isn't an obstacle.
+
+        Args:
+            item: The obstacle.
+        """
+        if item in self._obstacles:
+            self._invalidate(self._obstacles.bounding_box(item))
+            self._obstacles.remove(item)
+
+    def set_route(self, connector, points):
+        """
+        Store the route of a connector, so that it is marked as stale when
+        obstacles along it change.
+
+        Args:
+            connector: The connector.
+            points: The corners of the route of the connector.
+        """
+        self.remove_route(connector)
+        points = list(points)
+        segments = self._segments
+        for index, ((x_0, y_0), (x_1, y_1)) in enumerate(zip(points, points[1:])):
+            box = (min(x_0, x_1), min(y_0, y_1), max(x_0, x_1), max(y_0, y_1))
+            segments.insert((connector, index), box)
+        self._routes[connector] = max(len(points) - 1, 0)
+
+    def remove_route(self, connector):
+        """
+        Forget the route of a connector. Does nothing if the connector has
+        no route.
+
+        Args:
+            connector: The connector.
+        """
+        self._stale.pop(connector, None)
+        for index in range(self._routes.pop(connector, 0)):
+            self._segments.remove((connector, index))
+
+    def _invalidate(self, box):
+        """Mark connectors with segments in a region as stale."""
+        for connector, _ in self._segments.query(*box):
+            self._stale[connector] = None
+
+    def pop_stale(self):
+        """
+        Return:
+            List of the connectors that were marked as stale since the last
+            call in the order in which they were marked.
+        """
+        stale = list(self._stale)
+        self._stale.clear()
+        return stale
+
+    def route(self, start, end, start_direction="right", end_direction="right"):
+        """
+        Find orthogonal route around the obstacles.
+
+        Args:
+            start: The point ``(x, y)`` at which the route starts.
+            end: The point ``(x, y)`` at which the route ends.
+            start_direction(``str``): The direction in which the route leaves
+                the start, i.e. one of ``"right"``, ``"left"``, ``"down"`` or
+                ``"up"``.
+            end_direction(``str``): The direction in which the route arrives
+                at the end.
+
+        Return:
+            List of the corners ``(x, y)`` of the route including start and
+            end. If there is no route around the obstacles, a route ignoring
+            them is returned.
+        """
+        try:
+            start_index = _DIRECTIONS.index(start_direction)
+            end_index = _DIRECTIONS.index(end_direction)
+        except ValueError:
+            raise ValueError(f"Directions must be one of {_DIRECTIONS}.")
+        margin = self.margin
+        start = (float(start[0]), float(start[1]))
+        end = (float(end[0]), float(end[1]))
+        for clearance in (margin, 0.5 * margin, 0.0):
+            points = self._route(start, end, start_index, end_index, clearance)
+            if points is not None:
+                return _simplify([start] + points + [end])
+
+        # Route ignoring the obstacles.
+        step_x, step_y = _VECTORS[start_index]
+        first = (start[0] + step_x * margin, start[1] + step_y * margin)
+        step_x, step_y = _VECTORS[end_index]
+        last = (end[0] - step_x * margin, end[1] - step_y * margin)
+        if start_index < 2:
+            middle = 0.5 * (first[0] + last[0])
+            points = [first, (middle, first[1]), (middle, last[1]), last]
+        else:
+            middle = 0.5 * (first[1] + last[1])
+            points = [first, (first[0], middle), (last[0], middle), last]
+        return _simplify([start] + points + [end])
+
+    def _route(self, start, end, start_index, end_index, clearance):
+        """
+        Search route keeping the given distance from the obstacles in
+        regions of increasing size around the end points.
+
+        Return:
+            List of the corners of the route without start and end or
+            ``None`` if no route was found.
+        """
+        step_x, step_y = _VECTORS[start_index]
+        first = (start[0] + step_x * clearance, start[1] + step_y * clearance)
+        step_x, step_y = _VECTORS[end_index]
+        last = (end[0] - step_x * clearance, end[1] - step_y * clearance)
+        shrink = self.margin - clearance
+        shrink = np.array([shrink, shrink, -shrink, -shrink])
+
+        x_0, x_1 = sorted([first[0], last[0]])
+        y_0, y_1 = sorted([first[1], last[1]])
+        # The region is enlarged at most to the distance between the end
+        # points, so that failing searches don't cover the whole diagram.
+        padding = max(4.0 * self.margin, 10.0)
+        limit = max(padding, x_1 - x_0, y_1 - y_0)
+        while True:
+            region = (x_0 - padding, y_0 - padding, x_1 + padding, y_1 + padding)
+            items = self._obstacles.query(*region)
+            boxes = [self._obstacles.bounding_box(item) for item in items]
+            boxes = np.array(boxes, dtype=np.float64).reshape(-1, 4) + shrink
+            points = _grid_search(
+                boxes, region, first, last, start_index, end_index, self.bend_penalty
+            )
+            if points is not None:
+                return points
+            # Stop once the region contains all obstacles with space around
+            # them, so that enlarging it can't help.
+            lower = boxes[:, :2] > region[:2]
+            upper = boxes[:, 2:] < region[2:]
+            if len(items) == len(self._obstacles) and lower.all() and upper.all():
+                return None
+            if padding >= limit:
+                return None
+            padding = min(4.0 * padding, limit)
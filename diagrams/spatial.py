@@ -0,0 +1,232 @@
+"""
+diagrams.spatial
+================
+
+Provides a spatial index to efficiently find items by their location.
+"""
+from math import floor
+
+
+# The ratio of the cell sizes of consecutive levels of the grid.
+LEVEL_FACTOR = 8
+
+
+class SpatialIndex:
+    """
+    A spatial index over axis-aligned bounding boxes.
+
+    The index divides the plane into square cells of fixed size and stores
+    each item in all the cells that its bounding box overlaps. Region and
+    point queries thus only need to look at the items in the cells that
+    they overlap. To keep insertion cheap, items that overlap very many
+    cells are stored in a coarser grid, whose cells are ``LEVEL_FACTOR``
+    times larger, or in an even coarser one, so that each item overlaps
+    only a few cells of the grid it is stored in. Queries look at the
+    overlapped cells of each grid level.
+
+    Bounding boxes are given as tuples ``(x_0, y_0, x_1, y_1)`` with
+    ``x_0 <= x_1`` and ``y_0 <= y_1``. Items must be hashable.
+
+    Attributes:
+        cell_size(``float``): The side length of the cells of the finest
+            grid.
+        max_cells(``int``): Items overlapping more cells than this are
+            stored in a coarser grid.
+    """
+
+    def __init__(self, cell_size=128.0, max_cells=64):
+        """
+        Create empty spatial index.
+
+        Args:
+            cell_size(``float``): The side length of the cells of the finest
+                grid.
+            max_cells(``int``): Items overlapping more cells than this are
+                stored in a coarser grid.
+        """
+        self.cell_size = float(cell_size)
+        self.max_cells = max_cells
+        self._grids = [{}]
+        self._boxes = {}
+        self._levels = {}
+
+    def _cell_range(self, box, level=0):
+        """The ranges of cell indices overlapped by a box in a grid level."""
+        size = self.cell_size * LEVEL_FACTOR ** level
+        x_0, y_0, x_1, y_1 = box
+        return (
+            range(floor(x_0 / size), floor(x_1 / size) + 1),
+            range(floor(y_0 / size), floor(y_1 / size) + 1),
+        )
+
+    def _level(self, box):
+        """The grid level in which a box is stored."""
+        level = 0
+        while True:
+            columns, rows = self._cell_range(box, level)
+            # Once the cells are larger than the box, it overlaps at most
+            # 2 x 2 cells, which also ends the search for small max_cells.
+            if len(columns) * len(rows) <= self.max_cells or (
+                len(columns) <= 2 and len(rows) <= 2
+            ):
+                return level
+            level += 1
+
+    def __len__(self):
+        """The number of items in the index."""
+        return len(self._boxes)
+
+    def __contains__(self, item):
+        """Whether the item is in the index."""
+        return item in self._boxes
+
+    def bounding_box(self, item):
+        """
+        Return:
+            The bounding box with which the item is stored in the index.
+        """
+        return self._boxes[item]
+
+    def bounds(self, box=None):
+        """
+        Compute the smallest box containing the boxes of all items.
+
+        Args:
+            box: Optional additional box to include.
+
+        Return:
+            Tuple ``(x_0, y_0, x_1, y_1)`` or ``None`` if the index is empty
+            and no box is given.
+        """
+        boxes = list(self._boxes.values())
+        if box is not None:
+            boxes.append(tuple(box))
+        if not boxes:
+            return None
+        x_0, y_0, x_1, y_1 = zip(*boxes)
+        return (min(x_0), min(y_0), max(x_1), max(y_1))
+
+    def insert(self, item, box):
+        """
+        Insert item into index.
+
+        Args:
+            item: The item to insert.
+            box: The bounding box of the item.
+        """
+        if item in self._boxes:
+            self.remove(item)
+        box = tuple(box)
+        self._boxes[item] = box
+        level = self._level(box)
+        self._levels[item] = level
+        while len(self._grids) <= level:
+            self._grids.append({})
+        columns, rows = self._cell_range(box, level)
+        cells = self._grids[level]
+        for i in columns:
+            for j in rows:
+                cell = cells.get((i, j))
+                if cell is None:
+                    cells[(i, j)] = {item}
+                else:
+                    cell.add(item)
+
+    def remove(self, item):
+        """
+        Remove item from index.
+
+        Args:
+            item: The item to remove.
+        """
+        box = self._boxes.pop(item)
+        level = self._levels.pop(item)
+        columns, rows = self._cell_range(box, level)
+        cells = self._grids[level]
+        for i in columns:
+            for j in rows:
+                cell = cells[(i, j)]
+                cell.discard(item)
+                if not cell:
+                    del cells[(i, j)]
+
+    def update(self, item, box):
+        """
+        Update the bounding box of an item in the index.
+
+        Args:
+            item: The item to update.
+            box: The new bounding box of the item.
+        """
+        box = tuple(box)
+        old = self._boxes.get(item)
+        if old == box:
+            return
+        if old is not None:
+            # While the item overlaps the same cells of its grid level, it
+            # can stay there even if it would now fit into a finer grid.
+            level = self._levels[item]
+            if self._cell_range(old, level) == self._cell_range(box, level):
+                self._boxes[item] = box
+                return
+        self.insert(item, box)
+
+    def query(self, x_0, y_0, x_1, y_1):
+        """
+        Find items whose bounding boxes intersect a rectangular region.
+
+        Args:
+            x_0: The left boundary of the region.
+            y_0: The upper boundary of the region.
+            x_1: The right boundary of the region.
+            y_1: The lower boundary of the region.
+
+        Return:
+            ``set`` containing the items intersecting the region.
+        """
+        candidates = set()
+        for level, cells in enumerate(self._grids):
+            columns, rows = self._cell_range((x_0, y_0, x_1, y_1), level)
+            if len(columns) * len(rows) <= len(cells):
+                for i in columns:
+                    for j in rows:
+                        cell = cells.get((i, j))
+                        if cell is not None:
+                            candidates.update(cell)
+            else:
+                candidates.update(*cells.values())
+
+        boxes = self._boxes
+        result = set()
+        for item in candidates:
+            b_x_0, b_y_0, b_x_1, b_y_1 = boxes[item]
+            if b_x_0 <= x_1 and x_0 <= b_x_1 and b_y_0 <= y_1 and y_0 <= b_y_1:
+                result.add(item)
+        return result
+
+    def query_point(self, x, y):
+        """
+        Find items whose bounding boxes contain a point.
+
+        Args:
+            x: The horizontal coordinate of the point.
+            y: The vertical coordinate of the point.
+
+        Return:
+            ``set`` containing the items whose bounding boxes contain the
+            point.
+        """
+        candidates = set()
+        size = self.cell_size
+        for cells in self._grids:
+            cell = cells.get((floor(x / size), floor(y / size)))
+            if cell is not None:
+                candidates.update(cell)
+            size *= LEVEL_FACTOR
+        boxes = self._boxes
+        result = set()
+        for item in candidates:
+            x_0, y_0, x_1, y_1 = boxes[item]
+            if x_0 <= x <= x_1 and y_0 <= y <= y_1:
+                result.add(item)
+        return result
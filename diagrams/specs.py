@@ -0,0 +1,166 @@
+"""
+diagrams.specs
+==============
+
+Provides functions to create diagram components from JSON-compatible
+records, such as diagram specifications stored in files.
+
+A record is a ``dict`` holding the arguments of the corresponding
+``create_*`` function of the procedural API together with a ``type`` field,
+which holds the name or the value of the ``ComponentType`` of the
+component. A diagram specification is a ``dict`` holding the ``width`` and
+``height`` of the diagram and a list of records in ``components``.
+"""
+import json
+
+from diagrams.backends.raster import NAMED_COLORS
+from diagrams.object_oriented.color import Color
+from diagrams.object_oriented.components import (
+    Arrow,
+    Rectangle,
+    RectangularNode,
+    Text,
+)
+from diagrams.procedural.components import (
+    ComponentType,
+    create_arrow,
+    create_rectangle,
+    create_rectangular_node,
+    create_text,
+)
+
+_CONSTRUCTORS = {
+    ComponentType.RECTANGLE: create_rectangle,
+    ComponentType.TEXT: create_text,
+    ComponentType.ARROW: create_arrow,
+    ComponentType.RECTANGULAR_NODE: create_rectangular_node,
+}
+
+# Record fields holding coordinates, which are decoded from JSON as lists.
+_COORDINATE_FIELDS = ("position", "dimensions", "start", "end")
+
+
+def component_type(value):
+    """
+    Get component type from its representation in a record.
+
+    Args:
+        value: The ``ComponentType``, its name in any case or its integer
+            value.
+
+    Return:
+        The ``ComponentType``.
+    """
+    if isinstance(value, ComponentType):
+        return value
+    try:
+        if isinstance(value, str):
+            return ComponentType[value.upper()]
+        return ComponentType(value)
+    except (KeyError, ValueError):
+        raise ValueError(f"'{value}' is not a known component type.")
+
+
+def component_from_record(record):
+    """
+    Create component of the procedural API from a record.
+
+    Args:
+        record(``dict``): The record holding the component type and the
+            arguments of the corresponding ``create_*`` function.
+
+    Return:
+        ``dict`` representing the diagram component.
+    """
+    arguments = dict(record)
+    try:
+        kind = component_type(arguments.pop("type"))
+    except KeyError:
+        raise ValueError("Component record is missing the 'type' field.")
+    for field in _COORDINATE_FIELDS:
+        if field in arguments:
+            arguments[field] = tuple(arguments[field])
+    try:
+        return _CONSTRUCTORS[kind](**arguments)
+    except TypeError as error:
+        raise ValueError(f"Invalid record for component {kind.name}: {error}")
+
+
+def _color(value):
+    """Convert color given as HEX string or color name to ``Color``."""
+    if isinstance(value, Color):
+        return value
+    rgb = NAMED_COLORS.get(str(value).lower())
+    if rgb is not None:
+        return Color.from_rgb(*rgb)
+    return Color.from_code(value)
+
+
+def diagram_component_from_record(record):
+    """
+    Create component of the object oriented API from a record.
+
+    The record holds the same fields as for ``component_from_record``, so
+    that the same data can be loaded using either API.
+
+    Args:
+        record(``dict``): The record holding the component type and the
+            arguments of the corresponding ``create_*`` function.
+
+    Return:
+        The ``DiagramComponent`` described by the record.
+    """
+    component = component_from_record(record)
+    kind = component["type"]
+    if kind == ComponentType.RECTANGLE:
+        return Rectangle(
+            component["position"],
+            component["dimensions"],
+            color=_color(component["color"]),
+        )
+    if kind == ComponentType.TEXT:
+        return Text(
+            component["text"], component["position"], color=_color(component["color"])
+        )
+    if kind == ComponentType.ARROW:
+        return Arrow(
+            component["start"],
+            component["end"],
+            color=_color(component["color"]),
+            head_size=component["head_size"],
+        )
+    node = RectangularNode(
+        component["position"],
+        component["dimensions"],
+        component["text"],
+        color=_color(component["background_color"]),
+    )
+    node.text.color = _color(component["text_color"])
+    return node
+
+
+def load_spec(path):
+    """
+    Load diagram specification from a JSON file.
+
+    Args:
+        path: Path of the JSON file.
+
+    Return:
+        ``dict`` holding the ``width`` and ``height`` of the diagram and the
+        list of its ``components`` as dictionaries of the procedural API.
+    """
+    with open(path, "r", encoding="utf-8") as spec_file:
+        spec = json.load(spec_file)
+    try:
+        width = int(spec["width"])
+        height = int(spec["height"])
+    except KeyError as error:
+        raise ValueError(f"Diagram specification is missing the {error} field.")
+    return {
+        "width": width,
+        "height": height,
+        "components": [
+            component_from_record(record) for record in spec.get("components", [])
+        ],
+    }
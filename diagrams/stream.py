@@ -0,0 +1,141 @@
+"""
+diagrams.stream
+===============
+
+Provides functions to load diagram components incrementally from files in
+the line-delimited JSON (NDJSON) format.
+
+Each line of the file holds a single record in the format described in
+``diagrams.specs``. Records are parsed lazily and handed on in batches of
+fixed size, so that the memory required by the loader does not depend on
+the size of the file.
+"""
+import json
+import os
+from itertools import groupby, islice
+
+from diagrams.procedural import diagram as procedural
+from diagrams.procedural.components import ComponentType
+from diagrams.specs import component_from_record, diagram_component_from_record
+
+
+def read_records(path_or_file):
+    """
+    Parse records from an NDJSON file one at a time.
+
+    Empty lines are skipped.
+
+    Args:
+        path_or_file: Path of the file to read or file object opened in text
+            mode.
+
+    Return:
+        Generator yielding the records as dictionaries.
+    """
+    if isinstance(path_or_file, (str, os.PathLike)):
+        with open(path_or_file, "r", encoding="utf-8") as source:
+            yield from read_records(source)
+        return
+    for number, line in enumerate(path_or_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            raise ValueError(f"Invalid record on line {number}: {error}")
+
+
+def batches(iterable, batch_size):
+    """
+    Split an iterable into lists of a given maximum size.
+
+    Args:
+        iterable: The iterable to split.
+        batch_size(``int``): The maximum number of elements per batch.
+
+    Return:
+        Generator yielding the batches as lists.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _flush(canvas):
+    """Flush canvas if the backend buffers its output."""
+    flush = getattr(canvas, "flush", None)
+    if callable(flush):
+        flush()
+
+
+def stream_into_diagram(diagram, path_or_file, batch_size=1024, back_pressure=None):
+    """
+    Add components read from an NDJSON file to a diagram.
+
+    If the diagram has been drawn in retained mode, the components of each
+    batch are drawn by updating the diagram after the batch was added.
+
+    Args:
+        diagram(Diagram): The diagram to add the components to.
+        path_or_file: Path of the file to read or file object opened in text
+            mode.
+        batch_size(``int``): The number of components added per batch.
+        back_pressure: Optional callable, which is called with the number of
+            components added so far after each batch. Reading continues when
+            it returns, so it can be used to throttle the loader.
+
+    Return:
+        The number of components added to the diagram.
+    """
+    count = 0
+    for batch in batches(read_records(path_or_file), batch_size):
+        for record in batch:
+            diagram.add(diagram_component_from_record(record))
+        count += len(batch)
+        if diagram.canvas is not None:
+            diagram.update()
+            _flush(diagram.canvas)
+        if back_pressure is not None:
+            back_pressure(count)
+    return count
+
+
+def stream_draw(path_or_file, batch_size=1024, back_pressure=None):
+    """
+    Draw components read from an NDJSON file on the current canvas of the
+    procedural API.
+
+    The components are drawn in batches. Consecutive arrows in a batch are
+    drawn using ``draw_arrows``. If the canvas has a ``flush`` method, it
+    is called after each batch, so that streaming backends write their
+    output incrementally.
+
+    Args:
+        path_or_file: Path of the file to read or file object opened in text
+            mode.
+        batch_size(``int``): The number of components drawn per batch.
+        back_pressure: Optional callable, which is called with the number of
+            components drawn so far after each batch. Reading continues when
+            it returns, so it can be used to throttle the loader.
+
+    Return:
+        The number of components drawn.
+    """
+    count = 0
+    for batch in batches(read_records(path_or_file), batch_size):
+        components = [component_from_record(record) for record in batch]
+        for component_type, group in groupby(components, lambda c: c["type"]):
+            if component_type == ComponentType.ARROW:
+                procedural.draw_arrows(group)
+            else:
+                for component in group:
+                    procedural.draw(component)
+        count += len(batch)
+        _flush(procedural.get_canvas())
+        if back_pressure is not None:
+            back_pressure(count)
+    return count
@@ -0,0 +1,37 @@
+from diagrams.object_oriented import (
+    Arrow,
+    Color,
+    Diagram,
+    RectangularNode,
+    layered_layout,
+)
+
+#
+# Create nodes and the arrows connecting them. The positions of the nodes
+# don't matter, since they are computed by the layout.
+#
+
+names = ["parse", "check", "optimize", "lower", "emit", "link"]
+nodes = {name: RectangularNode((0, 0), (100, 50), name, Color.blue()) for name in names}
+arrows = [
+    Arrow.connect(nodes[source], nodes[target])
+    for source, target in [
+        ("parse", "check"),
+        ("check", "optimize"),
+        ("check", "lower"),
+        ("optimize", "lower"),
+        ("lower", "emit"),
+        ("emit", "link"),
+        ("parse", "link"),
+    ]
+]
+
+#
+# Arrange nodes in layers and add them to a diagram of matching size.
+#
+
+size = layered_layout(nodes.values(), arrows, origin=(20, 20))
+diagram = Diagram(size.x + 40, size.y + 40)
+for component in list(nodes.values()) + arrows:
+    diagram.add(component)
+diagram.draw()
@@ -0,0 +1,108 @@
+"""
+Tests for the diagrams.backends.raster module.
+"""
+import io
+import struct
+import zlib
+
+import numpy as np
+
+from diagrams.backends.raster import RasterBackend, encode_png
+from diagrams.object_oriented import Arrow, Diagram, RectangularNode
+from diagrams.procedural import create_arrow, create_rectangle, export_png
+
+
+def decode_png(data):
+    """Decode 8-bit RGB PNG without filters into array."""
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    chunks = {}
+    while position < len(data):
+        (length,) = struct.unpack(">I", data[position : position + 4])
+        tag = data[position + 4 : position + 8]
+        chunks[tag] = data[position + 8 : position + 8 + length]
+        position += length + 12
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    return raw.reshape(height, 3 * width + 1)[:, 1:].reshape(height, width, 3)
+
+
+def test_png_round_trip():
+    """
+    Test that encoded images are decoded to the same pixels.
+    """
+    pixels = np.random.randint(0, 256, size=(7, 5, 3)).astype(np.uint8)
+    assert np.all(decode_png(encode_png(pixels)) == pixels)
+
+
+def test_primitives():
+    """
+    Test rasterization of the drawing primitives.
+    """
+    canvas = RasterBackend(20, 20)
+    canvas.create_rectangle(2, 2, 8, 8, fill="#FF0000")
+    pixels = canvas.pixels
+    assert tuple(pixels[4, 4]) == (255, 0, 0)
+    assert tuple(pixels[2, 4]) == (0, 0, 0)
+    assert tuple(pixels[10, 10]) == (255, 255, 255)
+
+    canvas.create_line(0, 15, 19, 15, fill="blue")
+    canvas.create_polygon(10, 0, 19, 0, 19, 9, fill="#00FF00")
+    pixels = canvas.pixels
+    assert np.all(pixels[15, :, 2] == 255) and np.all(pixels[15, :, 0] == 0)
+    assert tuple(pixels[1, 17]) == (0, 255, 0)
+    assert tuple(pixels[8, 11]) == (255, 255, 255)
+
+    canvas.create_text(10, 10, text="I", fill="black")
+    assert tuple(canvas.pixels[10, 10]) == (0, 0, 0)
+
+
+def test_clipped_lines():
+    """
+    Test that only the parts of lines inside of the image are rasterized.
+    """
+    canvas = RasterBackend(20, 20)
+    canvas.create_line(-1e9, 5, 1e9, 5, fill="blue")
+    canvas.create_line(-1e9, -5, 1e9, -5, fill="blue")
+    canvas.create_line(-10, -10, 30, 30, fill="red")
+    ys, xs, _, _ = canvas._rasterize_segments()
+    assert len(xs) <= 2 * 21
+    # The blue line is drawn over by the red one at (5, 5).
+    assert np.all(np.delete(canvas.pixels[5, :, 2], 5) == 255)
+    assert np.all(canvas.pixels[np.arange(6, 20), np.arange(6, 20), 0] == 255)
+
+
+def test_drawing_order():
+    """
+    Test that queued primitives are drawn in order with other primitives.
+    """
+    canvas = RasterBackend(10, 10)
+    canvas.create_line(0, 5, 10, 5, fill="red")
+    canvas.create_rectangle(0, 0, 10, 10, fill="blue", outline="")
+    canvas.create_polygon(0, 0, 10, 0, 10, 10, 0, 10, fill="green")
+    canvas.create_line(0, 5, 10, 5, fill="black")
+    pixels = canvas.pixels
+    assert tuple(pixels[5, 3]) == (0, 0, 0)
+    assert tuple(pixels[2, 3]) == (0, 255, 0)
+
+
+def test_export_png():
+    """
+    Test rendering of object oriented and procedural diagrams to PNG.
+    """
+    diagram = Diagram(350, 200)
+    node_1 = RectangularNode((50, 50), (100, 100), "Node 1")
+    node_2 = RectangularNode((200, 50), (100, 100), "Node 2")
+    diagram.add(node_1)
+    diagram.add(node_2)
+    diagram.add(Arrow(node_1.right, node_2.left))
+    output = io.BytesIO()
+    diagram.export_png(output)
+    pixels = decode_png(output.getvalue())
+    assert pixels.shape == (200, 350, 3)
+    assert tuple(pixels[100, 175]) == (0, 0, 0)
+
+    components = [create_rectangle((10, 10), (20, 20)), create_arrow((0, 0), (5, 5))]
+    output = io.BytesIO()
+    export_png(output, components, 40, 40)
+    assert decode_png(output.getvalue()).shape == (40, 40, 3)
@@ -0,0 +1,60 @@
+"""
+Tests for the diagrams.backends.recording module.
+"""
+import tkinter
+
+from diagrams.backends.base import Backend
+from diagrams.backends.recording import DisplayListCache, RecordingBackend
+
+
+def test_backend_interface():
+    """
+    Test that tkinter canvases and the recording backend implement the
+    backend interface and that other objects don't.
+    """
+    assert issubclass(tkinter.Canvas, Backend)
+    assert isinstance(RecordingBackend(), Backend)
+    assert not isinstance(object(), Backend)
+
+
+def test_record_and_replay():
+    """
+    Test that drawing commands are recorded and can be replayed onto another
+    backend.
+    """
+    canvas = RecordingBackend()
+    assert canvas.create_rectangle(0, 0, 10, 10, fill="red") == 1
+    assert canvas.create_text(5, 5, text="hi", fill="black") == 2
+    assert canvas.create_line(0, 0, 10, 10, fill="black") == 3
+    assert canvas.create_polygon([0, 0, 10, 0, 5, 5], outline="black", fill=None) == 4
+
+    display_list = canvas.display_list
+    assert len(display_list) == 4
+    assert display_list[0] == ("rectangle", [0, 0, 10, 10], {"fill": "red"})
+    assert display_list[-1][1] == [0, 0, 10, 0, 5, 5]
+
+    copy = RecordingBackend()
+    display_list.replay(copy)
+    assert list(copy.display_list) == list(display_list)
+
+
+def test_display_list_cache():
+    """
+    Test that the cache evicts the least recently used display lists when
+    its size bound is exceeded.
+    """
+    display_lists = []
+    for i in range(3):
+        canvas = RecordingBackend()
+        canvas.create_rectangle(i, i, 10, 10, fill="red")
+        display_lists.append(canvas.display_list)
+    nbytes = display_lists[0].nbytes
+    cache = DisplayListCache(max_bytes=2 * nbytes)
+    cache.put("a", display_lists[0])
+    cache.put("b", display_lists[1])
+    assert cache.get("a") is display_lists[0]
+    cache.put("c", display_lists[2])
+    assert "b" not in cache
+    assert len(cache) == 2 and cache.nbytes == 2 * nbytes
+    assert cache.get("b") is None
+    assert (cache.hits, cache.misses) == (1, 1)
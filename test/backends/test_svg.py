@@ -0,0 +1,60 @@
+"""
+Tests for the diagrams.backends.svg module.
+"""
+import io
+import xml.etree.ElementTree as ElementTree
+
+from diagrams.backends.svg import SVGBackend
+from diagrams.object_oriented import Arrow, Diagram, RectangularNode
+from diagrams.procedural import create_arrow, create_rectangle, export_svg
+
+
+def parse(svg):
+    """Return tags of elements in SVG document."""
+    root = ElementTree.fromstring(svg)
+    return [element.tag.split("}")[1] for element in root]
+
+
+def test_streaming():
+    """
+    Test that elements are written in chunks while they are drawn.
+    """
+    output = io.StringIO()
+    canvas = SVGBackend(output, 100, 100, chunk_size=2)
+    canvas.create_rectangle(0, 0, 10, 10, fill="red")
+    assert '<rect x="0.00"' not in output.getvalue()
+    canvas.create_text(5, 5, text="a < b", fill="black")
+    assert '<rect x="0.00"' in output.getvalue()
+    canvas.close()
+    assert parse(output.getvalue()) == ["rect", "rect", "text"]
+    assert "a &lt; b" in output.getvalue()
+
+
+def test_export_diagram(tmp_path):
+    """
+    Test export of object oriented diagram to SVG file.
+    """
+    diagram = Diagram(350, 200)
+    node_1 = RectangularNode((50, 50), (100, 100), "Node 1")
+    node_2 = RectangularNode((200, 50), (100, 100), "Node 2")
+    diagram.add(node_1)
+    diagram.add(node_2)
+    diagram.add(Arrow(node_1.right, node_2.left))
+    diagram.export_svg(tmp_path / "diagram.svg")
+    svg = (tmp_path / "diagram.svg").read_text()
+    assert parse(svg) == ["rect", "rect", "text", "rect", "text", "polyline", "polygon"]
+
+
+def test_export_procedural():
+    """
+    Test export of components provided by a generator.
+    """
+    components = (
+        create_rectangle((i, i), (10, 10)) if i % 2 else create_arrow((0, 0), (i, i))
+        for i in range(10)
+    )
+    output = io.StringIO()
+    export_svg(output, components, 100, 100)
+    tags = parse(output.getvalue())
+    assert tags.count("rect") == 6
+    assert tags.count("polygon") == 5
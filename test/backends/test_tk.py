@@ -0,0 +1,77 @@
+"""
+Tests for the batched Tk backend.
+
+The tests use the mock of ``tkinter.Canvas`` defined in ``conftest.py``,
+which mimics the creation of canvas items in a Tcl interpreter.
+"""
+import tkinter
+
+import pytest
+
+from diagrams.backends import BatchedTkCanvas
+
+
+def calls(canvas):
+    """The item creation commands received by the mock canvas."""
+    tk = canvas.tk
+    return [
+        tk.splitlist(call) for call in tk.splitlist(tk.eval(f"set calls({canvas._w})"))
+    ]
+
+
+def test_batched_drawing():
+    """
+    Test that commands are only submitted once a batch is full and that the
+    returned item IDs match those assigned by the canvas.
+    """
+    canvas = tkinter.Canvas()
+    batched = BatchedTkCanvas(canvas, batch_size=3)
+    items = [batched.create_rectangle(0, 0, 10, 10, fill="red") for _ in range(5)]
+    # The first item ID is used to probe for the next ID.
+    assert items == [2, 3, 4, 5, 6]
+    assert len(calls(canvas)) == 4
+    assert calls(canvas)[1] == (
+        "rectangle",
+        "0.0",
+        "0.0",
+        "10.0",
+        "10.0",
+        "-fill",
+        "red",
+    )
+
+    # Forwarded methods submit the pending commands and items created after
+    # them are taken into account.
+    batched.delete(2)
+    assert len(calls(canvas)) == 6
+    canvas.tk.eval(f"{canvas._w} create oval 0 0 1 1")
+    assert batched.create_line(0, 0, 1, 1) == 9
+
+
+def test_options():
+    """
+    Test that options are received unchanged by the Tcl interpreter.
+    """
+    canvas = tkinter.Canvas()
+    texts = ["", "a b", "{", "}", "[exit]", "$x", '"', "\\", "a\nb;c", "ä\tö"]
+    with BatchedTkCanvas(canvas) as batched:
+        for text in texts:
+            batched.create_text(1.5, 2, text=text, fill="#FF0000", font=("Mono", 8))
+    for text, call in zip(texts, calls(canvas)[1:]):
+        assert call[:3] == ("text", "1.5", "2.0")
+        options = dict(zip(call[3::2], call[4::2]))
+        assert options["-text"] == text
+        assert options["-fill"] == "#FF0000"
+        assert canvas.tk.splitlist(options["-font"]) == ("Mono", "8")
+
+
+def test_unexpected_items():
+    """
+    Test that items created without going through the backend are detected.
+    """
+    canvas = tkinter.Canvas()
+    batched = BatchedTkCanvas(canvas)
+    batched.create_rectangle(0, 0, 1, 1)
+    canvas.tk.eval(f"{canvas._w} create oval 0 0 1 1")
+    with pytest.raises(RuntimeError):
+        batched.flush()
@@ -1,8 +1,28 @@
 """
 Global fixtures to allow testing tkinter apps.
 """
+import tkinter
+
 import pytest
 
+# A Tcl interpreter without Tk, which doesn't require a display. It is
+# created before ``tkinter.Tk`` is replaced by the mock below.
+TCL = tkinter.Tcl()
+
+# Tcl command mimicking the creation of items by a Tk canvas. It records
+# the arguments of the calls in the global array ``calls`` and returns
+# consecutive item IDs.
+CANVAS_COMMAND = """
+set ::next_id(PATH) 0
+set ::calls(PATH) {}
+proc PATH {command args} {
+    if {$command eq "create"} {
+        lappend ::calls(PATH) $args
+        return [incr ::next_id(PATH)]
+    }
+}
+"""
+
 
 class Tk:
     """
@@ -19,10 +39,18 @@ class Tk:
 class Canvas:
     """
     Mock of the tkinter.Canvas class.
+
+    Item creation commands evaluated in its Tcl interpreter are recorded
+    in the ``calls`` array of the interpreter.
     """
 
-    def __init__(*args, **kwargs):
-        pass
+    count = 0
+
+    def __init__(self, *args, **kwargs):
+        Canvas.count += 1
+        self._w = f".canvas{Canvas.count}"
+        self.tk = TCL.tk
+        self.tk.eval(CANVAS_COMMAND.replace("PATH", self._w))
 
     def create_rectangle(*args, **kwargs):
         pass
@@ -39,9 +67,37 @@ class Canvas:
     def pack(*args, **kwargs):
         pass
 
+    def configure(*args, **kwargs):
+        pass
+
+    def bind(*args, **kwargs):
+        pass
+
+    def delete(*args, **kwargs):
+        pass
+
+    def tag_lower(*args, **kwargs):
+        pass
+
+
+class Scrollbar:
+    """
+    Mock of the tkinter.Scrollbar class.
+    """
+
+    def __init__(*args, **kwargs):
+        pass
+
+    def set(*args, **kwargs):
+        pass
+
+    def pack(*args, **kwargs):
+        pass
+
 
 @pytest.fixture(autouse=True)
 def patch_mainloop(monkeypatch):
     do_nothing = lambda x: None
     monkeypatch.setattr("tkinter.Tk", Tk)
     monkeypatch.setattr("tkinter.Canvas", Canvas)
+    monkeypatch.setattr("tkinter.Scrollbar", Scrollbar)
@@ -1,8 +1,9 @@
 """
 Tests for the diagrams.object_oriented.color module.
 """
+import numpy as np
 import pytest
-from diagrams.object_oriented.color import Color
+from diagrams.object_oriented.color import Color, ColorArray, Colormap
 
 
 def test_color():
@@ -32,3 +33,87 @@ def test_mix():
 
     color_4 = color_1 + color_1
     assert color_4.color_code == color_1.color_code
+
+
+def test_interning():
+    """
+    Test that named colors and colors obtained from color codes are shared.
+    """
+    assert Color.red() is Color.red()
+    assert Color.from_code("#FF0000") is Color.red()
+    assert Color.from_code("#123456") is Color.from_code("#123456")
+    assert Color("#123456") == Color.from_code("#123456")
+
+
+def test_rgb():
+    """
+    Test conversion between RGB components and color codes.
+    """
+    color = Color.from_rgb(0x12, 0x34, 0xAB)
+    assert color.color_code == "#1234AB"
+    assert color.rgb == (0x12, 0x34, 0xAB)
+    assert Color("#ff0000").rgb == (255, 0, 0)
+
+    for code in ["#GGGGGG", "#-12345", "#+fffff", "#ff_fff", "# fffff", "#ffffff\n"]:
+        with pytest.raises(ValueError):
+            Color(code)
+    for components in [(256, 0, 0), (0, -1, 0), (0, 0, 12.5)]:
+        with pytest.raises(ValueError):
+            Color.from_rgb(*components)
+    assert Color.from_rgb(12.0, 0, 0) == Color("#0C0000")
+
+
+def test_color_array():
+    """
+    Test that color arrays convert from and to colors and that adding
+    and blending match the scalar operations.
+    """
+    colors = ColorArray(["#FF0000", Color("#00FF80"), (1, 2, 3)])
+    assert colors.codes == ["#FF0000", "#00FF80", "#010203"]
+    assert colors[1] == Color("#00FF80")
+    assert list(colors[1:]) == [Color("#00FF80"), Color("#010203")]
+    assert ColorArray(colors.array) == colors
+    assert len(ColorArray([])) == 0
+
+    other = Color("#808080")
+    mixed = colors + other
+    assert list(mixed) == [color + other for color in colors]
+    assert other + colors == mixed
+    assert colors + colors == ColorArray(["#FF0000", "#00FFFF", "#020406"])
+
+    assert colors.blend(Color.black(), 0.5).codes == ["#800000", "#008040", "#000102"]
+    assert colors.blend(mixed, [0.0, 1.0, 0.0]) == ColorArray(
+        [colors[0], mixed[1], colors[2]]
+    )
+
+    # Weights outside of [0, 1] are clipped instead of overflowing.
+    assert colors.blend(Color("#FFFFFF"), 2.0) == ColorArray(["#FFFFFF"] * 3)
+    assert colors.blend(Color("#FFFFFF"), [-1.0, 1.5, 0.0]) == ColorArray(
+        [colors[0], Color("#FFFFFF"), colors[2]]
+    )
+    with pytest.raises(ValueError):
+        colors.blend(Color.black(), [0.5, 0.5])
+
+    with pytest.raises(ValueError):
+        ColorArray([(256, 0, 0)])
+    with pytest.raises(ValueError):
+        ColorArray(np.zeros((2, 4)))
+
+
+def test_colormap():
+    """
+    Test that values are mapped to the interpolated colors of the lookup
+    table with clipping and NaN values mapped to the first color.
+    """
+    colormap = Colormap(["#000000", "#FF0000", "#FFFF00"], size=5)
+    assert colormap.lut.shape == (5, 3)
+    colors = colormap([0.0, 0.5, 1.0, 2.0, np.nan], vmax=1.0)
+    assert colors.codes == ["#000000", "#FF0000", "#FFFF00", "#FFFF00", "#000000"]
+    assert colormap([-1.0, 0.25], vmin=0.0, vmax=1.0).codes == ["#000000", "#800000"]
+    assert colormap([3.0, 3.0]).codes == ["#000000", "#000000"]
+    assert Colormap.viridis() is Colormap.viridis()
+
+    with pytest.raises(ValueError):
+        Colormap(["#000000"])
+    with pytest.raises(ValueError, match="size"):
+        Colormap(["#000000", "#FFFFFF"], size=1)
@@ -1,13 +1,22 @@
 """
 Tests for the diagrams.object_oriented.components module.
 """
+import pytest
+
+from diagrams.backends.recording import RecordingBackend
+from diagrams.geometry import ANCHORS
 from diagrams.object_oriented.components import (
     Text,
     Rectangle,
     Arrow,
     RectangularNode,
     Color,
+    anchors,
+    auto_size_nodes,
+    set_colors,
 )
+from diagrams.object_oriented.color import ColorArray
+from diagrams.object_oriented.coordinates import Coordinates
 
 
 def test_text():
@@ -31,8 +40,102 @@ def test_arrow():
     arrow = Arrow((0, 0), (100, 100))
 
 
+def test_arrow_offset():
+    """
+    Test that the head of an arrow drawn with an offset moves with the
+    arrow.
+    """
+    offset_backend = RecordingBackend()
+    Arrow((0, 0), (100, 50)).draw(offset_backend, Coordinates(20, 30))
+    backend = RecordingBackend()
+    Arrow((20, 30), (120, 80)).draw(backend)
+    assert list(offset_backend.display_list) == list(backend.display_list)
+
+
+def test_connected_arrow():
+    """
+    Test that connected arrows follow the components they connect.
+    """
+    node_1 = RectangularNode((0, 0), (100, 50), "Node 1")
+    node_2 = RectangularNode((200, 0), (100, 50), "Node 2")
+    arrow = Arrow.connect(node_1, node_2, target_anchor="top")
+    assert (arrow.source, arrow.target) == (node_1, node_2)
+    assert arrow.position == node_1.right
+    assert arrow.end == node_2.top
+
+    node_2.translate(Coordinates(0, 100))
+    arrow.reconnect()
+    assert arrow.end == node_2.top
+    assert Arrow((0, 0), (1, 1)).source is None
+
+    with pytest.raises(TypeError):
+        Arrow.connect(node_1, Text("a", (0, 0)))
+
+
 def test_node():
     """
     Test creation of node component.
     """
     node = RectangularNode((0, 0), (100, 100), "Node 1")
+
+
+def test_auto_sized_node():
+    """
+    Test that auto-sized nodes fit their text and that batch fitting
+    matches fitting the nodes one by one.
+    """
+    text = Text("Node 1", (50, 20))
+    width, height = text.extent
+    assert text.bounding_box == (
+        50 - width / 2,
+        20 - height / 2,
+        50 + width / 2,
+        20 + height / 2,
+    )
+
+    node = RectangularNode((10, 10), None, "Node 1", auto_size=True, padding=(4, 2))
+    assert node.frame == (10, 10, width + 8, height + 4)
+    assert node.text.position == Coordinates(width / 2 + 4, height / 2 + 2)
+    node = RectangularNode((10, 10), (100, 10), "Node 1", auto_size=True)
+    assert node.frame[2] == 100 and node.frame[3] > 10
+
+    texts = ["a", "Node 1", "A longer label", "two\nlines", "a"]
+    nodes = [RectangularNode((0, 0), (1, 1), text) for text in texts]
+    dimensions = auto_size_nodes(nodes, padding=(3, 3))
+    for text, node, (width, height) in zip(texts, nodes, dimensions.array):
+        fitted = RectangularNode((0, 0), None, text, auto_size=True, padding=(3, 3))
+        assert node.frame == fitted.frame == (0, 0, width, height)
+
+
+def test_anchors():
+    """
+    Test that batch anchors match the anchor properties of the components.
+    """
+    components = [
+        Rectangle((0, 0), (100, 50)),
+        RectangularNode((10.5, 20.25), (30, 70.1), "Node"),
+    ]
+    for anchor in ANCHORS:
+        positions = anchors(components, anchor)
+        assert positions[0] == getattr(components[0], anchor)
+        assert positions[1] == getattr(components[1], anchor)
+
+    with pytest.raises(ValueError):
+        anchors(components, "center_left")
+    with pytest.raises(TypeError):
+        anchors([Arrow((0, 0), (1, 1))], "left")
+
+
+def test_set_colors():
+    """
+    Test setting the colors of many components from a color array or a
+    single color.
+    """
+    nodes = [RectangularNode((0, 0), (10, 10), str(i)) for i in range(3)]
+    colors = ColorArray(["#000000", "#808080", "#FFFFFF"])
+    set_colors(nodes, colors)
+    assert [node.rectangle.color for node in nodes] == list(colors)
+    set_colors(nodes, Color.blue())
+    assert all(node.color == Color.blue() for node in nodes)
+    with pytest.raises(ValueError):
+        set_colors(nodes, colors[:2])
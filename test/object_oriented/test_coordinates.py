@@ -2,7 +2,7 @@
 Test for the diagrams.object_oriented.coordinates module.
 """
 import pytest
-from diagrams.object_oriented.coordinates import Coordinates
+from diagrams.object_oriented.coordinates import Coordinates, CoordinatesArray
 
 
 def test_constructor():
@@ -31,3 +31,26 @@ def test_arithmetic():
     coord_3 = coord_1 + coord_2
     coord_4 = coord_1 * 2.0
     assert coord_3 == coord_4
+
+
+def test_coordinates_array():
+    """
+    Test creation of coordinates arrays and vectorized arithmetic.
+    """
+    coords = CoordinatesArray([(0, 0), Coordinates(1, 2), (3, 4)])
+    assert len(coords) == 3
+    assert coords[1] == Coordinates(1, 2)
+
+    with pytest.raises(ValueError):
+        CoordinatesArray([(1, 2, 3)])
+
+    shifted = coords + Coordinates(1, 1)
+    assert shifted == Coordinates(1, 1) + coords
+    assert shifted[2] == Coordinates(4, 5)
+    assert coords * 2.0 == coords + coords
+
+    coords.translate(Coordinates(-1, 0))
+    assert list(coords)[0] == Coordinates(-1, 0)
+
+    centers = coords.anchor(Coordinates(2, 4), 0.5, 0.5)
+    assert centers[0] == Coordinates(0, 2)
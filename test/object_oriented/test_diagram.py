@@ -1,9 +1,19 @@
 """
 Tests for the diagrams.object_oriented.diagram module.
 """
+import tkinter
+
 from diagrams.object_oriented.color import Color
-from diagrams.object_oriented.components import RectangularNode, Arrow
+from diagrams.object_oriented.coordinates import Coordinates
+from diagrams.object_oriented.components import (
+    RectangularNode,
+    Arrow,
+    Rectangle,
+    RoutedArrow,
+    Text,
+)
 from diagrams.object_oriented.diagram import Diagram
+from diagrams.backends.recording import DisplayListCache, RecordingBackend
 
 
 def test_diagram():
@@ -26,3 +36,226 @@ def test_diagram():
     assert diagram.width == 350
     assert diagram.height == 200
     assert len(diagram.components) == 3
+
+
+def test_draw_headless():
+    """
+    Draws diagram onto a recording backend and asserts that all primitives
+    are recorded.
+    """
+    diagram = Diagram(350, 200)
+    node_1 = RectangularNode((50, 50), (100, 100), "Node 1")
+    node_2 = RectangularNode((200, 50), (100, 100), "Node 2")
+    diagram.add(node_1)
+    diagram.add(node_2)
+    diagram.add(Arrow(node_1.right, node_2.left))
+
+    canvas = diagram.draw(RecordingBackend(350, 200))
+    primitives = [primitive for primitive, _, _ in canvas.display_list]
+    assert primitives == ["rectangle", "text", "rectangle", "text", "line", "polygon"]
+
+
+def test_spatial_queries():
+    """
+    Test region queries and hit-testing and that the spatial index follows
+    translation and removal of components.
+    """
+    diagram = Diagram(350, 200)
+    node_1 = RectangularNode((50, 50), (100, 100), "Node 1")
+    node_2 = RectangularNode((200, 50), (100, 100), "Node 2")
+    arrow = Arrow(node_1.right, node_2.left)
+    for component in [node_1, node_2, arrow]:
+        diagram.add(component)
+
+    assert diagram.query_rect(0, 0, 60, 60) == [node_1]
+    assert diagram.query_rect(0, 0, 350, 200) == [node_1, node_2, arrow]
+    assert diagram.component_at(100, 100) is node_1
+    assert diagram.component_at(195, 100) is arrow
+    assert diagram.component_at(10, 10) is None
+
+    node_1.translate(Coordinates(0, 200))
+    assert diagram.component_at(100, 100) is None
+    assert diagram.component_at(100, 300) is node_1
+
+    diagram.remove(arrow)
+    assert diagram.component_at(195, 100) is None
+    assert diagram.components == [node_1, node_2]
+
+
+class RetainedCanvas(RecordingBackend):
+    """
+    Recording backend that additionally logs item manipulation calls.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def move(self, item, delta_x, delta_y):
+        self.calls.append(("move", item, delta_x, delta_y))
+
+    def coords(self, item, *coordinates):
+        self.calls.append(("coords", item))
+
+    def itemconfigure(self, item, **options):
+        self.calls.append(("itemconfigure", item, options))
+
+    def delete(self, *items):
+        self.calls.append(("delete",) + items)
+
+    def tag_lower(self, item, below):
+        self.calls.append(("tag_lower", item, below))
+
+
+def test_retained_mode_window(monkeypatch):
+    """
+    Test that a diagram drawn in retained mode without a canvas is shown
+    in a window like in immediate mode.
+    """
+    calls = []
+    monkeypatch.setattr(
+        tkinter.Tk, "mainloop", lambda self: calls.append("mainloop"), raising=False
+    )
+    monkeypatch.setattr(
+        tkinter.Canvas, "pack", lambda self: calls.append("pack"), raising=False
+    )
+    diagram = Diagram(350, 200)
+    diagram.add(RectangularNode((50, 50), (100, 100), "Node 1"))
+    diagram.draw(retained=True)
+    assert calls == ["pack", "mainloop"]
+    assert diagram.component_at(60, 60)._items
+
+
+def test_retained_mode():
+    """
+    Test that changes to components of a diagram drawn in retained mode are
+    applied by moving and reconfiguring existing canvas items.
+    """
+    diagram = Diagram(350, 200)
+    node = RectangularNode((50, 50), (100, 100), "Node 1")
+    arrow = Arrow((0, 0), (50, 50))
+    diagram.add(node)
+    diagram.add(arrow)
+    canvas = RetainedCanvas()
+    diagram.draw(canvas, retained=True)
+    assert len(canvas.display_list) == 4
+
+    node.translate(Coordinates(10, 0))
+    node.translate(Coordinates(5, 5))
+    node.set_color(Color.blue())
+    arrow.translate(Coordinates(1, 1))
+    diagram.update()
+    assert canvas.calls == [
+        ("move", 1, 15, 5),
+        ("move", 2, 15, 5),
+        ("itemconfigure", 1, {"fill": "#0000FF"}),
+        ("coords", 3),
+        ("coords", 4),
+    ]
+
+    canvas.calls = []
+    diagram.update()
+    assert canvas.calls == []
+
+    diagram.add(RectangularNode((200, 50), (100, 100), "Node 2"))
+    diagram.remove(arrow)
+    diagram.update()
+    assert canvas.calls == [("delete", 3, 4)]
+    assert len(canvas.display_list) == 6
+
+
+def test_cached_drawing():
+    """
+    Test that drawing from a display list cache produces the same commands
+    as drawing the diagram and that the cache is keyed by its content.
+    """
+    diagram = Diagram(350, 200)
+    node_1 = RectangularNode((50, 50), (100, 100), "Node 1")
+    node_2 = RectangularNode((200, 50), (100, 100), "Node 2")
+    diagram.add(node_1)
+    diagram.add(node_2)
+    diagram.add(Arrow(node_1.right, node_2.left))
+    expected = list(diagram.record())
+
+    cache = DisplayListCache()
+    for i in range(2):
+        canvas = RecordingBackend()
+        diagram.draw(canvas, cache=cache)
+        assert list(canvas.display_list) == expected
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    node_2.set_color(Color.blue())
+    canvas = RecordingBackend()
+    diagram.draw(canvas, cache=cache)
+    assert list(canvas.display_list) == list(diagram.record())
+    assert list(canvas.display_list) != expected
+    assert len(cache) == 2
+
+
+def test_content_key():
+    """
+    Test that the content keys of diagrams are equal for equal content and
+    change with every attribute that is drawn.
+    """
+
+    def create(text="Node", text_color=Color.black(), end=(100, 100), size=10):
+        diagram = Diagram(300, 300)
+        node = RectangularNode((0, 0), (50, 50), text)
+        node.text.color = text_color
+        for component in [
+            node,
+            Arrow((0, 0), end, head_size=size),
+            Rectangle((0, 0), (10, 10)),
+            Text("a", (5, 5)),
+        ]:
+            diagram.add(component)
+        return diagram
+
+    key = create().content_key()
+    assert create().content_key() == key
+    assert hash(create().content_key()) == hash(key)
+    assert create(text="Other").content_key() != key
+    assert create(text_color=Color.red()).content_key() != key
+    assert create(end=(100, 101)).content_key() != key
+    assert create(size=5).content_key() != key
+
+
+def test_routed_arrows():
+    """
+    Test that routed arrows avoid the nodes of the diagram and are rerouted
+    when nodes along their routes or the nodes they connect are moved.
+    """
+    diagram = Diagram(600, 400)
+    source = RectangularNode((0, 100), (100, 50), "Source")
+    target = RectangularNode((400, 100), (100, 50), "Target")
+    blocker = RectangularNode((200, 90), (100, 70), "Blocker")
+    for node in [source, target, blocker]:
+        diagram.add(node)
+    arrow = RoutedArrow.connect(source, target)
+    other = RoutedArrow((0, 350), (500, 350))
+    diagram.add(arrow)
+    diagram.add(other)
+    assert arrow.points[0] == source.right
+    assert arrow.points[-1] == target.left
+    assert len(arrow.points) == 6
+    assert all(point.y == 350 for point in other.points)
+
+    canvas = RetainedCanvas()
+    diagram.draw(canvas, retained=True)
+    blocker.translate(Coordinates(0, 150))
+    assert diagram._router._stale == {arrow: None}
+    diagram.update()
+    assert arrow.points == (source.right, target.left)
+    assert ("delete", 7, 8) in canvas.calls
+    assert diagram.component_at(250, 125) is arrow
+
+    target.translate(Coordinates(0, -80))
+    assert arrow.points[-1] != target.left
+    assert diagram.query_rect(400, 50, 401, 51) == [target, arrow]
+    assert arrow.points[-1] == target.left
+
+    diagram.remove(arrow)
+    assert arrow not in diagram._router._routes
+    arrow.reroute()
+    assert arrow._router is None
+    assert arrow.points[0] == source.right
@@ -0,0 +1,79 @@
+"""
+Tests for the diagrams.object_oriented.layout module.
+"""
+import warnings
+
+import pytest
+
+from diagrams.object_oriented import (
+    Arrow,
+    Coordinates,
+    Diagram,
+    RectangularNode,
+    force_layout,
+    layered_layout,
+)
+
+
+def test_layered_layout():
+    """
+    Test that nodes are moved into layers and that arrows follow them.
+    """
+    nodes = [RectangularNode((0, 0), (100, 50), f"Node {i}") for i in range(4)]
+    arrows = [
+        Arrow.connect(nodes[0], nodes[1]),
+        Arrow.connect(nodes[0], nodes[2]),
+        Arrow.connect(nodes[1], nodes[3]),
+        Arrow.connect(nodes[2], nodes[3]),
+    ]
+    diagram = Diagram(1000, 1000)
+    for component in nodes + arrows:
+        diagram.add(component)
+
+    size = layered_layout(nodes, arrows, origin=(10, 10), layer_spacing=50)
+    assert size == Coordinates(400, 120)
+    assert [node.position.x for node in nodes] == [10, 160, 160, 310]
+    assert nodes[1].position.y != nodes[2].position.y
+    for arrow in arrows:
+        assert arrow.position == arrow.source.right
+        assert arrow.end == arrow.target.left
+    assert diagram.component_at(380, nodes[3].position.y + 25) is nodes[3]
+
+
+def test_layered_layout_with_pairs():
+    """
+    Test layout with edges given as pairs of nodes in downward direction.
+    """
+    nodes = [RectangularNode((0, 0), (100, 50), f"Node {i}") for i in range(3)]
+    layered_layout(nodes, [(nodes[0], nodes[1]), (nodes[1], nodes[2])], "down")
+    assert [node.position.y for node in nodes] == [0, 100, 200]
+
+    with pytest.raises(ValueError):
+        layered_layout(nodes[:1], [(nodes[0], nodes[1])])
+    with pytest.raises(ValueError):
+        layered_layout(nodes, [Arrow((0, 0), (1, 1))])
+
+
+def test_force_layout():
+    """
+    Test that connected nodes are pulled together, pinned nodes stay in
+    place and arrows follow the nodes.
+    """
+    nodes = [RectangularNode((0, 0), (40, 20), f"Node {i}") for i in range(6)]
+    nodes[0].translate(Coordinates(500, 500))
+    arrows = [Arrow.connect(nodes[i], nodes[i + 1]) for i in range(5)]
+
+    iterations = force_layout(nodes, arrows, pinned=[nodes[0]], iterations=500)
+    assert iterations < 500
+    assert nodes[0].position == Coordinates(500, 500)
+    for arrow in arrows:
+        assert arrow.position == arrow.source.right
+        assert arrow.end == arrow.target.left
+        distance = arrow.target.position + arrow.source.position * -1
+        assert 40 < abs(distance.x) + abs(distance.y) < 500
+
+    with pytest.raises(ValueError):
+        force_layout(nodes[:2], arrows[:1], pinned=[nodes[2]])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert force_layout([], []) == 0
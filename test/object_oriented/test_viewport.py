@@ -0,0 +1,80 @@
+"""
+Tests for the diagrams.object_oriented.viewport module.
+"""
+from diagrams.object_oriented.components import RectangularNode
+from diagrams.object_oriented.diagram import Diagram
+from diagrams.object_oriented.viewport import Viewport
+
+
+class StackingCanvas:
+    """
+    Canvas that keeps track of existing items and their stacking order.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.texts = {}
+        self.counter = 0
+
+    def _create(self, **kwargs):
+        self.counter += 1
+        self.stack.append(self.counter)
+        self.texts[self.counter] = kwargs.get("text")
+        return self.counter
+
+    def create_rectangle(self, *args, **kwargs):
+        return self._create(**kwargs)
+
+    def create_text(self, *args, **kwargs):
+        return self._create(**kwargs)
+
+    def create_line(self, *args, **kwargs):
+        return self._create(**kwargs)
+
+    def create_polygon(self, *args, **kwargs):
+        return self._create(**kwargs)
+
+    def delete(self, *items):
+        for item in items:
+            self.stack.remove(item)
+
+    def tag_lower(self, item, below):
+        self.stack.remove(item)
+        self.stack.insert(self.stack.index(below), item)
+
+    def visible_texts(self):
+        return [self.texts[item] for item in self.stack if self.texts[item]]
+
+
+def test_viewport():
+    """
+    Test that only visible components are drawn and that drawing order is
+    preserved when scrolling.
+    """
+    diagram = Diagram(100, 100)
+    for i in range(10):
+        diagram.add(RectangularNode((i * 200, 0), (50, 50), f"Node {i}"))
+    # Overlapping node added last must stay on top.
+    diagram.add(RectangularNode((1000, 0), (50, 50), "Top"))
+
+    canvas = StackingCanvas()
+    viewport = Viewport(diagram, canvas, margin=0)
+    viewport.update(0, 0, 100, 100)
+    assert canvas.visible_texts() == ["Node 0"]
+
+    viewport.update(1000, 0, 1100, 100)
+    assert canvas.visible_texts() == ["Node 5", "Top"]
+
+    viewport.update(800, 0, 1100, 100)
+    assert canvas.visible_texts() == ["Node 4", "Node 5", "Top"]
+    assert len(canvas.stack) == 6
+
+
+def test_virtual_diagram():
+    """
+    Test that diagram can be displayed in virtual mode.
+    """
+    diagram = Diagram(100, 100)
+    diagram.add(RectangularNode((500, 500), (50, 50), "Node"))
+    assert diagram.bounding_box == (0, 0, 550, 550)
+    diagram.draw(virtual=True)
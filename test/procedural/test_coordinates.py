@@ -1,8 +1,12 @@
 """
 Tests for the diagrams.procedural.coordinates module.
 """
+import numpy as np
+import pytest
+
 from diagrams.procedural.coordinates import *
-from diagrams.procedural.components import create_rectangle
+from diagrams.procedural.components import create_arrow, create_rectangle
+from diagrams.procedural.table import add_component, create_component_table
 
 
 def test_add_coordinates():
@@ -30,3 +34,24 @@ def test_anchors():
     bottom_right(rectangle)
     bottom(rectangle)
     bottom_left(rectangle)
+
+
+def test_batch_anchors():
+    rectangles = [
+        create_rectangle((100, 100), (100, 50)),
+        create_rectangle((0.5, 10), (30, 70.1)),
+    ]
+    table = create_component_table()
+    for rectangle in rectangles:
+        add_component(table, rectangle)
+    functions = [left, top_left, top, top_right, right, bottom_right, bottom, bottom_left]
+    for anchor in functions:
+        expected = np.array([anchor(rectangle) for rectangle in rectangles])
+        assert np.all(anchors(rectangles, anchor.__name__) == expected)
+        assert np.all(anchors(table, anchor.__name__) == expected)
+        assert np.all(anchors(table, anchor.__name__, [1]) == expected[1:])
+
+    with pytest.raises(ValueError):
+        anchors(rectangles + [create_arrow((0, 0), (1, 1))], "left")
+    with pytest.raises(ValueError):
+        anchors([create_rectangle((0, 0, 0), (1, 1))], "left")
@@ -2,9 +2,21 @@
 Test for the diagrams.procedural.diagram module.
 """
 
-from diagrams.procedural.diagram import create_canvas, draw, show
+from diagrams.backends.recording import RecordingBackend
+from diagrams.procedural.components import create_rectangular_node, create_arrow
+from diagrams.procedural.diagram import create_canvas, draw, get_canvas, show
 
 
 def test_diagram():
     create_canvas(200, 200)
     show()
+
+
+def test_draw_headless():
+    canvas = RecordingBackend(200, 200)
+    create_canvas(200, 200, canvas=canvas)
+    draw(create_rectangular_node((50, 50), (100, 100), "Node 1"))
+    draw(create_arrow((0, 0), (50, 50)))
+    show()
+    assert get_canvas() is canvas
+    assert len(canvas.display_list) == 4
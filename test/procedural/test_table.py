@@ -0,0 +1,108 @@
+"""
+Tests for the diagrams.procedural.table module.
+"""
+import numpy as np
+import pytest
+
+from diagrams.backends.recording import RecordingBackend
+from diagrams.object_oriented.color import ColorArray, Colormap
+from diagrams.procedural.components import *
+from diagrams.procedural.diagram import create_canvas, draw
+from diagrams.procedural.table import *
+
+
+def test_bulk_creation():
+    """
+    Test that bulk constructors add components to the table and that the
+    table grows when its capacity is exceeded.
+    """
+    table = create_component_table(capacity=2)
+    positions = np.arange(20).reshape(-1, 2)
+    indices = create_rectangles(table, positions, (10, 10), "blue")
+    assert list(indices) == list(range(10))
+    indices = create_rectangular_nodes(
+        table, positions, (10, 10), [str(i) for i in range(10)], "red"
+    )
+    assert list(indices) == list(range(10, 20))
+    assert table["size"] == 20
+    assert table["colors"] == ["blue", "red", "black"]
+
+    node = get_component(table, 11)
+    assert node == create_rectangular_node((2, 3), (10, 10), "1", "red", "black")
+
+
+def test_failed_creation():
+    """
+    Test that creating components from invalid inputs raises and leaves
+    the table unchanged.
+    """
+    table = create_component_table(capacity=2)
+    create_rectangles(table, [(0, 0)], (10, 10), "blue")
+    before = {name: np.copy(table[name][: table["size"]]) for name in COLUMNS}
+    side_tables = (list(table["colors"]), list(table["texts"]))
+
+    positions = np.zeros((3, 2))
+    with pytest.raises(ValueError):
+        create_rectangles(table, positions, (10, 10), ["red", "green"])
+    with pytest.raises(ValueError):
+        create_texts(table, positions[:2], ["a"], "red")
+    with pytest.raises(ValueError):
+        create_arrows(table, positions, positions, "red", head_sizes=[1, 2])
+    with pytest.raises(ValueError):
+        create_rectangular_nodes(
+            table, positions, (10, 10), list("abc"), "red", ["green", "blue"]
+        )
+
+    assert table["size"] == 1
+    for name in COLUMNS:
+        assert np.array_equal(table[name][: table["size"]], before[name])
+    assert (table["colors"], table["texts"]) == side_tables
+
+
+def test_rgb_colors():
+    """
+    Test that RGB arrays and color arrays are stored as deduplicated color
+    codes in the color table.
+    """
+    table = create_component_table()
+    create_rectangles(table, [(0, 0)], (10, 10), "#FF0000")
+    colors = Colormap(["#FF0000", "#0000FF"])([0.0, 1.0, 0.0, 1.0])
+    indices = create_rectangular_nodes(
+        table, np.zeros((4, 2)), (10, 10), list("abcd"), colors, colors.array
+    )
+    assert table["colors"] == ["#FF0000", "#0000FF"]
+    assert list(table["color"][indices]) == [0, 1, 0, 1]
+    assert list(table["text_color"][indices]) == [0, 1, 0, 1]
+
+    rgb = np.array([[1, 2, 3]], dtype=np.uint8)
+    create_texts(table, [(0, 0)], ["a"], rgb)
+    assert table["colors"][-1] == "#010203"
+
+
+def test_draw_all():
+    """
+    Test that drawing a table yields the same drawing commands as drawing
+    the individual components in the order in which they were added.
+    """
+    components = [
+        create_arrow((0, 0), (50, 20), "green", head_size=7),
+        create_rectangle((10, 10), (20, 20), "blue"),
+        create_rectangle((15, 15), (20, 20), "red"),
+        create_text((5, 5), "text", "black"),
+        create_rectangle((0, 0), (20, 20), "white"),
+        create_rectangular_node((100, 100), (20, 40), "node", "red", "white"),
+        create_arrow((0, 0), (10, 50), "black"),
+    ]
+    table = create_component_table()
+    for component in components:
+        add_component(table, component)
+
+    expected = RecordingBackend()
+    create_canvas(200, 200, canvas=expected)
+    for component in components:
+        draw(component)
+
+    canvas = RecordingBackend()
+    create_canvas(200, 200, canvas=canvas)
+    draw_all(table)
+    assert list(canvas.display_list) == list(expected.display_list)
@@ -0,0 +1,121 @@
+"""
+Tests for the diagrams.binary module.
+"""
+import numpy as np
+import pytest
+
+from diagrams.backends import RecordingBackend
+from diagrams.binary import load_diagram, open_table, save_diagram, save_table
+from diagrams.object_oriented import (
+    Arrow,
+    Color,
+    Diagram,
+    Rectangle,
+    RectangularNode,
+    RoutedArrow,
+    Text,
+)
+from diagrams.procedural import (
+    create_arrows,
+    create_canvas,
+    create_component_table,
+    create_rectangular_nodes,
+    draw_all,
+    get_component,
+)
+
+
+def create_table(n):
+    """Component table with n nodes on a diagonal connected by arrows."""
+    table = create_component_table()
+    positions = np.stack([np.arange(n), np.arange(n)], 1) * 100.0
+    create_rectangular_nodes(
+        table, positions, (50, 50), [f"Nöde {i}" for i in range(n)]
+    )
+    create_arrows(
+        table, positions[:-1] + 50, positions[1:], colors=(["blue", "red"] * n)[: n - 1]
+    )
+    return table
+
+
+def test_table_round_trip(tmp_path):
+    """
+    Test that tables are unchanged by writing and opening them.
+    """
+    table = create_table(10)
+    save_table(tmp_path / "table.dgm", table, 1000, 1000)
+    loaded = open_table(tmp_path / "table.dgm")
+    assert isinstance(loaded["position"], np.memmap)
+    assert loaded["size"] == table["size"]
+    assert (loaded["width"], loaded["height"]) == (1000, 1000)
+    for index in range(table["size"]):
+        assert get_component(loaded, index) == get_component(table, index)
+
+
+def test_draw_region(tmp_path):
+    """
+    Test that drawing a region of an opened table draws the same components
+    as drawing the region of the original table.
+    """
+    table = create_table(100)
+    save_table(tmp_path / "table.dgm", table, block_size=8)
+    loaded = open_table(tmp_path / "table.dgm")
+    region = (1000, 1000, 2000, 2000)
+    display_lists = []
+    for source in [table, loaded]:
+        canvas = RecordingBackend()
+        create_canvas(100, 100, canvas=canvas)
+        draw_all(source, region=region)
+        display_lists.append(list(canvas.display_list))
+    assert display_lists[0] == display_lists[1]
+    assert len([c for c in display_lists[0] if c[0] == "rectangle"]) == 11
+
+
+def test_diagram_round_trip(tmp_path):
+    """
+    Test that diagrams are unchanged by writing and loading them.
+    """
+    diagram = Diagram(400, 200)
+    node_1 = RectangularNode((10, 10), (100, 50), "Node 1")
+    node_2 = RectangularNode((200, 10), (100, 50), "Node 2")
+    for component in [
+        node_1,
+        node_2,
+        Arrow(node_1.right, node_2.left),
+        Text("a", (5, 5)),
+        Rectangle((0, 0), (20, 20), Color.blue()),
+        Text("b", (10, 10), Color.green()),
+        RectangularNode((5, 5), (30, 30), "Node 3", Color.blue()),
+        Arrow((0, 0), (50, 50), Color.red(), head_size=5),
+    ]:
+        diagram.add(component)
+    save_diagram(tmp_path / "diagram.dgm", diagram)
+    loaded = load_diagram(tmp_path / "diagram.dgm")
+    assert (loaded.width, loaded.height) == (400, 200)
+
+    display_lists = []
+    for source in [diagram, loaded]:
+        canvas = RecordingBackend()
+        source.draw(canvas)
+        display_lists.append(list(canvas.display_list))
+    assert display_lists[0] == display_lists[1]
+
+
+def test_routed_arrow(tmp_path):
+    """
+    Test that saving a diagram with a routed arrow fails instead of storing
+    it as a straight arrow.
+    """
+    diagram = Diagram(100, 100)
+    diagram.add(RoutedArrow((0, 0), (50, 50)))
+    with pytest.raises(TypeError):
+        save_diagram(tmp_path / "diagram.dgm", diagram)
+
+
+def test_invalid_file(tmp_path):
+    """
+    Test that files that aren't diagram files are rejected.
+    """
+    (tmp_path / "invalid.dgm").write_bytes(b"PNG" + bytes(100))
+    with pytest.raises(ValueError):
+        open_table(tmp_path / "invalid.dgm")
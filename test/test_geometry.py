@@ -0,0 +1,38 @@
+"""
+Tests for the diagrams.geometry module.
+"""
+import numpy as np
+
+from diagrams.backends.recording import RecordingBackend
+from diagrams.object_oriented.components import Arrow, Color
+from diagrams.procedural import create_arrow, create_canvas, draw_arrow, draw_arrows
+
+
+def test_arrow_batch_matches_single_arrows():
+    """
+    Test that drawing arrows in a batch yields exactly the same drawing
+    commands as drawing them one by one for both APIs.
+    """
+    rng = np.random.default_rng(42)
+    points = rng.uniform(-500, 500, size=(100, 4)).tolist()
+
+    arrows = [
+        Arrow(p[:2], p[2:], Color.blue(), head_size=5 + i % 7)
+        for i, p in enumerate(points)
+    ]
+    single = RecordingBackend()
+    for arrow in arrows:
+        arrow.draw(single)
+    batch = RecordingBackend()
+    Arrow.draw_batch(batch, arrows)
+    assert list(single.display_list) == list(batch.display_list)
+
+    arrows = [create_arrow(tuple(p[:2]), tuple(p[2:])) for p in points]
+    single = RecordingBackend()
+    create_canvas(0, 0, canvas=single)
+    for arrow in arrows:
+        draw_arrow(arrow)
+    batch = RecordingBackend()
+    create_canvas(0, 0, canvas=batch)
+    draw_arrows(arrows)
+    assert list(single.display_list) == list(batch.display_list)
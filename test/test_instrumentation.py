@@ -0,0 +1,115 @@
+"""
+Tests for the diagrams.instrumentation module.
+"""
+from diagrams import instrumentation
+from diagrams.backends import DisplayListCache, RecordingBackend
+from diagrams.object_oriented import Arrow, Diagram, RectangularNode
+from diagrams.procedural import (
+    create_arrow,
+    create_canvas,
+    create_rectangle,
+    draw,
+    draw_stats,
+)
+
+
+def create_diagram():
+    """Diagram with two nodes connected by an arrow."""
+    diagram = Diagram(400, 200)
+    node_1 = RectangularNode((10, 10), (100, 50), "Node 1")
+    node_2 = RectangularNode((200, 10), (100, 50), "Node 2")
+    diagram.add(node_1)
+    diagram.add(node_2)
+    diagram.add(Arrow(node_1.right, node_2.left))
+    return diagram
+
+
+def test_diagram_stats():
+    """
+    Test that statistics are only recorded while instrumentation is enabled
+    and that hooks are called.
+    """
+    diagram = create_diagram()
+    diagram.draw(RecordingBackend())
+    assert diagram.stats() == {}
+
+    calls = []
+    before = lambda name, count: calls.append(("before", name, count))
+    after = lambda name, count, seconds, primitives: calls.append(
+        ("after", name, count, primitives)
+    )
+    instrumentation.add_hooks(before, after)
+    try:
+        with instrumentation.instrumented():
+            canvas = RecordingBackend()
+            diagram.draw(canvas)
+    finally:
+        instrumentation.remove_hooks(before, after)
+    assert not instrumentation.ENABLED
+    assert len(canvas.display_list) == 6
+
+    stats = diagram.stats(reset=True)
+    assert stats["RectangularNode"]["calls"] == 2
+    assert stats["RectangularNode"]["primitives"] == 4
+    assert stats["Arrow"]["primitives"] == 2
+    assert stats["Arrow"]["time"] >= 0.0
+    assert calls == [
+        ("before", "RectangularNode", 2),
+        ("after", "RectangularNode", 2, 4),
+        ("before", "Arrow", 1),
+        ("after", "Arrow", 1, 2),
+    ]
+    assert diagram.stats() == {}
+
+
+def test_cached_diagram_stats():
+    """
+    Test that drawing a diagram from a display list cache records the
+    replayed primitives and calls the hooks for cache misses and hits.
+    """
+    diagram = create_diagram()
+    cache = DisplayListCache()
+    calls = []
+    after = lambda name, count, seconds, primitives: calls.append(
+        (name, count, primitives)
+    )
+    instrumentation.add_hooks(after=after)
+    try:
+        with instrumentation.instrumented():
+            diagram.draw(RecordingBackend(), cache=cache)
+            diagram.stats(reset=True)
+            del calls[:]
+            diagram.draw(RecordingBackend(), cache=cache)
+    finally:
+        instrumentation.remove_hooks(after=after)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert calls == [("DisplayList", 3, 6)]
+    stats = diagram.stats(reset=True)
+    assert set(stats) == {"DisplayList"}
+    assert stats["DisplayList"]["calls"] == 3
+    assert stats["DisplayList"]["primitives"] == 6
+
+
+def test_procedural_stats():
+    """
+    Test instrumentation of the procedural draw function.
+    """
+    canvas = RecordingBackend()
+    create_canvas(100, 100, canvas=canvas)
+    draw_stats(reset=True)
+    with instrumentation.instrumented():
+        draw(create_rectangle((0, 0), (10, 10)))
+        draw(create_arrow((0, 0), (10, 10)))
+        draw(create_arrow((0, 0), (20, 10)))
+        # Unknown component types are ignored like without instrumentation.
+        draw({"type": "unknown"})
+    draw({"type": "unknown"})
+    stats = draw_stats()
+    assert set(stats) == {"RECTANGLE", "ARROW"}
+    assert stats["RECTANGLE"]["calls"] == 1
+    assert stats["ARROW"] == {
+        "calls": 2,
+        "time": stats["ARROW"]["time"],
+        "primitives": 4,
+    }
+    assert len(canvas.display_list) == 5
@@ -0,0 +1,158 @@
+"""
+Tests for the diagrams.layout module.
+"""
+import numpy as np
+import pytest
+
+from diagrams.layout import (
+    assign_ranks,
+    force_positions,
+    insert_dummy_nodes,
+    layered_positions,
+    remove_cycles,
+    repulsive_forces,
+)
+
+
+def random_graph(n, m, seed=0):
+    """Random directed graph with n nodes and at most m edges, no loops."""
+    rng = np.random.default_rng(seed)
+    sources, targets = rng.integers(0, n, m), rng.integers(0, n, m)
+    loops = sources == targets
+    return sources[~loops], targets[~loops]
+
+
+def test_remove_cycles():
+    """
+    Test that reversing the found edges makes graphs acyclic and that
+    acyclic graphs are left unchanged.
+    """
+    sources, targets = random_graph(200, 600)
+    reverse = remove_cycles(200, sources, targets)
+    assert reverse.any()
+    sources, targets = (
+        np.where(reverse, targets, sources),
+        np.where(reverse, sources, targets),
+    )
+    assert not remove_cycles(200, sources, targets).any()
+    assign_ranks(200, sources, targets)
+
+    with pytest.raises(ValueError):
+        assign_ranks(3, np.array([0, 1, 2]), np.array([1, 2, 0]))
+
+
+def test_ranks_and_dummy_nodes():
+    """
+    Test that edges point to later layers and that dummy nodes split them
+    into edges between adjacent layers.
+    """
+    sources = np.array([0, 1, 0, 3])
+    targets = np.array([1, 2, 2, 2])
+    ranks = assign_ranks(4, sources, targets)
+    # Node 3 is moved next to its successor.
+    assert ranks.tolist() == [0, 1, 2, 1]
+    ranks, sources, targets = insert_dummy_nodes(ranks, sources, targets)
+    assert len(ranks) == 5
+    assert np.all(ranks[targets] - ranks[sources] == 1)
+
+
+@pytest.mark.parametrize("direction", ["right", "down"])
+def test_layered_positions(direction):
+    """
+    Test that edges point in the layout direction and that nodes don't
+    overlap.
+    """
+    n = 300
+    sources, targets = random_graph(n, 3 * n)
+    sizes = np.random.default_rng(1).uniform(10, 100, (n, 2))
+    positions, extent = layered_positions(
+        sizes, sources, targets, direction=direction, node_spacing=5
+    )
+    assert positions.min() == 0.0
+    assert np.allclose(extent, (positions + sizes).max(0))
+
+    axis = 0 if direction == "right" else 1
+    forward = positions[targets, axis] > positions[sources, axis]
+    assert forward.mean() > 0.75
+
+    boxes = np.concatenate([positions, positions + sizes], 1)
+    overlap = (
+        (boxes[:, None, 0] < boxes[None, :, 2])
+        & (boxes[None, :, 0] < boxes[:, None, 2])
+        & (boxes[:, None, 1] < boxes[None, :, 3])
+        & (boxes[None, :, 1] < boxes[:, None, 3])
+    )
+    assert overlap.sum() == n
+
+
+def test_chain():
+    """
+    Test that the nodes of a chain are placed in successive layers.
+    """
+    sizes = [(10, 10)] * 3
+    positions, extent = layered_positions(sizes, [0, 1], [1, 2], layer_spacing=5)
+    assert positions.tolist() == [[0, 0], [15, 0], [30, 0]]
+    assert extent == (40, 10)
+
+
+def test_invalid_arguments():
+    """
+    Test that invalid directions and edges are rejected.
+    """
+    with pytest.raises(ValueError):
+        layered_positions([(10, 10)], [0], [0], direction="left")
+    with pytest.raises(ValueError):
+        layered_positions([(10, 10)], [0], [1])
+
+
+def test_repulsive_forces():
+    """
+    Test Barnes-Hut approximation against exact forces including points at
+    the same position.
+    """
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1000, (500, 2))
+    points[1] = points[2] = points[0]
+    delta = points[:, np.newaxis] - points[np.newaxis]
+    distance_2 = np.maximum((delta**2).sum(axis=-1), (1e-6 * np.ptp(points)) ** 2)
+    np.fill_diagonal(distance_2, np.inf)
+    exact = 2.0 * (delta / distance_2[..., np.newaxis]).sum(axis=1)
+
+    assert np.allclose(repulsive_forces(points, 2.0, theta=0.0), exact)
+    approximate = repulsive_forces(points, 2.0, theta=1.0)
+    error = np.sqrt(((approximate - exact) ** 2).sum(axis=1))
+    assert error.mean() < 0.02 * np.sqrt((exact**2).sum(axis=1)).mean()
+    assert np.all(repulsive_forces(points[:1], 1.0) == 0.0)
+
+
+def test_force_positions():
+    """
+    Test that a grid graph is unfolded from a single point, that pinned
+    nodes stay in place and that the layout stops once converged.
+    """
+    indices = np.arange(25).reshape(5, 5)
+    sources = np.concatenate([indices[:, :-1].ravel(), indices[:-1].ravel()])
+    targets = np.concatenate([indices[:, 1:].ravel(), indices[1:].ravel()])
+    positions, iterations = force_positions(
+        np.zeros((25, 2)), sources, targets, iterations=1000
+    )
+    assert iterations < 1000
+    lengths = np.sqrt(((positions[targets] - positions[sources]) ** 2).sum(axis=1))
+    diagonal = np.sqrt(((positions[0] - positions[24]) ** 2).sum())
+    assert diagonal > 4.0 * lengths.mean()
+    assert lengths.std() < 0.5 * lengths.mean()
+
+    moved, iterations = force_positions(
+        positions, sources, targets, iterations=5, pinned=[0, 24]
+    )
+    assert iterations <= 5
+    assert np.all(moved[[0, 24]] == positions[[0, 24]])
+
+    # Nodes without neighbors and at distinct positions stay in place.
+    single, iterations = force_positions([(3.0, 4.0)], [], [])
+    assert single.tolist() == [[3.0, 4.0]] and iterations == 1
+
+    with pytest.raises(ValueError):
+        force_positions(np.zeros((2, 2)), [0], [2])
+    with pytest.raises(ValueError):
+        force_positions(np.zeros((2, 2)), [0], [1], spring_length=0.0)
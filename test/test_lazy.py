@@ -0,0 +1,34 @@
+"""
+Tests for the diagrams._lazy module.
+"""
+import subprocess
+import sys
+
+from diagrams._lazy import lazy_import
+
+
+def test_lazy_import():
+    """
+    Test that lazily imported modules behave like the module itself.
+    """
+    module = lazy_import("json.decoder")
+    assert "json.decoder" in repr(module)
+    assert module.JSONDecoder().decode("[1]") == [1]
+    assert module.__name__ == "json.decoder"
+
+
+def test_package_import():
+    """
+    Test that importing the APIs doesn't import numpy and tkinter.
+    """
+    script = (
+        "import sys, diagrams.object_oriented, diagrams.procedural;"
+        "print(sorted({'numpy', 'tkinter'} & set(sys.modules)))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    ).stdout
+    assert output.strip() == "[]"
@@ -0,0 +1,78 @@
+"""
+Tests for the diagrams.metrics module.
+"""
+import numpy as np
+
+from diagrams.metrics import (
+    DEFAULT_FONT,
+    GlyphTableMeasurer,
+    TextMetrics,
+    get_text_metrics,
+    set_text_metrics,
+)
+
+
+class CountingMeasurer(GlyphTableMeasurer):
+    """Glyph table measurer recording the lines passed to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = []
+
+    def widths(self, font, lines):
+        self.calls.append(list(lines))
+        return super().widths(font, lines)
+
+
+def test_glyph_table_measurer():
+    """
+    Test widths computed from the Helvetica and monospace advance tables.
+    """
+    measurer = GlyphTableMeasurer()
+    widths = measurer.widths(("Helvetica", 10), ["", "i", "Wi", "é"])
+    assert np.allclose(widths, [0.0, 2.22, 11.66, 5.56])
+    widths = measurer.widths(("Courier", 10), ["iiii", "WWWW"])
+    assert np.allclose(widths, [24.0, 24.0])
+    assert measurer.line_height(("Helvetica", 10)) == 12.0
+
+
+def test_text_metrics():
+    """
+    Test that multi-line texts are measured by their widest line and that
+    each line is passed to the measurer only once.
+    """
+    measurer = CountingMeasurer()
+    metrics = TextMetrics(measurer, cache_size=3)
+    width, height = metrics.measure("ab\nabc")
+    assert width == metrics.measure("abc")[0]
+    assert height == 2.0 * metrics.line_height()
+    assert measurer.calls == [["ab", "abc"]]
+
+    texts = ["abc", "x\nabc", "", "x", "abc"]
+    extents = metrics.measure_batch(texts)
+    assert measurer.calls[1:] == [["x", ""]]
+    for text, extent in zip(texts, extents):
+        assert tuple(extent) == metrics.measure(text)
+    assert metrics.measure_batch([]).shape == (0, 2)
+
+    # The least recently used line is evicted from the full cache.
+    assert len(metrics._widths) == 3
+    metrics.measure("ab")
+    assert measurer.calls[-1] == ["ab"]
+    assert metrics.misses == 5
+
+    big = metrics.measure("abc", font=(DEFAULT_FONT[0], 2 * DEFAULT_FONT[1]))
+    assert np.allclose(big, 2.0 * np.array(metrics.measure("abc")))
+
+
+def test_set_text_metrics():
+    """
+    Test replacing and restoring the shared text metrics.
+    """
+    metrics = TextMetrics(GlyphTableMeasurer(line_spacing=2.0))
+    previous = set_text_metrics(metrics)
+    try:
+        assert get_text_metrics() is metrics
+    finally:
+        set_text_metrics(previous)
+    assert get_text_metrics() is previous
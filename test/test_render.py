@@ -0,0 +1,83 @@
+"""
+Tests for the diagrams.render module.
+"""
+import json
+
+import pytest
+
+from diagrams.render import find_specs, main, render_all
+
+
+def write_specs(directory, n):
+    """Write n valid diagram specifications and an invalid one."""
+    directory.mkdir()
+    for i in range(n):
+        spec = {
+            "width": 60,
+            "height": 40,
+            "components": [
+                {"type": "rectangle", "position": [i, i], "dimensions": [20, 10]},
+                {"type": "arrow", "start": [0, 30], "end": [50, 30]},
+            ],
+        }
+        (directory / f"diagram_{i}.json").write_text(json.dumps(spec))
+    (directory / "invalid.json").write_text(json.dumps({"width": 10}))
+
+
+def test_find_specs(tmp_path):
+    """
+    Test finding specifications in directories and manifests.
+    """
+    write_specs(tmp_path / "specs", 2)
+    assert len(find_specs(tmp_path / "specs")) == 3
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# Diagrams\nspecs/diagram_1.json\n\n")
+    assert find_specs(manifest) == [tmp_path / "specs" / "diagram_1.json"]
+
+
+def test_render_all(tmp_path):
+    """
+    Test rendering in the calling process and using worker processes.
+    """
+    write_specs(tmp_path / "specs", 4)
+    specs = find_specs(tmp_path / "specs")
+    for workers in [1, 2]:
+        output_dir = tmp_path / f"output_{workers}"
+        results = list(render_all(specs, output_dir, "svg", workers, 2))
+        errors = {path.name: error for path, _, _, error in results}
+        assert errors.pop("invalid.json") is not None
+        assert all(error is None for error in errors.values())
+        assert len(list(output_dir.glob("*.svg"))) == 4
+
+
+def test_same_names(tmp_path):
+    """
+    Test that specifications with the same name in different directories
+    are rendered to separate subdirectories and that specifications that
+    would overwrite each other are rejected.
+    """
+    write_specs(tmp_path / "a", 1)
+    write_specs(tmp_path / "b", 1)
+    specs = [tmp_path / "a" / "diagram_0.json", tmp_path / "b" / "diagram_0.json"]
+    output_dir = tmp_path / "output"
+    results = list(render_all(specs, output_dir, "svg", workers=1))
+    assert [output_path for _, output_path, _, _ in results] == [
+        output_dir / "a" / "diagram_0.svg",
+        output_dir / "b" / "diagram_0.svg",
+    ]
+    assert all(output_path.exists() for _, output_path, _, _ in results)
+
+    with pytest.raises(ValueError):
+        list(render_all(specs[:1] * 2, output_dir, "svg", workers=1))
+
+
+def test_main(tmp_path, capsys):
+    """
+    Test that the command line interface reports failures.
+    """
+    write_specs(tmp_path / "specs", 2)
+    output_dir = tmp_path / "output"
+    status = main([str(tmp_path / "specs"), "-o", str(output_dir), "-w", "1"])
+    assert status == 1
+    assert "FAILED" in capsys.readouterr().err
+    assert len(list(output_dir.glob("*.png"))) == 2
@@ -0,0 +1,110 @@
+"""
+Tests for the diagrams.routing module.
+"""
+import pytest
+
+from diagrams.routing import Router
+
+
+def crosses(points, box):
+    """Whether an orthogonal route passes through the interior of a box."""
+    x_0, y_0, x_1, y_1 = box
+    for (a_x, a_y), (b_x, b_y) in zip(points, points[1:]):
+        if max(a_x, b_x) > x_0 and min(a_x, b_x) < x_1:
+            if max(a_y, b_y) > y_0 and min(a_y, b_y) < y_1:
+                return True
+    return False
+
+
+def test_route():
+    """
+    Test that routes are orthogonal, avoid obstacles and leave and enter
+    their end points in the given directions.
+    """
+    router = Router(margin=10, bend_penalty=20)
+    assert router.route((0, 0), (200, 0)) == [(0, 0), (200, 0)]
+
+    obstacles = [(80, -30, 120, 30), (140, -100, 160, -20)]
+    for index, box in enumerate(obstacles):
+        router.set_obstacle(index, box)
+    points = router.route((0, 0), (200, 0))
+    assert points[0] == (0, 0) and points[-1] == (200, 0)
+    for (a_x, a_y), (b_x, b_y) in zip(points, points[1:]):
+        assert a_x == b_x or a_y == b_y
+    assert not any(crosses(points, box) for box in obstacles)
+    assert points[1][1] == 0.0
+
+    points = router.route((0, 0), (0, 200), "down", "left")
+    assert points[1][0] == 0.0
+    assert points[-2] == (10.0, 200.0)
+
+    with pytest.raises(ValueError):
+        router.route((0, 0), (1, 1), "north")
+
+
+def test_enclosed_end():
+    """
+    Test that a route is returned even if the end can't be reached.
+    """
+    router = Router(margin=5)
+    for index, box in enumerate(
+        [(90, -50, 100, 50), (100, -50, 200, -40), (100, 40, 200, 50)]
+    ):
+        router.set_obstacle(index, box)
+    router.set_obstacle(3, (200, -50, 210, 50))
+    points = router.route((0, 0), (150, 0))
+    assert points[0] == (0, 0) and points[-1] == (150, 0)
+
+
+def test_narrow_gap():
+    """
+    Test that routes leave an enclosure through a gap narrower than twice
+    the margin instead of ignoring the obstacles, and that the search for
+    routes that can't be found is limited to the surroundings of the end
+    points.
+    """
+    router = Router(margin=10)
+    ring = [
+        (-100, -100, -60, 200),
+        (-100, -100, 140, -60),
+        (-100, 160, 140, 200),
+        (100, -100, 140, 40),
+        (100, 55, 140, 200),
+    ]
+    for index, box in enumerate(ring):
+        router.set_obstacle(index, box)
+    points = router.route((0, 47), (300, 120), "down", "right")
+    assert points[0] == (0, 47) and points[-1] == (300, 120)
+    assert not any(crosses(points, box) for box in ring)
+
+    router.set_obstacle("far", (1e6, 1e6, 1e6 + 10, 1e6 + 10))
+    router.set_obstacle("gap", (100, 40, 140, 55))
+    queried = []
+    query = router._obstacles.query
+    router._obstacles.query = lambda *region: queried.append(region) or query(*region)
+    points = router.route((0, 47), (300, 120), "down", "right")
+    assert points[0] == (0, 47) and points[-1] == (300, 120)
+    assert max(region[2] for region in queried) < 1000
+
+
+def test_stale_routes():
+    """
+    Test that only connectors along changed obstacles are marked as stale.
+    """
+    router = Router(margin=10)
+    router.set_obstacle("a", (80, -30, 120, 30))
+    router.set_route("near", router.route((0, 0), (200, 0)))
+    router.set_route("far", router.route((0, 500), (200, 500)))
+    assert router.pop_stale() == []
+
+    router.set_obstacle("a", (80, 100, 120, 130))
+    assert router.pop_stale() == ["near"]
+    router.set_obstacle("a", (80, 100, 120, 130))
+    assert router.pop_stale() == []
+
+    router.set_obstacle("b", (50, 490, 60, 510))
+    router.remove_route("far")
+    assert router.pop_stale() == []
+    router.remove_obstacle("a")
+    router.remove_obstacle("a")
+    assert "a" not in router and "b" in router
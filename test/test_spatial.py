@@ -0,0 +1,66 @@
+"""
+Tests for the diagrams.spatial module.
+"""
+import random
+
+from diagrams.spatial import SpatialIndex
+
+
+def test_insert_query_remove():
+    """
+    Test that items are found by region and point queries and that updates
+    and removals are reflected in the results.
+    """
+    index = SpatialIndex(cell_size=10, max_cells=16)
+    index.insert("a", (0, 0, 5, 5))
+    index.insert("b", (20, 20, 30, 30))
+    index.insert("large", (-100, -100, 100, 100))
+    assert len(index) == 3
+
+    assert index.query(0, 0, 10, 10) == {"a", "large"}
+    assert index.query(-1000, -1000, 1000, 1000) == {"a", "b", "large"}
+    assert index.query_point(25, 25) == {"b", "large"}
+
+    index.update("a", (24, 24, 26, 26))
+    assert index.query_point(25, 25) == {"a", "b", "large"}
+    assert index.query_point(2, 2) == {"large"}
+
+    index.remove("large")
+    index.remove("b")
+    assert index.query(-1000, -1000, 1000, 1000) == {"a"}
+
+
+def test_large_items():
+    """
+    Test that items of very different sizes are found like by a linear
+    search and that large items are stored in a coarser grid.
+    """
+    rng = random.Random(0)
+    index = SpatialIndex(cell_size=10, max_cells=4)
+    boxes = {}
+    for item in range(300):
+        x, y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+        width, height = 10 ** rng.uniform(-1, 3), 10 ** rng.uniform(-1, 3)
+        boxes[item] = (x, y, x + width, y + height)
+        index.insert(item, boxes[item])
+    for item in range(0, 300, 3):
+        x, y = rng.uniform(-500, 500), rng.uniform(-500, 500)
+        boxes[item] = (x, y, x + 500, y + 1)
+        index.update(item, boxes[item])
+    assert index._levels[0] > 0
+
+    for _ in range(100):
+        x, y = rng.uniform(-600, 600), rng.uniform(-600, 600)
+        width, height = 10 ** rng.uniform(-1, 3), 10 ** rng.uniform(-1, 3)
+        expected = {
+            item
+            for item, (x_0, y_0, x_1, y_1) in boxes.items()
+            if x_0 <= x + width and x <= x_1 and y_0 <= y + height and y <= y_1
+        }
+        assert index.query(x, y, x + width, y + height) == expected
+        expected = {
+            item
+            for item, (x_0, y_0, x_1, y_1) in boxes.items()
+            if x_0 <= x <= x_1 and y_0 <= y <= y_1
+        }
+        assert index.query_point(x, y) == expected
@@ -0,0 +1,52 @@
+"""
+Tests for the diagrams.specs module.
+"""
+import json
+
+import pytest
+
+from diagrams.procedural import ComponentType
+from diagrams.specs import component_from_record, load_spec
+
+
+def test_component_from_record():
+    """
+    Test creation of components from records with different type tags.
+    """
+    node = component_from_record(
+        {
+            "type": "rectangular_node",
+            "position": [0, 0],
+            "dimensions": [10, 10],
+            "text": "a",
+        }
+    )
+    assert node["type"] == ComponentType.RECTANGULAR_NODE
+    assert node["position"] == (0, 0)
+    arrow = component_from_record({"type": 3, "start": [0, 0], "end": [1, 1]})
+    assert arrow["type"] == ComponentType.ARROW
+    assert arrow["head_size"] == 10
+
+    with pytest.raises(ValueError):
+        component_from_record({"type": "circle"})
+    with pytest.raises(ValueError):
+        component_from_record({"type": "text", "radius": 1})
+
+
+def test_load_spec(tmp_path):
+    """
+    Test loading of diagram specification from file.
+    """
+    path = tmp_path / "spec.json"
+    path.write_text(
+        json.dumps(
+            {
+                "width": 100,
+                "height": 50,
+                "components": [{"type": "text", "position": [1, 2], "text": "a"}],
+            }
+        )
+    )
+    spec = load_spec(path)
+    assert (spec["width"], spec["height"]) == (100, 50)
+    assert spec["components"][0]["type"] == ComponentType.TEXT
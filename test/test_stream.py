@@ -0,0 +1,70 @@
+"""
+Tests for the diagrams.stream module.
+"""
+import io
+import json
+
+import pytest
+
+from diagrams.backends import RecordingBackend
+from diagrams.object_oriented import Arrow, Diagram, RectangularNode
+from diagrams.procedural import create_canvas
+from diagrams.stream import read_records, stream_draw, stream_into_diagram
+
+
+def ndjson(n):
+    """NDJSON file with n nodes connected by arrows."""
+    lines = []
+    for i in range(n):
+        lines.append(
+            {
+                "type": "RECTANGULAR_NODE",
+                "position": [50 * i, 0],
+                "dimensions": [40, 20],
+                "text": str(i),
+                "background_color": "#00FF00",
+            }
+        )
+        lines.append({"type": 3, "start": [50 * i + 40, 10], "end": [50 * i + 50, 10]})
+    return io.StringIO("\n".join(json.dumps(line) for line in lines) + "\n\n")
+
+
+def test_read_records():
+    """
+    Test that records are parsed lazily and errors report the line.
+    """
+    records = read_records(io.StringIO('{"type": 1}\nnot json\n'))
+    assert next(records) == {"type": 1}
+    with pytest.raises(ValueError, match="line 2"):
+        next(records)
+
+
+def test_stream_into_diagram():
+    """
+    Test adding streamed components to a diagram in batches.
+    """
+    diagram = Diagram(500, 100)
+    counts = []
+    n = stream_into_diagram(
+        diagram, ndjson(5), batch_size=4, back_pressure=counts.append
+    )
+    assert n == 10
+    assert counts == [4, 8, 10]
+    assert isinstance(diagram.components[0], RectangularNode)
+    assert isinstance(diagram.components[1], Arrow)
+    assert str(diagram.components[0].color) == "#00FF00"
+
+
+def test_stream_draw():
+    """
+    Test that streamed components are drawn like the same components
+    drawn from an in-memory diagram.
+    """
+    canvas = RecordingBackend()
+    create_canvas(500, 100, canvas=canvas)
+    counts = []
+    assert stream_draw(ndjson(5), batch_size=3, back_pressure=counts.append) == 10
+    assert counts == [3, 6, 9, 10]
+    primitives = [command[0] for command in canvas.display_list]
+    assert primitives[:5] == ["rectangle", "text", "line", "polygon", "rectangle"]
+    assert len(primitives) == 20